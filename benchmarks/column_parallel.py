@@ -0,0 +1,80 @@
+"""Per-column encoders with n_jobs worker processes against the serial loop.
+
+Times fit and transform of each encoder that takes n_jobs on a wide
+categorical Bulldozers-like frame, and checks the parallel output matches
+the serial one. Speedups need as many free cores as --jobs; on one core the
+numbers show the process pool's overhead. Run from the repository root:
+
+    python benchmarks/column_parallel.py --rows 400000 --jobs 4
+"""
+import argparse
+import os
+import sys
+
+import pandas as pd
+
+try:
+    from .datasets import BULLDOZERS_CATEGORICAL, make_bulldozers
+    from .harness import ROOT, best_of
+except ImportError:
+    # Run as a script, with benchmarks/ on sys.path
+    from datasets import BULLDOZERS_CATEGORICAL, make_bulldozers
+    from harness import ROOT, best_of
+
+# Imported by package path, so the worker processes can unpickle the tasks
+sys.path.insert(0, ROOT)
+
+from projects.proj_2_team_4.src import custom_transformers as bulldozers
+from src import custom_transformers as shared
+
+ENCODERS = {
+    "bulldozers CustomLabelEncoder": lambda columns, n_jobs: bulldozers.CustomLabelEncoder(columns, n_jobs=n_jobs),
+    "bulldozers CustomOneHotEncoder": lambda columns, n_jobs: bulldozers.CustomOneHotEncoder(
+        columns, sparse_output=True, n_jobs=n_jobs),
+    "bulldozers ExtendedOneHotEncoder": lambda columns, n_jobs: bulldozers.ExtendedOneHotEncoder(
+        columns, max_categories=20, sparse_output=True, n_jobs=n_jobs),
+    "src CustomLabelEncoder": lambda columns, n_jobs: shared.CustomLabelEncoder(columns, n_jobs=n_jobs),
+}
+
+
+def make_wide_categorical(n_rows: int, n_columns: int) -> pd.DataFrame:
+    """The Bulldozers categorical columns, repeated with new seeds up to n_columns."""
+    scale = n_rows / 401_125
+    blocks, seed = [], 0
+    while sum(block.shape[1] for block in blocks) < n_columns:
+        block = make_bulldozers(scale=scale, seed=seed)[list(BULLDOZERS_CATEGORICAL)].fillna("None or Unspecified")
+        blocks.append(block.add_suffix(f"_{seed}"))
+        seed += 1
+    return pd.concat(blocks, axis=1).iloc[:, :n_columns]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=400_000)
+    parser.add_argument("--columns", type=int, default=32)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    frame = make_wide_categorical(args.rows, args.columns)
+    columns = list(frame.columns)
+    print(f"{len(frame)} rows, {len(columns)} categorical columns, {os.cpu_count()} cores, n_jobs={args.jobs}")
+
+    for name, make_encoder in ENCODERS.items():
+        serial = make_encoder(columns, None).fit(frame)
+        parallel = make_encoder(columns, args.jobs).fit(frame)
+        expected, result = serial.transform(frame), parallel.transform(frame)
+        if not result.equals(expected):
+            sys.exit(f"{name}: n_jobs={args.jobs} output differs from the serial output")
+
+        times = {}
+        for label, encoder in [("serial", serial), ("parallel", parallel)]:
+            times[label, "fit"] = best_of(lambda: encoder.fit(frame), repeat=2)
+            times[label, "transform"] = best_of(lambda: encoder.transform(frame), repeat=2)
+        for step in ["fit", "transform"]:
+            print(f"{name:>34} {step:>9}: serial {times['serial', step]:6.3f}s, "
+                  f"n_jobs={args.jobs} {times['parallel', step]:6.3f}s "
+                  f"({times['serial', step] / times['parallel', step]:4.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+import json
+import os
+
+import pytest
+
+BASELINES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("transformer suite")
+    group.addoption("--scales", default="1", help="comma-separated data sizes to run, e.g. 1,10,100 (default 1)")
+    group.addoption("--save-baselines", action="store_true", help="write the results to benchmarks/baselines.json")
+    group.addoption("--max-slowdown", type=float, default=2.0, help="fail when a step is this much slower")
+    group.addoption("--max-memory-growth", type=float, default=1.25, help="fail when a peak is this much larger")
+
+
+@pytest.fixture(scope="session")
+def baselines(request):
+    """Stored results by case and scale; written back at the end with --save-baselines."""
+    stored = {}
+    if os.path.exists(BASELINES_PATH):
+        with open(BASELINES_PATH) as f:
+            stored = json.load(f)
+    yield stored
+    if request.config.getoption("save_baselines"):
+        with open(BASELINES_PATH, "w") as f:
+            json.dump(dict(sorted(stored.items())), f, indent=2)
+            f.write("\n")
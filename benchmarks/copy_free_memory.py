@@ -0,0 +1,82 @@
+"""Peak memory of a Custom* pipeline with and without copy-free mode.
+
+The same pipeline is built from src/ and from the Bulldozers project module.
+The copy-free pipeline owns one copy of the input and transforms it in place,
+so its peak stays near 1x the input; the run fails when it exceeds
+--max-ratio or when the two pipelines disagree. Run from the repository root:
+
+    python benchmarks/copy_free_memory.py --rows 400000
+"""
+import argparse
+import sys
+
+import pandas as pd
+from sklearn.pipeline import make_pipeline
+
+try:
+    from .datasets import make_wide_numeric
+    from .harness import ROOT, traced_peak
+except ImportError:
+    # Run as a script, with benchmarks/ on sys.path
+    from datasets import make_wide_numeric
+    from harness import ROOT, traced_peak
+
+sys.path.insert(0, ROOT)
+
+from projects.proj_2_team_4.src import custom_transformers as bulldozers
+from src import custom_transformers as shared
+from src.custom_transformers import make_copy_free_pipeline
+
+MODULES = {"src": shared, "bulldozers": bulldozers}
+
+
+def make_steps(frame: pd.DataFrame, module=shared):
+    numeric = [c for c in frame.columns if c.startswith("num_")]
+    categorical = [c for c in frame.columns if c.startswith("cat_")]
+    return [
+        module.CustomImputer(strategy="mean", columns=numeric),
+        module.CustomLabelEncoder(columns=categorical),
+        module.CustomStandardScaler(columns=numeric[: len(numeric) // 2]),
+        module.CustomMinMaxScaler(columns=numeric[len(numeric) // 2:]),
+        module.CustomStandardScaler(columns=numeric),
+        module.CustomMinMaxScaler(columns=numeric),
+    ]
+
+
+def peak_memory(pipeline, frame: pd.DataFrame):
+    # Peak bytes allocated by fit_transform, including its output, and the output
+    return traced_peak(lambda: pipeline.fit_transform(frame))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=400_000)
+    parser.add_argument("--max-ratio", type=float, default=1.5,
+                        help="largest allowed copy-free peak as a multiple of the input size")
+    args = parser.parse_args()
+
+    frame = make_wide_numeric(args.rows)
+    original = frame.copy()
+    input_bytes = frame.memory_usage(deep=True).sum()
+    print(f"Input frame: {frame.shape}, {input_bytes / 2**20:.1f} MiB")
+
+    failures = []
+    for module_name, module in MODULES.items():
+        results = {}
+        for name, pipeline in [
+            ("default", make_pipeline(*make_steps(frame, module))),
+            ("copy-free", make_copy_free_pipeline(*make_steps(frame, module))),
+        ]:
+            peak, results[name] = peak_memory(pipeline, frame)
+            print(f"{module_name:>10} {name:>9}: peak {peak / 2**20:8.1f} MiB ({peak / input_bytes:.2f}x input)")
+
+        pd.testing.assert_frame_equal(frame, original)
+        pd.testing.assert_frame_equal(results["copy-free"], results["default"])
+        if peak > args.max_ratio * input_bytes:
+            failures.append(f"{module_name} copy-free peak {peak / input_bytes:.2f}x is above --max-ratio {args.max_ratio:g}x")
+    if failures:
+        sys.exit("\n".join(failures))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""Synthetic stand-ins for the course datasets, at a multiple of their real size.
+
+The generators reproduce the columns, dtypes, cardinalities and missing-value
+rates the transformers care about, not the real distributions.
+"""
+import numpy as np
+import pandas as pd
+
+# Rows in the real datasets
+MUSHROOM_ROWS = 8_124
+BULLDOZERS_ROWS = 401_125
+BEERS_ROWS = 3_197
+
+MUSHROOM_CODES = {
+    "cap-shape": "bcxfks", "cap-surface": "fgys", "cap-color": "nbcgrpuewy", "bruises": "tf",
+    "odor": "alcyfmnps", "gill-attachment": "af", "gill-spacing": "cw", "gill-size": "bn",
+    "gill-color": "knbhgropuewy", "stalk-shape": "et", "stalk-root": "bcuer?",
+    "stalk-surface-above-ring": "fyks", "stalk-surface-below-ring": "fyks",
+    "stalk-color-above-ring": "nbcgopewy", "stalk-color-below-ring": "nbcgopewy", "veil-type": "p",
+    "veil-color": "nowy", "ring-number": "not", "ring-type": "eflnp", "spore-print-color": "knbhrouwy",
+    "population": "acnsvy", "habitat": "glmpuwd",
+}
+
+PRODUCT_CLASSES = [
+    "Wheel Loader - 110.0 to 120.0 Horsepower", "Wheel Loader - 150.0 to 175.0 Horsepower",
+    "Wheel Loader - Unidentified", "Skid Steer Loader - 1351.0 to 1601.0 Lb Operating Capacity",
+    "Skid Steer Loader - 1601.0 to 1751.0 Lb Operating Capacity", "Skid Steer Loader - 0.0 to 701.0 Lb Operating Capacity",
+    "Hydraulic Excavator, Track - 12.0 to 14.0 Metric Tons", "Hydraulic Excavator, Track - 21.0 to 24.0 Metric Tons",
+    "Hydraulic Excavator, Track - 300.0 + Metric Tons", "Track Type Tractor, Dozer - 20.0 to 75.0 Horsepower",
+    "Track Type Tractor, Dozer - 105.0 to 130.0 Horsepower", "Motorgrader - 145.0 to 170.0 Horsepower",
+    "Backhoe Loader - 14.0 to 15.0 Ft Standard Digging Depth", "Backhoe Loader - Unidentified",
+]
+BULLDOZERS_CATEGORICAL = {
+    "UsageBand": 3, "ProductSize": 6, "state": 53, "ProductGroup": 6, "Drive_System": 4, "Enclosure": 6,
+    "Forks": 2, "Ride_Control": 3, "Transmission": 8, "Hydraulics": 12, "Coupler": 3, "Track_Type": 2,
+    "Blade_Type": 10, "Travel_Controls": 7,
+}
+BULLDOZERS_NUMERIC = ["YearMade", "MachineHoursCurrentMeter", "auctioneerID", "ModelID"]
+
+
+# Distinct values of the Bulldozers categorical columns used by make_label_columns
+LABEL_CARDINALITIES = {
+    "state": 53, "ProductGroup": 6, "Enclosure": 6, "Hydraulics": 12, "Tire_Size": 17, "fiSecondaryDesc": 177,
+    "fiBaseModel": 1950, "fiModelDesc": 5059,
+}
+
+
+def _skewed_choice(rng, options: np.ndarray, n_rows: int, missing: float = 0.0, exponent: float = 1.4) -> np.ndarray:
+    # Zipf-like frequencies, with a share of missing values
+    codes = np.minimum(rng.zipf(exponent, size=n_rows) - 1, len(options) - 1)
+    values = options[codes]
+    if missing:
+        values[rng.random(n_rows) < missing] = None
+    return values
+
+
+def _labels(prefix: str, count: int) -> np.ndarray:
+    return np.array([f"{prefix}{i}" for i in range(count)], dtype=object)
+
+
+def make_mushrooms(scale: float = 1, seed: int = 0) -> pd.DataFrame:
+    """Single-letter categorical codes shaped like the UCI agaricus-lepiota data."""
+    rng = np.random.default_rng(seed)
+    n_rows = int(MUSHROOM_ROWS * scale)
+    return pd.DataFrame({
+        column: np.array(list(codes), dtype=object)[rng.integers(0, len(codes), n_rows)]
+        for column, codes in MUSHROOM_CODES.items()
+    })
+
+
+def make_bulldozers(scale: float = 1, seed: int = 0) -> pd.DataFrame:
+    """Mixed numeric, categorical, measurement-string and date columns like the raw Bulldozers table."""
+    rng = np.random.default_rng(seed)
+    n_rows = int(BULLDOZERS_ROWS * scale)
+
+    data = {
+        "SalePrice": rng.lognormal(10, 0.7, n_rows).round(),
+        # About 10% of YearMade values are the 1000 placeholder
+        "YearMade": np.where(rng.random(n_rows) < 0.1, 1000, rng.integers(1960, 2012, n_rows)),
+        "MachineHoursCurrentMeter": np.where(rng.random(n_rows) < 0.6, np.nan, rng.exponential(3000, n_rows).round()),
+        "auctioneerID": np.where(rng.random(n_rows) < 0.05, np.nan, rng.integers(0, 100, n_rows).astype(float)),
+        "ModelID": rng.integers(28, 37198, n_rows),
+        "saledate": pd.to_datetime("1989-01-17") + pd.to_timedelta(rng.integers(0, 8400, n_rows), unit="D"),
+        "fiProductClassDesc": _skewed_choice(rng, np.array(PRODUCT_CLASSES, dtype=object), n_rows),
+        "Tire_Size": _skewed_choice(rng, np.array(['None or Unspecified', '20.5"', '23.5"', '17.5"', '14"', '26.5"'],
+                                                  dtype=object), n_rows, missing=0.75),
+        "Undercarriage_Pad_Width": _skewed_choice(rng, np.array(['None or Unspecified', '32 inch', '28 inch',
+                                                                 '24 inch', '16 inch'], dtype=object),
+                                                  n_rows, missing=0.75),
+        "Stick_Length": _skewed_choice(rng, np.array(['None or Unspecified', "10' 6\"", "9' 10\"", "11' 0\"",
+                                                      "12' 10\""], dtype=object), n_rows, missing=0.75),
+    }
+
+    # Model description components, drawn per model so they are correlated
+    n_models = 5_000
+    models = pd.DataFrame({
+        "fiBaseModel": _skewed_choice(rng, _labels("B", 1_950), n_models),
+        "fiSecondaryDesc": _skewed_choice(rng, _labels("S", 177), n_models, missing=0.35),
+        "fiModelSeries": _skewed_choice(rng, _labels("M", 123), n_models, missing=0.85),
+        "fiModelDescriptor": _skewed_choice(rng, _labels("D", 140), n_models, missing=0.8),
+    })
+    models["fiModelDesc"] = models["fiBaseModel"] + models["fiSecondaryDesc"].fillna("")
+    rows = _skewed_choice(rng, np.arange(n_models), n_rows)
+    for column in models.columns:
+        data[column] = models[column].to_numpy()[rows]
+
+    for column, cardinality in BULLDOZERS_CATEGORICAL.items():
+        data[column] = _skewed_choice(rng, _labels(f"{column}_", cardinality), n_rows, missing=0.5)
+    return pd.DataFrame(data)
+
+
+def make_beers(scale: float = 1, seed: int = 0, vocabulary_size: int = 5_000) -> pd.DataFrame:
+    """Beer reviews with free-text columns and taste scores like the proj_3 data."""
+    rng = np.random.default_rng(seed)
+    n_rows = int(BEERS_ROWS * scale)
+    words = np.array([f"w{i}" for i in range(vocabulary_size)], dtype=object)
+
+    def sentences(min_words: int, max_words: int) -> list:
+        lengths = rng.integers(min_words, max_words, n_rows)
+        tokens = _skewed_choice(rng, words, int(lengths.sum()))
+        return [" ".join(chunk) for chunk in np.split(tokens, np.cumsum(lengths)[:-1])]
+
+    data = {
+        "Name": sentences(1, 4),
+        "Style": _skewed_choice(rng, _labels("style_", 111), n_rows),
+        "Brewery": _skewed_choice(rng, _labels("brewery_", 934), n_rows),
+        "Beer Name (Full)": sentences(2, 6),
+        "Description": ["Notes:" + text for text in sentences(10, 80)],
+        "ABV": rng.gamma(4, 1.6, n_rows).round(1),
+        "Ave Rating": rng.normal(3.8, 0.4, n_rows).round(2),
+        "Min IBU": rng.integers(0, 60, n_rows),
+    }
+    data["Max IBU"] = data["Min IBU"] + rng.integers(5, 40, n_rows)
+    for column in ["Astringency", "Body", "Alcohol", "Bitter", "Sweet", "Sour", "Salty", "Fruits", "Hoppy",
+                   "Spices", "Malty"]:
+        data[column] = rng.poisson(40, n_rows)
+    return pd.DataFrame(data)
+
+
+def make_label_columns(n_rows: int, seed: int = 42) -> pd.DataFrame:
+    """Bulldozers categorical columns at their real cardinalities, 30% missing."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        column: _skewed_choice(rng, _labels(f"{column}_", cardinality), n_rows, missing=0.3, exponent=1.3)
+        for column, cardinality in LABEL_CARDINALITIES.items()
+    })
+
+
+def make_wide_numeric(n_rows: int, n_numeric: int = 40, n_categorical: int = 13, seed: int = 42) -> pd.DataFrame:
+    """Normal float columns with 5% missing plus small integer codes, shaped like the 53-column Bulldozers table."""
+    rng = np.random.default_rng(seed)
+    data = {f"num_{i}": rng.normal(size=n_rows) for i in range(n_numeric)}
+    for i in range(n_numeric):
+        data[f"num_{i}"][rng.random(n_rows) < 0.05] = np.nan
+    for i in range(n_categorical):
+        data[f"cat_{i}"] = rng.integers(0, 20, size=n_rows)
+    return pd.DataFrame(data)
+
+
+def make_chunks(make, scale: int, distinct: int = 4):
+    """A function returning an iterator of scale 1x chunks from make, for data too large to hold.
+
+    The chunks cycle through a few generated frames, so only those stay in memory.
+    """
+    frames = [make(1, seed=seed) for seed in range(min(distinct, scale))]
+    return lambda: (frames[i % len(frames)] for i in range(scale))
+
+
+DATASETS = {
+    "mushrooms": make_mushrooms,
+    "bulldozers": make_bulldozers,
+    "beers": make_beers,
+}
@@ -0,0 +1,47 @@
+"""Timing, memory tracing and module loading shared by the benchmark scripts."""
+import gc
+import importlib.util
+import os
+import time
+import tracemalloc
+from typing import Callable
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def load_module(name: str, relative_path: str):
+    """Import a file under the repository root as module name.
+
+    The project modules all share the file name custom_transformers.py, so
+    they are loaded by path under distinct names.
+    """
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, relative_path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def best_of(fn: Callable, repeat: int = 3) -> float:
+    """Shortest wall time in seconds of repeat untraced calls of fn."""
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def traced_peak(fn: Callable):
+    """Peak bytes allocated while fn runs, as seen by tracemalloc, and fn's result.
+
+    Allocations made before the call, such as the input data, are not counted.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak, result
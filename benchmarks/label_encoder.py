@@ -0,0 +1,84 @@
+"""Hash-vocabulary CustomLabelEncoder against the previous LabelEncoder-based one.
+
+Uses synthetic Bulldozers-like categorical columns, or the real ones with --csv.
+Run from the repository root:
+
+    python benchmarks/label_encoder.py --rows 400000
+    python benchmarks/label_encoder.py --csv path/to/TrainAndValid.csv
+"""
+import argparse
+import os
+import sys
+
+from sklearn.preprocessing import LabelEncoder
+
+from datasets import LABEL_CARDINALITIES, make_label_columns
+from harness import ROOT, best_of
+
+sys.path.insert(0, os.path.join(ROOT, "projects", "proj_2_team_4", "src"))
+
+from custom_transformers import CustomLabelEncoder
+from data_loader import load_bulldozers
+
+
+class PreviousLabelEncoder:
+    """The LabelEncoder wrapper this change replaced, kept here for comparison."""
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.encoders = {}
+
+    def fit(self, X):
+        for column in self.columns:
+            self.encoders[column] = LabelEncoder().fit(X[column].fillna("None or Unspecified"))
+        return self
+
+    def transform(self, X):
+        X_transformed = X.copy()
+        for column in self.columns:
+            try:
+                X_transformed[column] = self.encoders[column].transform(X[column].fillna("None or Unspecified"))
+            except ValueError:
+                # One unseen value sets the whole column to -1
+                X_transformed[column] = -1
+        return X_transformed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=400_000)
+    parser.add_argument("--csv", help="Bulldozers CSV to use instead of synthetic data")
+    args = parser.parse_args()
+
+    if args.csv:
+        frame = load_bulldozers(args.csv)
+        columns = [column for column in LABEL_CARDINALITIES if column in frame.columns]
+        frame = frame[columns].astype(object)
+    else:
+        frame = make_label_columns(args.rows)
+        columns = list(frame.columns)
+    # An unseen value in one row, which the previous encoder spread to the whole column
+    unseen = frame.copy()
+    unseen.loc[unseen.index[0], columns[0]] = "unseen"
+
+    previous = PreviousLabelEncoder(columns).fit(frame)
+    current = CustomLabelEncoder(columns).fit(frame)
+    assert (previous.transform(frame)[columns].to_numpy() == current.transform(frame)[columns].to_numpy()).all()
+
+    print(f"{len(frame)} rows, {len(columns)} categorical columns")
+    for label, data in [("known values", frame), ("one unseen value", unseen)]:
+        previous_time = best_of(lambda: previous.transform(data))
+        current_time = best_of(lambda: current.transform(data))
+        encoded = current.transform(data)
+        print(f"{label:>16}: previous {previous_time:6.3f}s, hash vocabulary {current_time:6.3f}s "
+              f"({previous_time / current_time:4.1f}x), "
+              f"-1 codes in {columns[0]}: previous {(previous.transform(data)[columns[0]] == -1).sum()}, "
+              f"now {(encoded[columns[0]] == -1).sum()}")
+
+    categorical = frame.astype("category")
+    print(f"categorical input: hash vocabulary {best_of(lambda: current.transform(categorical)):6.3f}s")
+    print("output dtypes:", ", ".join(str(dtype) for dtype in current.transform(frame)[columns].dtypes.unique()))
+
+
+if __name__ == "__main__":
+    main()
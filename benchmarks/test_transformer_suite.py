@@ -0,0 +1,194 @@
+"""Wall time and peak memory of every custom transformer's fit and transform, with pytest-benchmark.
+
+Each case runs on a synthetic dataset (see datasets.py) at 1x, 10x or 100x the
+size of the real data. Wall time is the best of a few pytest-benchmark rounds;
+peak memory comes from one more run under tracemalloc and is reported as
+extra_info. Both are compared with benchmarks/baselines.json, and a case fails
+when it is slower or heavier than the baseline allows. Baselines depend on the
+machine, so refresh them with --save-baselines after moving to a new one.
+
+100x Bulldozers is 40M rows, more than fits in memory, so at that size the
+cases whose fit takes chunks run on a stream of 1x chunks (fit, then
+transform_chunks) and the others are skipped. Run from the repository root:
+
+    pytest benchmarks                                     # 1x, compare with baselines
+    pytest benchmarks --scales 1,10,100 -k bulldozers
+    pytest benchmarks --scales 1,10,100 --save-baselines  # record new baselines
+"""
+import gc
+import os
+import sys
+from collections import deque
+from functools import lru_cache
+from typing import Callable, Dict, List, NamedTuple
+
+import numpy as np
+import pytest
+from sklearn.pipeline import make_pipeline
+
+pytest.importorskip("pytest_benchmark")
+
+try:
+    from .datasets import DATASETS, MUSHROOM_CODES, make_chunks
+    from .harness import ROOT, load_module, traced_peak
+except ImportError:
+    # Collected with benchmarks/ on sys.path
+    from datasets import DATASETS, MUSHROOM_CODES, make_chunks
+    from harness import ROOT, load_module, traced_peak
+
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.join(ROOT, "projects", "proj_1_team_1"))
+
+shared = load_module("shared_transformers", "src/custom_transformers.py")
+outliers = load_module("shared_outlier_remover", "src/outlier_remover_wojciech_jurewicz.py")
+bulldozers = load_module("bulldozers_transformers", "projects/proj_2_team_4/src/custom_transformers.py")
+beers = load_module("beers_transformers", "projects/proj_3_team_5/src/custom_transformers.py")
+shrooms = load_module("shroom_preprocessing", "projects/proj_1_team_1/shroom_preprocessing.py")
+
+# Smallest scale at which a dataset is streamed in 1x chunks instead of held as one frame
+STREAM_FROM = {"bulldozers": 100}
+
+
+class Case(NamedTuple):
+    name: str
+    dataset: str
+    make: Callable
+    # Whether transform is timed separately; False for steps only meaningful as fit_transform
+    transform: bool = True
+    # Whether fit takes an iterator of chunks (ChunkedFitMixin), so the case runs on data too large to hold
+    streams: bool = False
+
+
+MUSHROOM_COLUMNS = [column for column in MUSHROOM_CODES if column != "stalk-root"]
+NUMERIC = ["YearMade", "MachineHoursCurrentMeter", "auctioneerID", "ModelID"]
+LABELS = ["state", "ProductGroup", "Enclosure", "Hydraulics", "fiBaseModel"]
+ONE_HOT = ["UsageBand", "ProductSize", "Drive_System", "Transmission", "fiSecondaryDesc"]
+TASTES = ["ABV", "Ave Rating", "Min IBU", "Max IBU", "Astringency", "Body", "Alcohol", "Bitter"]
+
+CASES: List[Case] = [
+    # src/custom_transformers.py and the mushroom preprocessing built on it
+    Case("shared.DropColumnTransformer", "mushrooms", lambda: shared.DropColumnTransformer(["stalk-root"])),
+    Case("shared.CustomLabelEncoder", "mushrooms", lambda: shared.CustomLabelEncoder(MUSHROOM_COLUMNS)),
+    Case("shared.CustomOneHotEncoder", "mushrooms", lambda: shared.CustomOneHotEncoder(MUSHROOM_COLUMNS)),
+    Case("shroom.CustomOrdinalEncoder", "mushrooms",
+         lambda: shrooms.CustomOrdinalEncoder(["gill-size", "stalk-shape", "ring-number", "population"])),
+    Case("shroom.make_preprocessing", "mushrooms", shrooms.make_preprocessing, transform=False),
+    Case("shared.CustomImputer", "bulldozers", lambda: shared.CustomImputer("mean", NUMERIC)),
+    Case("shared.CustomStandardScaler", "bulldozers", lambda: shared.CustomStandardScaler(NUMERIC[:1])),
+    Case("shared.CustomMinMaxScaler", "bulldozers", lambda: shared.CustomMinMaxScaler(NUMERIC[:1])),
+    Case("shared.CustomImputeScaler", "bulldozers", lambda: shared.CustomImputeScaler(NUMERIC)),
+    Case("shared.CustomOutlierRemover", "bulldozers", lambda: shared.CustomOutlierRemover(3, NUMERIC)),
+    Case("shared.OutlierRemoveTransformer", "bulldozers", lambda: outliers.OutlierRemoveTransformer(3)),
+    # projects/proj_2_team_4/src/custom_transformers.py
+    Case("bulldozers.MeasurementCleaner", "bulldozers", bulldozers.MeasurementCleaner, streams=True),
+    Case("bulldozers.DateProcessor", "bulldozers", bulldozers.DateProcessor, streams=True),
+    Case("bulldozers.ProductClassTransformer", "bulldozers", bulldozers.ProductClassTransformer, streams=True),
+    Case("bulldozers.ModelDescriptionTransformer", "bulldozers", bulldozers.ModelDescriptionTransformer, streams=True),
+    Case("bulldozers.CustomImputer", "bulldozers", lambda: bulldozers.CustomImputer("median", NUMERIC)),
+    Case("bulldozers.CustomLabelEncoder", "bulldozers", lambda: bulldozers.CustomLabelEncoder(LABELS), streams=True),
+    Case("bulldozers.ExtendedLabelEncoder", "bulldozers", lambda: bulldozers.ExtendedLabelEncoder(["fiModelDesc"]),
+         streams=True),
+    # Sparse, as the dense output of 10x does not fit in memory next to its input
+    Case("bulldozers.ExtendedOneHotEncoder", "bulldozers",
+         lambda: bulldozers.ExtendedOneHotEncoder(ONE_HOT, max_categories=20, sparse_output=True),
+         streams=True),
+    Case("bulldozers.CustomStandardScaler", "bulldozers", lambda: bulldozers.CustomStandardScaler(NUMERIC), streams=True),
+    Case("bulldozers.CustomMinMaxScaler", "bulldozers", lambda: bulldozers.CustomMinMaxScaler(NUMERIC[:1]),
+         streams=True),
+    Case("bulldozers.CustomImputeScaler", "bulldozers", lambda: bulldozers.CustomImputeScaler(NUMERIC), streams=True),
+    Case("bulldozers.CustomOutlierRemover", "bulldozers", lambda: bulldozers.CustomOutlierRemover(NUMERIC),
+         streams=True),
+    # projects/proj_3_team_5/src/custom_transformers.py
+    Case("beers.TextCleaner", "beers",
+         lambda: beers.TextCleaner("Description", ["^Notes:", "error entering this description"])),
+    # The sparse output stacks the other columns, so the text columns are dropped first
+    Case("beers.TfidfEncoder", "beers", lambda: make_pipeline(
+        shared.DropColumnTransformer(["Name", "Style", "Brewery", "Beer Name (Full)"]),
+        beers.TfidfEncoder("Description", sparse_output=True),
+    )),
+    # Progress bars would be drawn into the results table
+    Case("beers.CustomTokenizer", "beers",
+         lambda: beers.CustomTokenizer("Description", vocab_size=1000, show_progress=False)),
+    Case("beers.CustomTokenizerVectorizer", "beers",
+         lambda: beers.CustomTokenizerVectorizer("Description", vocab_size=1000, sparse_output=True,
+                                                 show_progress=False)),
+    Case("beers.CustomOutlierRemover", "beers", lambda: beers.CustomOutlierRemover(TASTES)),
+]
+
+
+def rounds(scale: int) -> int:
+    return {1: 5, 10: 3}.get(scale, 1)
+
+
+@lru_cache(maxsize=1)
+def load_data(dataset: str, scale: int):
+    """The dataset at scale, or a function returning an iterator of its chunks; one is held at a time."""
+    if scale >= STREAM_FROM.get(dataset, float("inf")):
+        return make_chunks(DATASETS[dataset], scale)
+    return DATASETS[dataset](scale)
+
+
+def regressions(result: Dict[str, float], baseline: Dict[str, float], max_slowdown: float,
+                max_memory_growth: float, min_seconds: float = 0.02) -> List[str]:
+    found = []
+    for metric, value in result.items():
+        if metric not in baseline:
+            continue
+        if metric.endswith("_seconds"):
+            # Ignore timer noise on very fast steps
+            if value > min_seconds and value > baseline[metric] * max_slowdown:
+                found.append(f"{metric} {baseline[metric]:.3f}s -> {value:.3f}s")
+        elif value > baseline[metric] * max_memory_growth + 1:
+            found.append(f"{metric} {baseline[metric]:.1f}MB -> {value:.1f}MB")
+    return found
+
+
+def pytest_generate_tests(metafunc):
+    # Scale outermost and cases grouped by dataset, so each dataset is generated once per scale
+    scales = [int(scale) for scale in metafunc.config.getoption("scales").split(",")]
+    params = [
+        pytest.param(case, step, scale, id=f"{case.name}-{step}-{scale}x")
+        for scale in scales
+        for dataset in DATASETS
+        for case in CASES if case.dataset == dataset
+        for step in (["fit", "transform"] if case.transform else ["fit"])
+    ]
+    metafunc.parametrize("case, step, scale", params)
+
+
+def collect_garbage():
+    gc.collect()
+
+
+def test_transformer(benchmark, baselines, request, case, step, scale):
+    data = load_data(case.dataset, scale)
+    streamed = callable(data)
+    if streamed and not case.streams:
+        pytest.skip(f"{case.dataset} x{scale} does not fit in memory and {case.name} cannot fit chunks")
+
+    if step == "fit":
+        run = lambda: case.make().fit(data() if streamed else data)
+    elif streamed:
+        fitted = case.make().fit(data())
+        # Drain the generator; only one transformed chunk is held at a time
+        run = lambda: deque(fitted.transform_chunks(data()), maxlen=0)
+    else:
+        fitted = case.make().fit(data)
+        run = lambda: fitted.transform(data)
+
+    benchmark.group = f"{case.dataset} x{scale}"
+    with np.errstate(all="ignore"):
+        benchmark.pedantic(run, setup=collect_garbage, rounds=rounds(scale))
+        peak, _ = traced_peak(run)
+    benchmark.extra_info["peak_mb"] = peak / 2**20
+    if benchmark.disabled:
+        return
+
+    result = {f"{step}_seconds": benchmark.stats.stats.min, f"{step}_peak_mb": peak / 2**20}
+    key = f"{case.name}@{scale}x"
+    if request.config.getoption("save_baselines"):
+        baselines.setdefault(key, {}).update({metric: round(value, 4) for metric, value in result.items()})
+        return
+    found = regressions(result, baselines.get(key, {}), request.config.getoption("max_slowdown"),
+                        request.config.getoption("max_memory_growth"))
+    assert not found, f"{key}: " + "; ".join(found)
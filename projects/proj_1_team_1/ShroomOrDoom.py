@@ -2,108 +2,18 @@ import os
 import sys
 import tkinter as tk
 from PIL import Image, ImageTk
-import joblib
-import pandas as pd
-from sklearn.pipeline import make_pipeline
 
-all_column_names = ['bruises', 'gill-size', 'stalk-shape', 'ring-number', 'population', 'cap-shape_b', 'cap-shape_c', 'cap-shape_f', 'cap-shape_k', 'cap-shape_s', 'cap-shape_x', 'cap-surface_f', 'cap-surface_g', 'cap-surface_s', 'cap-surface_y', 'cap-color_b', 'cap-color_c', 'cap-color_e', 'cap-color_g', 'cap-color_n', 'cap-color_p', 'cap-color_r', 'cap-color_u', 'cap-color_w', 'cap-color_y', 'odor_a', 'odor_c', 'odor_f', 'odor_l', 'odor_m', 'odor_n', 'odor_p', 'odor_s', 'odor_y', 'gill-attachment_a', 'gill-attachment_f', 'gill-spacing_c', 'gill-spacing_w', 'gill-color_b', 'gill-color_e', 'gill-color_g', 'gill-color_h', 'gill-color_k', 'gill-color_n', 'gill-color_o', 'gill-color_p', 'gill-color_r', 'gill-color_u', 'gill-color_w', 'gill-color_y', 'stalk-surface-above-ring_f', 'stalk-surface-above-ring_k', 'stalk-surface-above-ring_s', 'stalk-surface-above-ring_y', 'stalk-surface-below-ring_f', 'stalk-surface-below-ring_k', 'stalk-surface-below-ring_s', 'stalk-surface-below-ring_y', 'stalk-color-above-ring_b', 'stalk-color-above-ring_c', 'stalk-color-above-ring_e', 'stalk-color-above-ring_g', 'stalk-color-above-ring_n', 'stalk-color-above-ring_o', 'stalk-color-above-ring_p', 'stalk-color-above-ring_w', 'stalk-color-above-ring_y', 'stalk-color-below-ring_b', 'stalk-color-below-ring_c', 'stalk-color-below-ring_e', 'stalk-color-below-ring_g', 'stalk-color-below-ring_n', 'stalk-color-below-ring_o', 'stalk-color-below-ring_p', 'stalk-color-below-ring_w', 'stalk-color-below-ring_y', 'veil-color_n', 'veil-color_o', 'veil-color_w', 'veil-color_y', 'ring-type_e', 'ring-type_f', 'ring-type_l', 'ring-type_n', 'ring-type_p', 'spore-print-color_b', 'spore-print-color_h', 'spore-print-color_k', 'spore-print-color_n', 'spore-print-color_o', 'spore-print-color_r', 'spore-print-color_u', 'spore-print-color_w', 'spore-print-color_y', 'habitat_d', 'habitat_g', 'habitat_l', 'habitat_m', 'habitat_p', 'habitat_u', 'habitat_w']
-
-# Add the 'src' directory to the Python path
+# Add the project directory to the Python path
 current_dir = os.path.dirname(os.path.abspath(__file__))
-src_dir = os.path.abspath(os.path.join(current_dir, "..", "..", "src"))
-
-if src_dir not in sys.path:
-    sys.path.insert(0, src_dir)
-
-from custom_transformers import (
-    DropColumnTransformer,
-    CustomLabelEncoder,
-    CustomOneHotEncoder,
-)
-
-# Load the preprocessing pipeline and model
-model = joblib.load(os.path.join(current_dir, "logreg_pipeline.joblib"))
-
-from sklearn.base import BaseEstimator, TransformerMixin
-from sklearn.preprocessing import OrdinalEncoder
-from sklearn.pipeline import make_pipeline
-
-class CustomOrdinalEncoder(BaseEstimator, TransformerMixin):
-
-    def __init__(self, columns, order=None):
-        self.columns = columns
-        self.order = order if order is not None else {}
-        self.encoders = {}
-
-    def fit(self, X, y=None):
-        for column in self.columns:
-            if column in self.order:
-                self.encoders[column] = OrdinalEncoder(categories=[self.order[column]])
-            else:
-                self.encoders[column] = OrdinalEncoder()
-            self.encoders[column].fit(X[[column]])
-        return self
-
-    def transform(self, X):
-        X_transformed = X.copy()
-        for column in self.columns:
-            X_transformed[column] = self.encoders[column].transform(X[[column]])
-        return X_transformed
-
-preprocessing = make_pipeline(
-    DropColumnTransformer(columns=["stalk-root"]), 
-    CustomLabelEncoder(columns=["bruises"]),
-    
-    CustomOrdinalEncoder(
-        columns=["gill-size", "stalk-shape", "ring-number", "population"],
-        order={
-            "gill-size": ["n", "b"],  # narrow < broad
-            "stalk-shape": ["t", "e"],  # tapering < enlarging
-            "ring-number": ["n", "o", "t"],  # none < one < two
-            "population": ["y", "v", "s", "n", "c", "a"]  # solitary < several < scattered < numerous < clustered < abundant
-        }
-    ),
-    
-    CustomOneHotEncoder(columns=[
-        "cap-shape", "cap-surface", "cap-color", "odor", "gill-attachment",
-        "gill-spacing", "gill-color", "stalk-surface-above-ring",
-        "stalk-surface-below-ring", "stalk-color-above-ring", "stalk-color-below-ring",
-        "veil-color", "ring-type", "spore-print-color", "habitat"
-    ])
-)
-
-# Descriptive mushroom feature options
-features = {
-    "cap-shape": {'b': "bell", 'c': "conical", 'x': "convex", 'f': "flat", 'k': "knobbed", 's': "sunken"},
-    "cap-surface": {'f': "fibrous", 'g': "grooves", 'y': "scaly", 's': "smooth"},
-    "cap-color": {'n': "brown", 'b': "buff", 'c': "cinnamon", 'g': "gray", 'r': "green", 'p': "pink",
-                  'u': "purple", 'e': "red", 'w': "white", 'y': "yellow"},
-    "bruises": {'t': "bruises", 'f': "no bruises"},
-    "odor": {'a': "almond", 'l': "anise", 'c': "creosote", 'y': "fishy", 'f': "foul", 'm': "musty",
-             'n': "none", 'p': "pungent", 's': "spicy"},
-    "gill-attachment": {'a': "attached", 'd': "descending", 'f': "free", 'n': "notched"},
-    "gill-spacing": {'c': "close", 'w': "crowded", 'd': "distant"},
-    "gill-size": {'b': "broad", 'n': "narrow"},
-    "gill-color": {'k': "black", 'n': "brown", 'b': "buff", 'h': "chocolate", 'g': "gray", 'r': "green",
-                   'o': "orange", 'p': "pink", 'u': "purple", 'e': "red", 'w': "white", 'y': "yellow"},
-    "stalk-shape": {'e': "enlarging", 't': "tapering"},
-    "stalk-root": {'b': "bulbous", 'c': "club", 'u': "cup", 'e': "equal", 'z': "rhizomorphs",
-                   'r': "rooted", '?': "missing"},
-    "stalk-surface-above-ring": {'f': "fibrous", 'y': "scaly", 'k': "silky", 's': "smooth"},
-    "stalk-surface-below-ring": {'f': "fibrous", 'y': "scaly", 'k': "silky", 's': "smooth"},
-    "stalk-color-above-ring": {'n': "brown", 'b': "buff", 'c': "cinnamon", 'g': "gray", 'o': "orange", 'p': "pink",
-                               'e': "red", 'w': "white", 'y': "yellow"},
-    "stalk-color-below-ring": {'n': "brown", 'b': "buff", 'c': "cinnamon", 'g': "gray", 'o': "orange", 'p': "pink",
-                               'e': "red", 'w': "white", 'y': "yellow"},
-    "veil-color": {'n': "brown", 'o': "orange", 'w': "white", 'y': "yellow"},
-    "ring-number": {'n': "none", 'o': "one", 't': "two"},
-    "ring-type": {'e': "evanescent", 'f': "flaring", 'l': "large", 'n': "none",
-                  'p': "pendant"},
-    "spore-print-color": {'k': "black", 'n': "brown", 'b': "buff", 'h': "chocolate", 'r': "green", 'o': "orange",
-                          'u': "purple", 'w': "white", 'y': "yellow"},
-    "population": {'a': "abundant", 'c': "clustered", 'n': "numerous", 's': "scattered", 'v': "several", 'y': "solitary"},
-    "habitat": {'g': "grasses", 'l': "leaves", 'm': "meadows", 'p': "paths", 'u': "urban", 'w': "waste", 'd': "woods"}
-}
+
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+from shroom_preprocessing import features, load_artifact, array_model
+
+# Load the row encoder (fitted once on the full category vocabulary) and the model
+encoder, model = load_artifact()
+row_model = array_model(model)
 
 # Track classification state
 classified = False
@@ -158,16 +68,10 @@ def classify():
             return
     
 
-    # Prepare one-row DataFrame
-    input_data = {feature: [var.get()] for feature, var in variables.items()}
-    input_df = pd.DataFrame(input_data)
-
-    X_input = preprocessing.fit_transform(input_df)
+    # Encode the selected codes straight into the model's feature vector
+    X_input = encoder.transform_row({feature: var.get() for feature, var in variables.items()}).reshape(1, -1)
 
-    X_input = X_input.reindex(columns=all_column_names, fill_value=0)
-
-    
-    prediction = model.predict(X_input)[0]
+    prediction = row_model.predict(X_input)[0]
     print("Prediction:", prediction)
     if prediction == 'p':
         result_label.config(text="Classification: poisonous", bg="darkred", fg="white")
@@ -1,24 +1,97 @@
+import argparse
 import os
 from sklearn.pipeline import make_pipeline
 from sklearn.linear_model import LogisticRegression
 from sklearn.model_selection import train_test_split
 import joblib
+import numpy as np
 import pandas as pd
 
+from shroom_preprocessing import ShroomEncoder, save_artifact
+from shroom_lookup import LookupTableClassifier
+from score_mushrooms import read_chunks
 
-while any(marker in os.getcwd() for marker in ('exercises', 'notebooks', 'students', 'research', 'projects')):
-    os.chdir("..")
-os.chdir("projects/proj_1_team_1")
 
-df = pd.read_csv("mushrooms_preprocessed.csv", index_col=0)
+def train():
+    df = pd.read_csv("mushrooms_preprocessed.csv", index_col=0)
 
-X = df.drop(columns='poisonous')
-y = df['poisonous']
+    X = df.drop(columns='poisonous')
+    y = df['poisonous']
 
-X_train, X_test, y_train, y_test = train_test_split(X, y, stratify=y, random_state=42)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, stratify=y, random_state=42)
 
-logreg_pipeline = make_pipeline(LogisticRegression(max_iter=1000))
+    logreg_pipeline = make_pipeline(LogisticRegression(max_iter=1000))
 
-logreg_pipeline.fit(X_train, y_train)
+    logreg_pipeline.fit(X_train, y_train)
 
-joblib.dump(logreg_pipeline, "logreg_pipeline.joblib")
\ No newline at end of file
+    joblib.dump(logreg_pipeline, "logreg_pipeline.joblib")
+    # Rebuild the encoder+model artifact the GUI and scorer load
+    save_artifact()
+
+
+def compile_lookup_tables(logreg_pipeline) -> LookupTableClassifier:
+    # Only a bare binary LogisticRegression is linear in the encoded features
+    if len(logreg_pipeline) != 1 or len(logreg_pipeline[-1].classes_) != 2:
+        raise ValueError("Expected a pipeline with a single binary LogisticRegression.")
+    logreg = logreg_pipeline[-1]
+    encoder = ShroomEncoder(logreg.feature_names_in_).fit()
+
+    # Each category adds the dot product of its encoded columns with their weights
+    feature_names = list(encoder.columns)
+    categories = [list(encoder.lookup[feature]) for feature in feature_names]
+    tables = np.zeros((len(feature_names), max(len(codes) for codes in categories) + 1))
+    for j, feature in enumerate(feature_names):
+        weights = logreg.coef_[0, encoder.columns[feature]]
+        for i, code in enumerate(categories[j]):
+            tables[j, i] = weights @ encoder.lookup[feature][code]
+
+    return LookupTableClassifier(feature_names, categories, tables, logreg.intercept_[0], logreg.classes_)
+
+
+def load_raw(path=None) -> pd.DataFrame:
+    # A local raw UCI file when given, otherwise all 8,124 rows from the UCI repository
+    if path is not None:
+        return pd.concat(read_chunks(path, chunksize=100_000), ignore_index=True)
+    from ucimlrepo import fetch_ucirepo
+
+    return fetch_ucirepo(id=73).data.features
+
+
+def check_lookup_tables(lookup: LookupTableClassifier, logreg_pipeline, raw: pd.DataFrame) -> float:
+    # Compare against predict_proba on raw rows of single-letter codes
+    encoder = ShroomEncoder(logreg_pipeline[-1].feature_names_in_).fit()
+    X = pd.DataFrame(
+        np.array([encoder.transform_row(row) for row in raw.to_dict("records")]),
+        columns=encoder.feature_names,
+    )
+    expected = logreg_pipeline.predict_proba(X)
+    actual = lookup.predict_proba(lookup.encode(raw[lookup.feature_names].to_numpy()))
+
+    max_error = np.abs(expected - actual).max()
+    if not np.allclose(expected, actual):
+        raise AssertionError(f"Lookup tables differ from predict_proba (max error {max_error:.3e}).")
+    return max_error
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the mushroom logistic regression.")
+    parser.add_argument("--export", action="store_true",
+                        help="compile logreg_pipeline.joblib into logreg_lookup.npz instead of training")
+    parser.add_argument("--check", action="store_true",
+                        help="with --export, verify the tables against predict_proba on the full dataset")
+    parser.add_argument("--data", help="raw UCI mushroom CSV to check against instead of downloading it")
+    args = parser.parse_args()
+
+    while any(marker in os.getcwd() for marker in ('exercises', 'notebooks', 'students', 'research', 'projects')):
+        os.chdir("..")
+    os.chdir("projects/proj_1_team_1")
+
+    if args.export:
+        logreg_pipeline = joblib.load("logreg_pipeline.joblib")
+        lookup = compile_lookup_tables(logreg_pipeline)
+        lookup.save("logreg_lookup.npz")
+        if args.check:
+            raw = load_raw(args.data)
+            print(f"Max probability error: {check_lookup_tables(lookup, logreg_pipeline, raw):.3e}")
+    else:
+        train()
@@ -0,0 +1,87 @@
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from shroom_preprocessing import uci_columns, load_artifact
+
+# Loaded once per process, see _init_worker
+encoder = None
+model = None
+
+
+def _init_worker():
+    global encoder, model
+    encoder, model = load_artifact()
+
+
+def score_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    X = encoder.transform(chunk)
+    probabilities = model.predict_proba(X)
+    scored = pd.DataFrame(
+        probabilities,
+        columns=[f"probability_{label}" for label in model.classes_],
+        index=chunk.index,
+    )
+    scored.insert(0, "prediction", model.classes_[probabilities.argmax(axis=1)])
+    return scored
+
+
+def read_chunks(path: str, chunksize: int):
+    # Raw UCI files have no header; files with a header are read as they are
+    with open(path) as f:
+        has_header = "cap-shape" in f.readline()
+    if has_header:
+        return pd.read_csv(path, chunksize=chunksize, dtype=str)
+    with open(path) as f:
+        n_fields = len(f.readline().split(","))
+    names = uci_columns if n_fields == len(uci_columns) else uci_columns[1:]
+    return pd.read_csv(path, chunksize=chunksize, header=None, names=names, dtype=str)
+
+
+def score_file(input_path: str, output_path: str, chunksize: int = 100_000, n_jobs: int = 1) -> int:
+    chunks = read_chunks(input_path, chunksize)
+    n_rows = 0
+    header = True
+
+    def write(scored):
+        nonlocal n_rows, header
+        scored.to_csv(output_path, mode="w" if header else "a", header=header, index_label="row")
+        n_rows += len(scored)
+        header = False
+
+    if n_jobs == 1:
+        _init_worker()
+        for chunk in chunks:
+            write(score_chunk(chunk))
+        return n_rows
+
+    # Keep at most two chunks per worker in flight so memory stays bounded
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(score_chunk, chunk))
+            if len(pending) >= 2 * n_jobs:
+                write(pending.popleft().result())
+        while pending:
+            write(pending.popleft().result())
+    return n_rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score raw UCI mushroom CSV files in batch.")
+    parser.add_argument("input", help="CSV with single-letter codes, with or without a header")
+    parser.add_argument("output", help="CSV to write predictions and class probabilities to")
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--n-jobs", type=int, default=1, help="number of scoring processes, -1 for all cores")
+    args = parser.parse_args()
+
+    n_jobs = os.cpu_count() if args.n_jobs == -1 else args.n_jobs
+    start = time.perf_counter()
+    n_rows = score_file(args.input, args.output, chunksize=args.chunksize, n_jobs=n_jobs)
+    elapsed = time.perf_counter() - start
+    print(f"Scored {n_rows} rows in {elapsed:.2f}s ({n_rows / elapsed:,.0f} rows/sec)", file=sys.stderr)
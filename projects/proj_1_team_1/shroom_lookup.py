@@ -0,0 +1,68 @@
+import numpy as np
+
+
+class LookupTableClassifier:
+    """Logistic regression compiled into per-feature, per-category logit tables.
+
+    Scoring a row is one table lookup per feature and a sum, using NumPy only.
+    """
+
+    def __init__(self, feature_names, categories, tables, intercept, classes):
+        self.feature_names = list(feature_names)
+        self.categories = [list(codes) for codes in categories]
+        self.tables = np.asarray(tables, dtype=float)
+        self.intercept = float(intercept)
+        self.classes = np.asarray(classes)
+        # The last column of every table is zero and catches unknown codes
+        self.unknown_code = self.tables.shape[1] - 1
+        self._code_index = [
+            {code: i for i, code in enumerate(codes)} for codes in self.categories
+        ]
+
+    def encode(self, rows) -> np.ndarray:
+        """Map category codes, ordered as feature_names, to integer category codes."""
+        rows = np.asarray(rows, dtype=object).reshape(-1, len(self.feature_names))
+        codes = np.full(rows.shape, self.unknown_code, dtype=np.intp)
+        for j, index in enumerate(self._code_index):
+            for code, i in index.items():
+                codes[rows[:, j] == code, j] = i
+        return codes
+
+    def decision_function(self, codes) -> np.ndarray:
+        codes = np.asarray(codes, dtype=np.intp).reshape(-1, len(self.feature_names))
+        return self.intercept + self.tables[np.arange(len(self.feature_names)), codes].sum(axis=1)
+
+    def predict_proba(self, codes) -> np.ndarray:
+        positive = 1.0 / (1.0 + np.exp(-self.decision_function(codes)))
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, codes) -> np.ndarray:
+        return self.classes[(self.decision_function(codes) > 0).astype(np.intp)]
+
+    def save(self, path: str) -> None:
+        # Codes are stored one per cell, padded per feature, so they may be any string
+        n_categories = np.array([len(codes) for codes in self.categories], dtype=np.intp)
+        categories = np.full((len(self.categories), n_categories.max(initial=0)), "", dtype=object)
+        for j, codes in enumerate(self.categories):
+            categories[j, :len(codes)] = codes
+        np.savez(
+            path,
+            feature_names=np.array(self.feature_names),
+            categories=categories.astype(str),
+            n_categories=n_categories,
+            tables=self.tables,
+            intercept=self.intercept,
+            classes=self.classes.astype(str),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "LookupTableClassifier":
+        with np.load(path) as data:
+            categories = [row[:n].tolist() for row, n in zip(data["categories"], data["n_categories"])]
+            return cls(
+                feature_names=data["feature_names"].tolist(),
+                categories=categories,
+                tables=data["tables"],
+                intercept=data["intercept"],
+                classes=data["classes"],
+            )
@@ -0,0 +1,227 @@
+import copy
+import os
+import sys
+from typing import Dict
+
+import joblib
+from joblib import delayed
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.preprocessing import OrdinalEncoder
+from sklearn.pipeline import make_pipeline
+
+all_column_names = ['bruises', 'gill-size', 'stalk-shape', 'ring-number', 'population', 'cap-shape_b', 'cap-shape_c', 'cap-shape_f', 'cap-shape_k', 'cap-shape_s', 'cap-shape_x', 'cap-surface_f', 'cap-surface_g', 'cap-surface_s', 'cap-surface_y', 'cap-color_b', 'cap-color_c', 'cap-color_e', 'cap-color_g', 'cap-color_n', 'cap-color_p', 'cap-color_r', 'cap-color_u', 'cap-color_w', 'cap-color_y', 'odor_a', 'odor_c', 'odor_f', 'odor_l', 'odor_m', 'odor_n', 'odor_p', 'odor_s', 'odor_y', 'gill-attachment_a', 'gill-attachment_f', 'gill-spacing_c', 'gill-spacing_w', 'gill-color_b', 'gill-color_e', 'gill-color_g', 'gill-color_h', 'gill-color_k', 'gill-color_n', 'gill-color_o', 'gill-color_p', 'gill-color_r', 'gill-color_u', 'gill-color_w', 'gill-color_y', 'stalk-surface-above-ring_f', 'stalk-surface-above-ring_k', 'stalk-surface-above-ring_s', 'stalk-surface-above-ring_y', 'stalk-surface-below-ring_f', 'stalk-surface-below-ring_k', 'stalk-surface-below-ring_s', 'stalk-surface-below-ring_y', 'stalk-color-above-ring_b', 'stalk-color-above-ring_c', 'stalk-color-above-ring_e', 'stalk-color-above-ring_g', 'stalk-color-above-ring_n', 'stalk-color-above-ring_o', 'stalk-color-above-ring_p', 'stalk-color-above-ring_w', 'stalk-color-above-ring_y', 'stalk-color-below-ring_b', 'stalk-color-below-ring_c', 'stalk-color-below-ring_e', 'stalk-color-below-ring_g', 'stalk-color-below-ring_n', 'stalk-color-below-ring_o', 'stalk-color-below-ring_p', 'stalk-color-below-ring_w', 'stalk-color-below-ring_y', 'veil-color_n', 'veil-color_o', 'veil-color_w', 'veil-color_y', 'ring-type_e', 'ring-type_f', 'ring-type_l', 'ring-type_n', 'ring-type_p', 'spore-print-color_b', 'spore-print-color_h', 'spore-print-color_k', 'spore-print-color_n', 'spore-print-color_o', 'spore-print-color_r', 'spore-print-color_u', 'spore-print-color_w', 'spore-print-color_y', 'habitat_d', 'habitat_g', 'habitat_l', 'habitat_m', 'habitat_p', 'habitat_u', 'habitat_w']
+
+# Add the 'src' directory to the Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.abspath(os.path.join(current_dir, "..", "..", "src"))
+
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from column_jobs import parallel_columns
+from custom_transformers import (
+    DropColumnTransformer,
+    CustomLabelEncoder,
+    CustomOneHotEncoder,
+)
+
+# Column order of the raw UCI agaricus-lepiota.data file
+uci_columns = [
+    "poisonous", "cap-shape", "cap-surface", "cap-color", "bruises", "odor",
+    "gill-attachment", "gill-spacing", "gill-size", "gill-color", "stalk-shape",
+    "stalk-root", "stalk-surface-above-ring", "stalk-surface-below-ring",
+    "stalk-color-above-ring", "stalk-color-below-ring", "veil-type", "veil-color",
+    "ring-number", "ring-type", "spore-print-color", "population", "habitat"
+]
+
+MODEL_PATH = os.path.join(current_dir, "logreg_pipeline.joblib")
+ARTIFACT_PATH = os.path.join(current_dir, "shroom_artifact.joblib")
+
+
+class CustomOrdinalEncoder(BaseEstimator, TransformerMixin):
+
+    def __init__(self, columns, order=None, n_jobs=None):
+        self.columns = columns
+        self.order = order if order is not None else {}
+        self.n_jobs = n_jobs
+        self.encoders = {}
+
+    def _new_encoder(self, column):
+        if column in self.order:
+            return OrdinalEncoder(categories=[self.order[column]])
+        return OrdinalEncoder()
+
+    def fit(self, X, y=None):
+        # n_jobs fits and encodes the columns in worker processes
+        encoders = parallel_columns(
+            (delayed(self._new_encoder(column).fit)(X[[column]]) for column in self.columns), self.n_jobs
+        )
+        self.encoders = dict(zip(self.columns, encoders))
+        return self
+
+    def transform(self, X):
+        X_transformed = X.copy()
+        encoded = parallel_columns(
+            (delayed(self.encoders[column].transform)(X[[column]]) for column in self.columns), self.n_jobs
+        )
+        for column, values in zip(self.columns, encoded):
+            X_transformed[column] = values
+        return X_transformed
+
+
+def make_preprocessing():
+    return make_pipeline(
+        DropColumnTransformer(columns=["stalk-root"]),
+        CustomLabelEncoder(columns=["bruises"]),
+
+        CustomOrdinalEncoder(
+            columns=["gill-size", "stalk-shape", "ring-number", "population"],
+            order={
+                "gill-size": ["n", "b"],  # narrow < broad
+                "stalk-shape": ["t", "e"],  # tapering < enlarging
+                "ring-number": ["n", "o", "t"],  # none < one < two
+                "population": ["y", "v", "s", "n", "c", "a"]  # solitary < several < scattered < numerous < clustered < abundant
+            }
+        ),
+
+        CustomOneHotEncoder(columns=[
+            "cap-shape", "cap-surface", "cap-color", "odor", "gill-attachment",
+            "gill-spacing", "gill-color", "stalk-surface-above-ring",
+            "stalk-surface-below-ring", "stalk-color-above-ring", "stalk-color-below-ring",
+            "veil-color", "ring-type", "spore-print-color", "habitat"
+        ])
+    )
+
+
+# Descriptive mushroom feature options
+features = {
+    "cap-shape": {'b': "bell", 'c': "conical", 'x': "convex", 'f': "flat", 'k': "knobbed", 's': "sunken"},
+    "cap-surface": {'f': "fibrous", 'g': "grooves", 'y': "scaly", 's': "smooth"},
+    "cap-color": {'n': "brown", 'b': "buff", 'c': "cinnamon", 'g': "gray", 'r': "green", 'p': "pink",
+                  'u': "purple", 'e': "red", 'w': "white", 'y': "yellow"},
+    "bruises": {'t': "bruises", 'f': "no bruises"},
+    "odor": {'a': "almond", 'l': "anise", 'c': "creosote", 'y': "fishy", 'f': "foul", 'm': "musty",
+             'n': "none", 'p': "pungent", 's': "spicy"},
+    "gill-attachment": {'a': "attached", 'd': "descending", 'f': "free", 'n': "notched"},
+    "gill-spacing": {'c': "close", 'w': "crowded", 'd': "distant"},
+    "gill-size": {'b': "broad", 'n': "narrow"},
+    "gill-color": {'k': "black", 'n': "brown", 'b': "buff", 'h': "chocolate", 'g': "gray", 'r': "green",
+                   'o': "orange", 'p': "pink", 'u': "purple", 'e': "red", 'w': "white", 'y': "yellow"},
+    "stalk-shape": {'e': "enlarging", 't': "tapering"},
+    "stalk-root": {'b': "bulbous", 'c': "club", 'u': "cup", 'e': "equal", 'z': "rhizomorphs",
+                   'r': "rooted", '?': "missing"},
+    "stalk-surface-above-ring": {'f': "fibrous", 'y': "scaly", 'k': "silky", 's': "smooth"},
+    "stalk-surface-below-ring": {'f': "fibrous", 'y': "scaly", 'k': "silky", 's': "smooth"},
+    "stalk-color-above-ring": {'n': "brown", 'b': "buff", 'c': "cinnamon", 'g': "gray", 'o': "orange", 'p': "pink",
+                               'e': "red", 'w': "white", 'y': "yellow"},
+    "stalk-color-below-ring": {'n': "brown", 'b': "buff", 'c': "cinnamon", 'g': "gray", 'o': "orange", 'p': "pink",
+                               'e': "red", 'w': "white", 'y': "yellow"},
+    "veil-color": {'n': "brown", 'o': "orange", 'w': "white", 'y': "yellow"},
+    "ring-number": {'n': "none", 'o': "one", 't': "two"},
+    "ring-type": {'e': "evanescent", 'f': "flaring", 'l': "large", 'n': "none",
+                  'p': "pendant"},
+    "spore-print-color": {'k': "black", 'n': "brown", 'b': "buff", 'h': "chocolate", 'r': "green", 'o': "orange",
+                          'u': "purple", 'w': "white", 'y': "yellow"},
+    "population": {'a': "abundant", 'c': "clustered", 'n': "numerous", 's': "scattered", 'v': "several", 'y': "solitary"},
+    "habitat": {'g': "grasses", 'l': "leaves", 'm': "meadows", 'p': "paths", 'u': "urban", 'w': "waste", 'd': "woods"}
+}
+
+
+def vocabulary_frame() -> pd.DataFrame:
+    # Cycle through the codes so every category of every feature appears at least once
+    n_rows = max(len(options) for options in features.values())
+    return pd.DataFrame({
+        feature: [list(options)[i % len(options)] for i in range(n_rows)]
+        for feature, options in features.items()
+    })
+
+
+class ShroomEncoder:
+    """Maps a row of single-letter codes straight to the model's feature vector."""
+
+    def __init__(self, feature_names=None):
+        self.feature_names = list(feature_names) if feature_names is not None else list(all_column_names)
+
+    def fit(self, preprocessing=None):
+        # Fit the preprocessing once on the full category vocabulary, never on the input row
+        preprocessing = preprocessing if preprocessing is not None else make_preprocessing()
+        vocabulary = vocabulary_frame()
+        encoded = preprocessing.fit_transform(vocabulary).reindex(columns=self.feature_names, fill_value=0)
+        values = encoded.to_numpy(dtype=float)
+
+        # Each output column comes from exactly one input feature
+        self.columns = {}
+        self.lookup = {}
+        for feature in features:
+            columns = np.array([
+                i for i, name in enumerate(self.feature_names)
+                if name == feature or name.startswith(feature + "_")
+            ], dtype=np.intp)
+            if len(columns) == 0:
+                continue
+            self.columns[feature] = columns
+            self.lookup[feature] = {
+                code: values[row, columns] for row, code in enumerate(vocabulary[feature])
+            }
+        return self
+
+    def transform_row(self, row: Dict[str, str]) -> np.ndarray:
+        vector = np.zeros(len(self.feature_names))
+        for feature, columns in self.columns.items():
+            vector[columns] = self.lookup[feature][row[feature]]
+        return vector
+
+    def transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        # Batch version of transform_row, unknown codes leave their columns at zero.
+        # The columns are named like the ones the model was fitted on.
+        matrix = np.zeros((len(X), len(self.feature_names)))
+        for feature, columns in self.columns.items():
+            codes = list(self.lookup[feature])
+            table = np.vstack([self.lookup[feature][code] for code in codes] + [np.zeros(len(columns))])
+            matrix[:, columns] = table[pd.Index(codes).get_indexer(X[feature])]
+        return pd.DataFrame(matrix, columns=self.feature_names, index=X.index)
+
+
+def fit_artifact(model_path: str = MODEL_PATH):
+    model = joblib.load(model_path)
+    encoder = ShroomEncoder(getattr(model, "feature_names_in_", None)).fit()
+    return encoder, model
+
+
+def save_artifact(artifact_path: str = ARTIFACT_PATH, model_path: str = MODEL_PATH):
+    encoder, model = fit_artifact(model_path)
+    joblib.dump({"encoder": encoder, "model": model}, artifact_path)
+
+
+def load_artifact(artifact_path: str = None):
+    # The artifact is built by running this module, see the readme
+    artifact_path = artifact_path if artifact_path is not None else ARTIFACT_PATH
+    if not os.path.exists(artifact_path):
+        raise FileNotFoundError(
+            f"{artifact_path} is missing; build it with 'python shroom_preprocessing.py' after training the model."
+        )
+    artifact = joblib.load(artifact_path)
+    return artifact["encoder"], artifact["model"]
+
+
+def array_model(model):
+    """A copy of model that scores transform_row vectors without feature names.
+
+    The encoder lays its vector out in the model's feature_names_in_ order, so
+    the names are dropped instead of wrapping every row in a DataFrame.
+    """
+    model = copy.deepcopy(model)
+    for step in ([step for _, step in model.steps] if hasattr(model, "steps") else [model]):
+        if hasattr(step, "feature_names_in_"):
+            del step.feature_names_in_
+    return model
+
+
+if __name__ == "__main__":
+    # Pickle the encoder as shroom_preprocessing.ShroomEncoder rather than __main__.ShroomEncoder
+    from shroom_preprocessing import save_artifact
+
+    save_artifact()
+    print(f"Saved {ARTIFACT_PATH}")
@@ -0,0 +1,237 @@
+"""Local HTTP scoring service for the Bulldozers model with micro-batching.
+
+Concurrent requests are queued and scored together in one model.predict call,
+so per-row pandas overhead is paid once per batch instead of once per request.
+
+    python projects/proj_2_team_4/serve.py --port 8000
+
+    POST /predict   JSON record or list of records -> {"predictions": [...]}
+    GET  /metrics   p50/p99 latency and batch-size statistics
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+
+
+class PayloadError(ValueError):
+    """The request body is not a JSON record or a list of records."""
+
+
+def _resolve(future: asyncio.Future, result=None, exception: Exception = None) -> None:
+    # The client may have disconnected or cancelled while its batch was scored
+    if future.done():
+        return
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(result)
+
+
+def parse_records(body: bytes) -> List[Dict]:
+    try:
+        payload = json.loads(body)
+    except ValueError as e:
+        raise PayloadError(f"invalid JSON: {e}") from e
+    records = payload if isinstance(payload, list) else [payload]
+    if not records or not all(isinstance(record, dict) for record in records):
+        raise PayloadError("expected a JSON object or a non-empty list of objects")
+    return records
+
+
+class MicroBatcher:
+    """Coalesces queued records into batches of at most max_batch_size rows.
+
+    A batch is closed when it is full or max_latency_ms after its first record
+    arrived, whichever comes first.
+    When a batch fails, its requests are scored one by one, so only the
+    request with the bad record fails.
+    """
+
+    def __init__(self, predict_fn: Callable[[pd.DataFrame], np.ndarray],
+                 max_batch_size: int = 256, max_latency_ms: float = 5.0, history: int = 10000):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_latency_ms = max_latency_ms
+        self.queue = asyncio.Queue()
+        self.latencies_ms = deque(maxlen=history)
+        self.batch_sizes = deque(maxlen=history)
+        self.n_requests = 0
+
+    async def predict(self, records: List[Dict]) -> List[float]:
+        # Each request may carry several records; they are scored as one unit
+        start = time.perf_counter()
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((records, future))
+        predictions = await future
+        self.latencies_ms.append((time.perf_counter() - start) * 1000)
+        self.n_requests += 1
+        return predictions
+
+    async def _next_batch(self):
+        batch = [await self.queue.get()]
+        n_rows = len(batch[0][0])
+        deadline = time.perf_counter() + self.max_latency_ms / 1000
+        while n_rows < self.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            batch.append(item)
+            n_rows += len(item[0])
+        return batch
+
+    async def _predict(self, records: List[Dict]) -> np.ndarray:
+        # Inference runs in a worker thread, so the event loop keeps serving I/O
+        predictions = await asyncio.to_thread(self.predict_fn, pd.DataFrame(records))
+        # The model predicts log1p(SalePrice); invert it for the whole batch at once
+        return np.expm1(np.asarray(predictions, dtype=float))
+
+    async def _predict_each(self, batch) -> None:
+        # Score requests one by one, so a bad record only fails its own request
+        for records, future in batch:
+            try:
+                predictions = await self._predict(records)
+            except Exception as e:
+                _resolve(future, exception=e)
+                continue
+            self.batch_sizes.append(len(records))
+            _resolve(future, predictions.tolist())
+
+    async def run(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            # Requests cancelled while queued need no prediction
+            batch = [(records, future) for records, future in batch if not future.done()]
+            if not batch:
+                continue
+            records = [record for request, _ in batch for record in request]
+            try:
+                predictions = await self._predict(records)
+            except Exception:
+                await self._predict_each(batch)
+                continue
+
+            self.batch_sizes.append(len(records))
+            offset = 0
+            for request, future in batch:
+                _resolve(future, predictions[offset:offset + len(request)].tolist())
+                offset += len(request)
+
+    def metrics(self) -> Dict:
+        latencies = np.asarray(self.latencies_ms)
+        sizes = np.asarray(self.batch_sizes)
+        return {
+            "requests": self.n_requests,
+            "batches": len(self.batch_sizes),
+            "latency_ms_p50": float(np.percentile(latencies, 50)) if len(latencies) else None,
+            "latency_ms_p99": float(np.percentile(latencies, 99)) if len(latencies) else None,
+            "batch_size_mean": float(sizes.mean()) if len(sizes) else None,
+            "batch_size_max": int(sizes.max()) if len(sizes) else None,
+        }
+
+
+async def _read_request(reader: asyncio.StreamReader):
+    request_line = (await reader.readline()).decode().split()
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode().strip()
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError as e:
+        raise PayloadError("invalid Content-Length header") from e
+    body = await reader.readexactly(length)
+    method, path = (request_line + ["", ""])[:2]
+    return method, path, body
+
+
+def _response(status: str, payload: Dict) -> bytes:
+    body = json.dumps(payload).encode()
+    head = (
+        f"HTTP/1.1 {status}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Connection: close\r\n\r\n"
+    )
+    return head.encode() + body
+
+
+def make_handler(batcher: MicroBatcher):
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            method, path, body = await _read_request(reader)
+            if method == "POST" and path == "/predict":
+                records = parse_records(body)
+                response = _response("200 OK", {"predictions": await batcher.predict(records)})
+            elif method == "GET" and path == "/metrics":
+                response = _response("200 OK", batcher.metrics())
+            else:
+                response = _response("404 Not Found", {"error": f"unknown endpoint {method} {path}"})
+        except PayloadError as e:
+            response = _response("400 Bad Request", {"error": str(e)})
+        except Exception as e:
+            # Model and server failures are not the client's fault
+            response = _response("500 Internal Server Error", {"error": str(e)})
+        writer.write(response)
+        await writer.drain()
+        writer.close()
+
+    return handle
+
+
+async def serve(predict_fn, host: str = "127.0.0.1", port: int = 8000,
+                max_batch_size: int = 256, max_latency_ms: float = 5.0):
+    batcher = MicroBatcher(predict_fn, max_batch_size=max_batch_size, max_latency_ms=max_latency_ms)
+    worker = asyncio.create_task(batcher.run())
+    server = await asyncio.start_server(make_handler(batcher), host, port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        worker.cancel()
+
+
+async def request(host: str, port: int, method: str, path: str, payload=None) -> Dict:
+    """Minimal local client, e.g. await request("127.0.0.1", 8000, "POST", "/predict", record)."""
+    reader, writer = await asyncio.open_connection(host, port)
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return json.loads(response.split(b"\r\n\r\n", 1)[1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Micro-batching scoring service for the Bulldozers model.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--model-uri", default="runs:/f619af59195a40cc9c53100a39fcd71f/model")
+    parser.add_argument("--max-batch-size", type=int, default=256)
+    parser.add_argument("--max-latency-ms", type=float, default=5.0)
+    parser.add_argument("--env", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env"))
+    args = parser.parse_args()
+
+    import mlflow.pyfunc
+
+    load_dotenv(args.env)
+    mlflow.set_tracking_uri(os.getenv("MLFLOW_PATH"))
+    model = mlflow.pyfunc.load_model(args.model_uri)
+
+    asyncio.run(serve(model.predict, args.host, args.port, args.max_batch_size, args.max_latency_ms))
@@ -1,5 +1,6 @@
-from scipy import stats
-from sklearn.impute import SimpleImputer
+from joblib import delayed
+from pandas.tseries.holiday import USFederalHolidayCalendar
+from scipy import sparse
 from sklearn.preprocessing import (
     LabelEncoder,
     OneHotEncoder,
@@ -7,6 +8,7 @@ from sklearn.preprocessing import (
     MinMaxScaler,
 )
 import os
+import re
 import sys
 import pandas as pd
 import numpy as np
@@ -14,11 +16,88 @@ from typing import List, Dict, Optional
 from sklearn.base import BaseEstimator, TransformerMixin
 from sklearn.preprocessing import LabelEncoder, OneHotEncoder, StandardScaler
 
-
-class MeasurementCleaner(BaseEstimator, TransformerMixin):
-    def __init__(self):
+try:
+    from src.column_chunks import replace_columns, row_chunks
+    from src.column_jobs import parallel_columns
+    from src.sparse_frames import sparse_frame
+except ImportError:
+    # Imported with this directory rather than the repository root on sys.path
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'src')))
+    from column_chunks import replace_columns, row_chunks
+    from column_jobs import parallel_columns
+    from sparse_frames import sparse_frame
+
+
+# Precompiled patterns for MeasurementCleaner
+_MEASUREMENT_NOISE = re.compile(r'["\']| inch| Inch')
+_FIRST_NUMBER = re.compile(r'([\d.]+)')
+_FEET_AND_INCHES = re.compile(r'^\s*(\S+)(?:\s+(\S+))?')
+
+# Single-pass pattern for ProductClassTransformer, e.g.
+# "Wheel Loader - 110.0 to 120.0 Horsepower". The capacity parts are looked
+# ahead for from the start, so they are found with or without the " - "
+_PRODUCT_CLASS = re.compile(
+    r'^(?=(?:.*?(?P<capacity_min>\d+\.?\d*)\s*to\s*(?P<capacity_max>\d+\.?\d*))?)'
+    r'(?=(?:.*?(?P<capacity_unit>Horsepower|Operating Capacity))?)'
+    r'(?P<equipment_type>[^-]+)?'
+)
+_CAPACITY_UNITS = {'Horsepower': 'Horsepower', 'Operating Capacity': 'Lb Operating Capacity'}
+
+
+def _iter_chunks(X):
+    # A single DataFrame is treated as one chunk
+    return [X] if isinstance(X, pd.DataFrame) else X
+
+
+def _merge_moments(moments, values: np.ndarray):
+    """Merge a block into per-column (rows, non-null count, sum, squared deviations)."""
+    n_rows = len(values)
+    count = np.sum(~np.isnan(values), axis=0)
+    total = np.nansum(values, axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        m2 = np.nansum((values - total / count) ** 2, axis=0)
+        # Combine with the moments of earlier chunks (Chan et al.)
+        if moments is not None:
+            prev_rows, prev_count, prev_total, prev_m2 = moments
+            delta = total / count - prev_total / prev_count
+            correction = np.where(prev_count * count > 0,
+                                  delta ** 2 * prev_count * count / (prev_count + count), 0)
+            n_rows += prev_rows
+            count = count + prev_count
+            total = total + prev_total
+            m2 = m2 + prev_m2 + correction
+    return n_rows, count, total, m2
+
+
+class ChunkedFitMixin:
+    """Fit on one DataFrame or on an iterator of chunks, e.g. pd.read_csv(chunksize=...).
+
+    Subclasses merge each chunk into their statistics in partial_fit and clear
+    them in _reset; stateless transformers keep the no-op defaults.
+    """
+
+    def _reset(self):
         pass
 
+    def partial_fit(self, X, y=None):
+        return self
+
+    def fit(self, X, y=None):
+        self._reset()
+        for chunk in _iter_chunks(X):
+            self.partial_fit(chunk)
+        return self
+
+    def transform_chunks(self, chunks):
+        # Lazily transform chunk by chunk so memory stays bounded
+        for chunk in chunks:
+            yield self.transform(chunk)
+
+
+class MeasurementCleaner(ChunkedFitMixin, BaseEstimator, TransformerMixin):
+    def __init__(self, copy: bool = True):
+        self.copy = copy
+
     def _convert_numeric(self, value):
         if pd.isna(value) or value == 'None or Unspecified':
             return np.nan
@@ -26,10 +105,9 @@ class MeasurementCleaner(BaseEstimator, TransformerMixin):
             # Convert to string in case it's a float
             value = str(value)
             # Remove quotes, inch, and other text
-            value = value.replace('"', '').replace("'", '').replace(' inch', '').replace(' Inch', '')
+            value = _MEASUREMENT_NOISE.sub('', value)
             # Extract first number found
-            import re
-            numbers = re.findall(r'[\d.]+', value)
+            numbers = _FIRST_NUMBER.findall(value)
             return float(numbers[0]) if numbers else np.nan
         except (ValueError, IndexError):
             return np.nan
@@ -47,11 +125,37 @@ class MeasurementCleaner(BaseEstimator, TransformerMixin):
         except (ValueError, IndexError):
             return np.nan
 
-    def fit(self, X, y=None):
-        return self
+    @staticmethod
+    def _parse_numeric(values: pd.Series) -> pd.Series:
+        # Vectorized equivalent of _convert_numeric
+        cleaned = values.astype(str).str.replace(_MEASUREMENT_NOISE, '', regex=True)
+        numbers = cleaned.str.extract(_FIRST_NUMBER, expand=False)
+        parsed = pd.to_numeric(numbers, errors='coerce')
+        return parsed.where(values != 'None or Unspecified')
+
+    @staticmethod
+    def _parse_stick_length(values: pd.Series) -> pd.Series:
+        # Vectorized equivalent of _convert_stick_length
+        cleaned = values.astype(str).str.replace("'", '', regex=False).str.split('"', n=1).str[0]
+        parts = cleaned.str.extract(_FEET_AND_INCHES)
+        feet = pd.to_numeric(parts[0], errors='coerce')
+        inches = pd.to_numeric(parts[1], errors='coerce')
+        # A present but unparsable inches part invalidates the whole value
+        inches = inches.where(parts[1].notna(), 0)
+        parsed = feet * 12 + inches
+        return parsed.where(values != 'None or Unspecified')
+
+    @staticmethod
+    def _parse_distinct(column: pd.Series, parser) -> np.ndarray:
+        # Parse each distinct raw value once and broadcast back via codes
+        codes, uniques = pd.factorize(column)
+        memo = parser(pd.Series(uniques, dtype=object)).to_numpy(dtype=float)
+        # Code -1 marks missing values, which map to NaN
+        memo = np.append(memo, np.nan)
+        return memo[codes]
 
     def transform(self, X):
-        X_transformed = X.copy()
+        X_transformed = X.copy(deep=False) if self.copy else X
         
         # Convert measurements
         measurement_cols = [
@@ -60,162 +164,488 @@ class MeasurementCleaner(BaseEstimator, TransformerMixin):
         
         for col in measurement_cols:
             if col in X.columns:
-                X_transformed[col] = X[col].apply(self._convert_numeric)
+                X_transformed[col] = self._parse_distinct(X[col], self._parse_numeric)
         
         if 'Stick_Length' in X.columns:
-            X_transformed['Stick_Length'] = X['Stick_Length'].apply(self._convert_stick_length)
+            X_transformed['Stick_Length'] = self._parse_distinct(X['Stick_Length'], self._parse_stick_length)
             
         return X_transformed
 
 
-class DropColumnTransformer(BaseEstimator, TransformerMixin):
-    def __init__(self, columns):
+class DropColumnTransformer(ChunkedFitMixin, BaseEstimator, TransformerMixin):
+    def __init__(self, columns, copy: bool = True):
         self.columns = columns
-
-    def fit(self, X, y=None):
-        return self
+        self.copy = copy
 
     def transform(self, X):
         # Drop specified columns
-        X_transformed = X.drop(columns=self.columns, axis=1)
+        if not self.copy:
+            X.drop(columns=self.columns, inplace=True)
+            return X
+        X_transformed = X.drop(columns=self.columns)
         return X_transformed
 
 
-class CustomImputer(BaseEstimator, TransformerMixin):
-    def __init__(self, strategy="mean", columns: Optional[List[str]] = None, fill_value=None):
+def _merge_counts(counts: pd.Series, previous: Optional[pd.Series] = None) -> pd.Series:
+    """Value counts merged with those of earlier chunks, most frequent first.
+
+    Ties are ordered by value, so chunked and whole fits agree whatever the
+    order rows arrive in and whether the column is categorical.
+    """
+    # Categorical columns also report their unused categories
+    counts = counts[counts > 0]
+    counts = counts.set_axis(pd.Index(counts.index, dtype=object))
+    if previous is not None:
+        counts = previous.add(counts, fill_value=0)
+    return counts.sort_index().sort_values(ascending=False, kind='stable')
+
+
+def _most_frequent(counts: pd.Series):
+    # The smallest of the most frequent values, as SimpleImputer picks it
+    return counts.index[0] if len(counts) else np.nan
+
+
+class CustomImputer(ChunkedFitMixin, BaseEstimator, TransformerMixin):
+    """Fills missing values with per-column statistics, as SimpleImputer does.
+
+    Means and value counts merge across chunks; medians do not, so
+    strategy='median' is fitted on one DataFrame.
+    """
+    def __init__(self, strategy="mean", columns: Optional[List[str]] = None, fill_value=None,
+                 copy: bool = True):
         self.strategy = strategy
         self.columns = columns if columns is not None else []
         self.fill_value = fill_value
-        self.imputer = SimpleImputer(strategy=self.strategy, fill_value=fill_value)
-
-    def fit(self, X, y=None):
-        self.imputer.fit(X[self.columns])
+        self.copy = copy
+        self.moments = None
+        self.value_counts = None
+        self.statistics = None
+
+    def _reset(self):
+        self.moments = None
+        self.value_counts = None
+        self.statistics = None
+
+    def partial_fit(self, X, y=None):
+        if self.strategy == 'mean':
+            # Row chunks, so the whole block is never converted at once
+            for chunk in row_chunks(X, self.columns):
+                self.moments = _merge_moments(self.moments, chunk.to_numpy(dtype=np.float64))
+            _, count, total, _ = self.moments
+            with np.errstate(invalid='ignore', divide='ignore'):
+                statistics = total / count
+        elif self.strategy == 'median':
+            if self.statistics is not None:
+                raise ValueError("Medians cannot be merged across chunks; fit strategy='median' on one DataFrame.")
+            statistics = np.nanmedian(X[self.columns].to_numpy(dtype=np.float64), axis=0)
+        elif self.strategy == 'most_frequent':
+            previous = self.value_counts or {}
+            counts = {column: _merge_counts(X[column].value_counts(), previous.get(column))
+                      for column in self.columns}
+            self.value_counts = counts
+            statistics = [_most_frequent(counts[column]) for column in self.columns]
+        elif self.strategy == 'constant':
+            # SimpleImputer's default fill is 0 for numbers and 'missing_value' otherwise
+            statistics = [
+                self.fill_value if self.fill_value is not None
+                else 0 if pd.api.types.is_numeric_dtype(X[column]) else 'missing_value'
+                for column in self.columns
+            ]
+        else:
+            raise ValueError(f"Unknown strategy '{self.strategy}', expected 'mean', 'median', "
+                             "'most_frequent' or 'constant'.")
+        self.statistics = pd.Series(statistics, index=self.columns)
         return self
 
-    def transform(self, X):
-        X_transformed = X.copy()
-        X_transformed[self.columns] = self.imputer.transform(X[self.columns])
-        return X_transformed
+    def _fill(self, block):
+        # Categoricals take the fill value as a new category
+        for column in block.columns:
+            if isinstance(block[column].dtype, pd.CategoricalDtype):
+                block[column] = _fill_missing(block[column], self.statistics[column])
+        return block.fillna(self.statistics)
 
-
-class CustomLabelEncoder(BaseEstimator, TransformerMixin):
-    def __init__(self, columns: List[str], ordering: Optional[Dict[str, Dict[str, int]]] = None):
+    def transform(self, X):
+        return replace_columns(X, self.columns, self._fill, copy=self.copy)
+
+    def __setstate__(self, state):
+        # Imputers pickled before the merged statistics kept a fitted SimpleImputer
+        if 'imputer' in state:
+            state = dict(state)
+            imputer = state.pop('imputer')
+            state['statistics'] = pd.Series(list(imputer.statistics_), index=state['columns'])
+            state.setdefault('moments', None)
+            state.setdefault('value_counts', None)
+        super().__setstate__(state)
+
+
+def _vocabulary(values: pd.Series, missing=None) -> pd.Series:
+    # Sorted distinct values mapped to their codes, as LabelEncoder numbers them
+    uniques = pd.Index(pd.unique(values), dtype=object)
+    if missing is not None:
+        uniques = uniques.fillna(missing).unique()
+    uniques = uniques.sort_values()
+    return pd.Series(np.arange(len(uniques)), index=uniques)
+
+
+def _factorize(values: pd.Series):
+    # Row codes and distinct values; Categoricals already carry both
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), values.cat.categories
+    return pd.factorize(values)
+
+
+def _fill_missing(values: pd.Series, fill_value) -> pd.Series:
+    # Categoricals only take known categories, so add the fill value first
+    if isinstance(values.dtype, pd.CategoricalDtype) and fill_value not in values.cat.categories:
+        values = values.cat.add_categories([fill_value])
+    return values.fillna(fill_value)
+
+
+def _encode(values: pd.Series, vocabulary: pd.Series, missing=None) -> np.ndarray:
+    """Codes of values by hash lookup in vocabulary; only unseen values become -1."""
+    codes = np.append(vocabulary.to_numpy(), -1)
+    row_codes, uniques = _factorize(values)
+    # Look up the few distinct values once and broadcast through the row codes,
+    # with missing values (row code -1) read from the appended last position
+    positions = vocabulary.index.get_indexer(uniques)
+    missing_position = vocabulary.index.get_indexer([np.nan if missing is None else missing])
+    positions = np.append(positions, missing_position)[row_codes]
+    # Smallest integer type that also holds -1, e.g. int8 up to 128 values
+    dtype = np.min_scalar_type(-max(len(codes), int(codes.max()) + 1))
+    return codes[positions].astype(dtype)
+
+
+class CustomLabelEncoder(ChunkedFitMixin, BaseEstimator, TransformerMixin):
+    """Label-encodes each column; n_jobs encodes columns in worker processes.
+
+    Vocabularies of chunks are merged by union and renumbered in sorted order,
+    so a chunked fit gives the codes of a fit on all rows.
+    """
+    # Missing values are encoded as this category
+    missing_value = 'None or Unspecified'
+
+    def __init__(self, columns: List[str], ordering: Optional[Dict[str, Dict[str, int]]] = None,
+                 copy: bool = True, n_jobs: Optional[int] = None):
         self.columns = columns
         self.ordering = ordering or {}
-        self.encoders = {}
-
-    def fit(self, X, y=None):
+        self.copy = copy
+        self.n_jobs = n_jobs
+        self.vocabularies = {}
+
+    def _reset(self):
+        self.vocabularies = {}
+
+    def partial_fit(self, X, y=None):
+        # Sorted codes for unordered categories, learned one column per task
+        unordered = [column for column in self.columns if column not in self.ordering]
+        vocabularies = dict(zip(unordered, parallel_columns(
+            (delayed(_vocabulary)(X[column], self.missing_value) for column in unordered), self.n_jobs
+        )))
         for column in self.columns:
             if column in self.ordering:
-                # Create a custom LabelEncoder for ordered categories
-                unique_values = list(self.ordering[column].keys())
-                encoder = LabelEncoder()
-                encoder.fit(unique_values)
-                self.encoders[column] = encoder
+                # Use the predefined codes for ordered categories
+                self.vocabularies[column] = pd.Series(self.ordering[column], dtype=np.int64)
+            elif column in self.vocabularies:
+                # Union with the values of earlier chunks
+                merged = self.vocabularies[column].index.append(vocabularies[column].index)
+                self.vocabularies[column] = _vocabulary(merged)
             else:
-                # Use standard LabelEncoder for unordered categories
-                self.encoders[column] = LabelEncoder()
-                self.encoders[column].fit(X[column].fillna('None or Unspecified'))
+                self.vocabularies[column] = vocabularies[column]
         return self
 
     def transform(self, X):
-        X_transformed = X.copy()
-        for column in self.columns:
-            if column in self.ordering:
-                # Map values using predefined ordering
-                X_transformed[column] = X[column].map(self.ordering[column])
-                # Handle unknown values
-                X_transformed[column] = X_transformed[column].fillna(-1)
-            else:
-                try:
-                    X_transformed[column] = self.encoders[column].transform(
-                        X[column].fillna('None or Unspecified')
-                    )
-                except ValueError:
-                    # Handle unknown values
-                    X_transformed[column] = -1
+        X_transformed = X.copy(deep=False) if self.copy else X
+        # Values outside a predefined ordering (and their missing values) become -1
+        encoded = parallel_columns((
+            delayed(_encode)(X[column], self.vocabularies[column],
+                             None if column in self.ordering else self.missing_value)
+            for column in self.columns
+        ), self.n_jobs)
+        for column, codes in zip(self.columns, encoded):
+            X_transformed[column] = codes
         return X_transformed
 
-
-class CustomOneHotEncoder(BaseEstimator, TransformerMixin):
-    def __init__(self, columns: List[str], handle_unknown: str = 'ignore'):
+    def __setstate__(self, state):
+        # Encoders pickled before the vocabularies kept a fitted LabelEncoder per column
+        if 'encoders' in state:
+            state = dict(state)
+            ordering = state.get('ordering', {})
+            state['vocabularies'] = {
+                column: pd.Series(ordering[column], dtype=np.int64) if column in ordering
+                else _vocabulary(pd.Series(encoder.classes_))
+                for column, encoder in state.pop('encoders').items()
+            }
+            state.setdefault('copy', True)
+        state.setdefault('n_jobs', None)
+        super().__setstate__(state)
+
+
+class CustomOneHotEncoder(ChunkedFitMixin, BaseEstimator, TransformerMixin):
+    """One-hot encodes each column; n_jobs encodes columns in worker processes.
+
+    Category counts merge across chunks, and the encoders are refitted on the
+    categories seen so far.
+    """
+    def __init__(self, columns: List[str], handle_unknown: str = 'ignore',
+                 sparse_output: bool = False, n_jobs: Optional[int] = None):
         self.columns = columns
         self.handle_unknown = handle_unknown
+        self.sparse_output = sparse_output
+        self.n_jobs = n_jobs
         self.encoders = {}
+        self.category_counts = {}
 
-    def fit(self, X, y=None):
-        for column in self.columns:
-            self.encoders[column] = OneHotEncoder(
-                sparse_output=False,
-                handle_unknown=self.handle_unknown
-            )
-            # Fill NA with 'None or Unspecified' before fitting
-            X_filled = X[column].fillna('None or Unspecified')
-            self.encoders[column].fit(X_filled.values.reshape(-1, 1))
+    def _reset(self):
+        self.category_counts = {}
+
+    def _count_task(self, X, column):
+        return delayed(pd.Series.value_counts)(_fill_missing(X[column], 'None or Unspecified'))
+
+    def _fit_encoders(self):
+        # OneHotEncoder sorts the categories, as when fitted on the whole column
+        self.encoders = {
+            column: OneHotEncoder(sparse_output=self.sparse_output, handle_unknown=self.handle_unknown).fit(
+                self.category_counts[column].index.to_numpy(dtype=object).reshape(-1, 1))
+            for column in self.columns
+        }
+
+    def partial_fit(self, X, y=None):
+        # Accumulate category counts, one column per task, then refit the encoders
+        counts = parallel_columns((self._count_task(X, column) for column in self.columns), self.n_jobs)
+        self.category_counts = {
+            column: _merge_counts(column_counts, self.category_counts.get(column))
+            for column, column_counts in zip(self.columns, counts)
+        }
+        self._fit_encoders()
         return self
 
-    def transform(self, X):
-        X_transformed = X.copy()
-        for column in self.columns:
-            # Fill NA with 'None or Unspecified' before transforming
-            X_filled = X[column].fillna('None or Unspecified')
+    def _column_values(self, X, column):
+        # Fill NA with 'None or Unspecified' before encoding
+        X_filled = _fill_missing(X[column], 'None or Unspecified')
+        return X_filled.to_numpy(dtype=object).reshape(-1, 1)
+
+    def _transform_task(self, X, column):
+        return delayed(self.encoders[column].transform)(self._column_values(X, column))
+
+    def _encode_columns(self, X, columns):
+        # Encode all columns into one block and attach it with a single concat
+        blocks = list(parallel_columns((self._transform_task(X, column) for column in columns), self.n_jobs))
+        names = [name for column in columns for name in self._feature_names(column)]
+        if self.sparse_output and blocks:
+            encoded = sparse_frame(sparse.hstack(blocks, format='csc'), names, X.index)
+        else:
             encoded = pd.DataFrame(
-                self.encoders[column].transform(X_filled.values.reshape(-1, 1)),
-                columns=self.encoders[column].get_feature_names_out([column]),
+                np.hstack(blocks) if blocks else np.empty((len(X), 0)),
+                columns=names,
                 index=X.index
             )
-            X_transformed = pd.concat(
-                [X_transformed.drop(columns=column), encoded],
-                axis=1
-            )
-        return X_transformed
+        # drop() and concat() never modify X, so no defensive copy is needed
+        return pd.concat([X.drop(columns=columns), encoded], axis=1)
+
+    def _feature_names(self, column):
+        return self.encoders[column].get_feature_names_out([column])
+
+    def transform(self, X):
+        return self._encode_columns(X, self.columns)
 
 
-class CustomStandardScaler(BaseEstimator, TransformerMixin):
-    def __init__(self, columns: List[str]) -> None:
+class CustomStandardScaler(ChunkedFitMixin, BaseEstimator, TransformerMixin):
+    def __init__(self, columns: List[str], copy: bool = True) -> None:
         self.columns = columns
-        self.scaler = StandardScaler()
+        self.copy = copy
+        self.scaler = StandardScaler(copy=False)
+        self.moments = None
+
+    def _reset(self):
+        self.moments = None
+
+    def partial_fit(self, X, y=None):
+        # Row chunks, so the whole block is never converted at once
+        for chunk in row_chunks(X, self.columns):
+            self.moments = _merge_moments(self.moments, chunk.to_numpy(dtype=float))
+        n_rows, count, total, m2 = self.moments
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = total / count
+
+        # Missing values are mean-filled, so they count as rows with zero deviation
+        var = m2 / n_rows
+        self.scaler.mean_ = mean
+        self.scaler.var_ = var
+        self.scaler.scale_ = np.where(var > 0, np.sqrt(var), 1.0)
+        self.scaler.n_samples_seen_ = n_rows
+        self.scaler.n_features_in_ = len(self.columns)
+        self.scaler.feature_names_in_ = np.asarray(self.columns, dtype=object)
+        return self
 
-    def fit(self, X, y=None):
-        # Fill NaN with mean before fitting
-        X_filled = X[self.columns].fillna(X[self.columns].mean())
-        self.scaler.fit(X_filled)
+    def transform(self, X):
+        # Fill NaN with the fitted mean, so every batch is filled the same way
+        mean = pd.Series(self.scaler.mean_, index=self.columns)
+        return replace_columns(X, self.columns, lambda block: self.scaler.transform(block.fillna(mean)),
+                               copy=self.copy)
+
+
+class CustomImputeScaler(ChunkedFitMixin, BaseEstimator, TransformerMixin):
+    """Imputes and scales numerical columns as one float32 block.
+
+    The columns are extracted once, filled and scaled in place with the
+    statistics learned in fit, and written back once. strategy is 'mean',
+    'median' or 'constant'; scaling is 'standard', 'minmax' or None. The mean
+    and constant strategies merge their statistics across chunks.
+    """
+    def __init__(self, columns: List[str], strategy: str = 'mean', scaling: Optional[str] = 'standard',
+                 fill_value: float = 0, copy: bool = True):
+        self.columns = columns
+        self.strategy = strategy
+        self.scaling = scaling
+        self.fill_value = fill_value
+        self.copy = copy
+        self.moments = None
+        self.minimum = None
+        self.maximum = None
+        self.statistics = None
+        self.offset = None
+        self.scale = None
+
+    def _reset(self):
+        self.moments = None
+        self.minimum = None
+        self.maximum = None
+        self.statistics = None
+
+    def partial_fit(self, X, y=None):
+        values = X[self.columns].to_numpy(dtype=np.float64)
+
+        if self.strategy == 'median':
+            if self.statistics is not None:
+                raise ValueError("Medians cannot be merged across chunks; fit strategy='median' on one DataFrame.")
+            fill = np.nanmedian(values, axis=0)
+            imputed = np.where(np.isnan(values), fill, values)
+            n_rows, _, total, m2 = _merge_moments(None, imputed)
+            mean = total / n_rows
+            minimum, maximum = imputed.min(axis=0), imputed.max(axis=0)
+        elif self.strategy in ('mean', 'constant'):
+            # Moments and extremes of the observed values merge across chunks
+            self.moments = _merge_moments(self.moments, values)
+            chunk_min, chunk_max = np.fmin.reduce(values, axis=0), np.fmax.reduce(values, axis=0)
+            self.minimum = chunk_min if self.minimum is None else np.fmin(self.minimum, chunk_min)
+            self.maximum = chunk_max if self.maximum is None else np.fmax(self.maximum, chunk_max)
+
+            n_rows, count, total, m2 = self.moments
+            n_missing = n_rows - count
+            with np.errstate(invalid='ignore', divide='ignore'):
+                observed_mean = total / count
+                if self.strategy == 'mean':
+                    fill = observed_mean
+                else:
+                    fill = np.full(len(self.columns), self.fill_value, dtype=np.float64)
+                # Shift the moments to include the filled values
+                mean = (total + np.nan_to_num(fill) * n_missing) / n_rows
+                m2 = m2 + n_missing * (fill - mean) ** 2 + np.where(
+                    count > 0, count * (observed_mean - mean) ** 2, 0)
+            filled = np.where(n_missing > 0, fill, np.nan)
+            minimum, maximum = np.fmin(self.minimum, filled), np.fmax(self.maximum, filled)
+        else:
+            raise ValueError(f"Unknown strategy '{self.strategy}', expected 'mean', 'median' or 'constant'.")
+
+        # Scaling statistics are those of the imputed values
+        if self.scaling == 'standard':
+            offset, scale = mean, np.sqrt(m2 / n_rows)
+        elif self.scaling == 'minmax':
+            offset, scale = minimum, maximum - minimum
+        elif self.scaling is None:
+            offset, scale = np.zeros(len(self.columns)), np.ones(len(self.columns))
+        else:
+            raise ValueError(f"Unknown scaling '{self.scaling}', expected 'standard', 'minmax' or None.")
+
+        self.statistics = fill.astype(np.float32)
+        self.offset = offset.astype(np.float32)
+        # Constant columns are left unscaled, as in StandardScaler and MinMaxScaler
+        self.scale = np.where(scale > 0, scale, 1.0).astype(np.float32)
         return self
 
     def transform(self, X):
-        X_transformed = X.copy()
-        # Fill NaN with mean before transforming
-        X_filled = X[self.columns].fillna(X[self.columns].mean())
-        X_transformed[self.columns] = self.scaler.transform(X_filled)
+        values = X[self.columns].to_numpy(dtype=np.float32, copy=True)
+        np.copyto(values, self.statistics, where=np.isnan(values))
+        values -= self.offset
+        values /= self.scale
+
+        X_transformed = X.copy(deep=False) if self.copy else X
+        X_transformed[self.columns] = values
         return X_transformed
 
 
 # Custom transformer class to detect and remove outliers
-class CustomOutlierRemover(BaseEstimator, TransformerMixin):
-    def __init__(self, columns: List[str], threshold: float = 3):
+class CustomOutlierRemover(ChunkedFitMixin, BaseEstimator, TransformerMixin):
+    """Drops rows lying more than threshold scales away from the fitted center.
+
+    method='zscore' uses the mean and standard deviation, method='robust' the
+    median and MAD. Both are learned in fit, so every chunk passed to transform
+    is judged by the same statistics. Missing values are never outliers, and
+    columns without spread flag no rows.
+    """
+    def __init__(self, columns: List[str], threshold: float = 3, method: str = 'zscore'):
         self.columns = columns
         self.threshold = threshold
+        self.method = method
+        self.numeric_cols = None
+        self.moments = None
+        self.center = None
+        self.scale = None
         self._outliers = None
 
-    def fit(self, X, y=None):
+    def _reset(self):
+        self.numeric_cols = None
+        self.moments = None
+        self.center = None
+        self.scale = None
+
+    def partial_fit(self, X, y=None):
+        if self.numeric_cols is None:
+            # Only the listed columns present in the data are checked
+            self.numeric_cols = [col for col in self.columns if col in X.columns]
+        values = X[self.numeric_cols].to_numpy(dtype=np.float64)
+
+        if self.method == 'zscore':
+            self.moments = _merge_moments(self.moments, values)
+            n_rows, count, total, m2 = self.moments
+            with np.errstate(invalid='ignore', divide='ignore'):
+                center = total / count
+                scale = np.sqrt(m2 / (count - 1))
+        elif self.method == 'robust':
+            if self.center is not None:
+                raise ValueError("Medians cannot be merged across chunks; fit method='robust' on one DataFrame.")
+            center = np.nanmedian(values, axis=0)
+            # Rescaled so the MAD estimates the standard deviation of normal data
+            scale = 1.4826 * np.nanmedian(np.abs(values - center), axis=0)
+        else:
+            raise ValueError(f"Unknown method '{self.method}', expected 'zscore' or 'robust'.")
+
+        self.center = center.astype(np.float32)
+        # A zero or NaN scale (e.g. a mostly constant column) becomes inf, so the
+        # column flags no rows instead of every value off its center
+        self.scale = np.where(scale > 0, scale, np.inf).astype(np.float32)
         return self
 
+    def outlier_mask(self, X) -> np.ndarray:
+        # Scale one float32 block in place; NaN compares False, so it is never an outlier
+        values = X[self.numeric_cols].to_numpy(dtype=np.float32, copy=True)
+        values -= self.center
+        np.abs(values, out=values)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values /= self.scale
+        return (values > self.threshold).any(axis=1)
+
     def transform(self, X):
-        X_transformed = X.copy()
-        
-        # Calculate z-scores for specified columns
-        z_scores = pd.DataFrame(index=X.index)
-        for col in self.columns:
-            if col in X.columns:
-                # Fill NaN with mean for z-score calculation
-                col_filled = X[col].fillna(X[col].mean())
-                z_scores[col] = (col_filled - col_filled.mean()) / col_filled.std()
+        self._outliers = pd.Series(self.outlier_mask(X), index=X.index)
+        # Boolean indexing returns a new frame, so X is never modified
+        return X[~self._outliers.to_numpy()]
 
-        # Identify outliers
-        self._outliers = (abs(z_scores) > self.threshold).any(axis=1)
-        
-        # Remove outliers
-        return X_transformed[~self._outliers]
+    def fit_resample(self, X, y=None):
+        # Fit, then drop the same rows from X and y with one boolean mask
+        self.fit(X)
+        self._outliers = pd.Series(self.outlier_mask(X), index=X.index)
+        keep = ~self._outliers.to_numpy()
+        return X[keep], (y[keep] if y is not None else None)
 
     @property
     def outliers(self):
@@ -223,140 +653,186 @@ class CustomOutlierRemover(BaseEstimator, TransformerMixin):
 
 
 # Custom transformer for Normalization
-class CustomMinMaxScaler(BaseEstimator, TransformerMixin):
+class CustomMinMaxScaler(ChunkedFitMixin, BaseEstimator, TransformerMixin):
 
-    def __init__(self, columns: List[str]) -> None:
+    def __init__(self, columns: List[str], copy: bool = True) -> None:
         self.columns = columns
-        self.scaler = MinMaxScaler()
+        self.copy = copy
+        # transform gets copied chunks, which the scaler may overwrite
+        self.scaler = MinMaxScaler(copy=False)
 
-    def fit(self, X, y=None):
-        self.scaler.fit(X[self.columns])
+    def _reset(self):
+        self.scaler = MinMaxScaler(copy=False)
+
+    def partial_fit(self, X, y=None):
+        # MinMaxScaler merges running minima and maxima itself
+        for chunk in row_chunks(X, self.columns):
+            self.scaler.partial_fit(chunk)
         return self
 
     def transform(self, X):
-        X_transformed = X.copy()
-        X_transformed[self.columns] = self.scaler.transform(X[self.columns])
-        return X_transformed
+        return replace_columns(X, self.columns, self.scaler.transform, copy=self.copy)
 
 
 class ExtendedLabelEncoder(CustomLabelEncoder):
     """Extended Label Encoder that supports predefined ordering for categories"""
-    def __init__(self, columns: List[str], ordering: Optional[Dict[str, Dict[str, int]]] = None):
-        super().__init__(columns)
-        self.ordering = ordering or {}
-        
-    def fit(self, X, y=None):
-        for column in self.columns:
-            if column in self.ordering:
-                # Create a custom LabelEncoder for ordered categories
-                unique_values = list(self.ordering[column].keys())
-                encoder = LabelEncoder()
-                encoder.fit(unique_values)
-                self.encoders[column] = encoder
-            else:
-                # Use standard LabelEncoder for unordered categories
-                self.encoders[column] = LabelEncoder()
-                self.encoders[column].fit(X[column])
-        return self
+    # Missing values are encoded as-is
+    missing_value = None
 
-    def transform(self, X):
-        X_transformed = X.copy()
-        for column in self.columns:
-            if column in self.ordering:
-                # Map values using predefined ordering
-                X_transformed[column] = X[column].map(self.ordering[column])
-                # Handle unknown values
-                X_transformed[column] = X_transformed[column].fillna(-1)
-            else:
-                try:
-                    X_transformed[column] = self.encoders[column].transform(X[column])
-                except ValueError:
-                    # Handle unknown values for non-ordered categories
-                    X_transformed[column] = -1
-        return X_transformed
+    def __init__(self, columns: List[str], ordering: Optional[Dict[str, Dict[str, int]]] = None,
+                 copy: bool = True, n_jobs: Optional[int] = None):
+        super().__init__(columns, copy=copy, n_jobs=n_jobs)
+        self.ordering = ordering or {}
 
 class ExtendedOneHotEncoder(CustomOneHotEncoder):
-    """Extended One Hot Encoder that handles unknown values and frequency-based filtering"""
+    """Extended One Hot Encoder that handles unknown values and frequency-based filtering
+
+    Values outside the selected categories (rare, unseen or missing) encode as
+    all zeros, or as a '<column>_other' indicator with other_bucket=True.
+    Category counts merge across chunks, so fitting takes one pass.
+    """
     def __init__(self, columns: List[str], handle_unknown: str = 'ignore', 
-                 max_categories: int = None, min_frequency: float = None):
-        super().__init__(columns)
+                 max_categories: int = None, min_frequency: float = None,
+                 other_bucket: bool = False, sparse_output: bool = False, n_jobs: Optional[int] = None):
+        super().__init__(columns, sparse_output=sparse_output, n_jobs=n_jobs)
         self.handle_unknown = handle_unknown
         self.max_categories = max_categories
         self.min_frequency = min_frequency
+        self.other_bucket = other_bucket
         self.category_maps = {}
+
+    def _count_task(self, X, column):
+        # Missing values are not a category
+        return delayed(pd.Series.value_counts)(X[column])
+
+    def _select_categories(self, column):
+        # Calculate value frequencies
+        counts = self.category_counts[column]
+        value_counts = counts / counts.sum()
         
-    def fit(self, X, y=None):
-        for column in self.columns:
-            # Calculate value frequencies
-            value_counts = X[column].value_counts(normalize=True)
-            
-            # Filter categories based on frequency threshold
-            if self.min_frequency is not None:
-                value_counts = value_counts[value_counts >= self.min_frequency]
-                
-            # Take top N categories if max_categories is specified
-            if self.max_categories is not None:
-                value_counts = value_counts.nlargest(self.max_categories)
-                
-            # Store selected categories
-            self.category_maps[column] = value_counts.index.tolist()
+        # Filter categories based on frequency threshold
+        if self.min_frequency is not None:
+            value_counts = value_counts[value_counts >= self.min_frequency]
             
-            # Create and fit encoder
-            self.encoders[column] = OneHotEncoder(
-                sparse_output=False,
-                handle_unknown=self.handle_unknown,
-                categories=[self.category_maps[column]]
-            )
-            # Transform column to only include selected categories
-            column_data = X[column].apply(lambda x: x if x in self.category_maps[column] else None)
-            self.encoders[column].fit(column_data.to_frame())
+        # Take top N categories if max_categories is specified
+        if self.max_categories is not None:
+            value_counts = value_counts.nlargest(self.max_categories)
             
-        return self
+        return value_counts.index.tolist()
+        
+    def _fit_encoders(self):
+        # Reselect the categories from the merged counts
+        self.category_maps = {column: self._select_categories(column) for column in self.columns}
+
+    def _feature_names(self, column):
+        names = [f'{column}_{category}' for category in self.category_maps[column]]
+        return names + [f'{column}_other'] if self.other_bucket else names
+
+    def _transform_task(self, X, column):
+        return delayed(self._transform_column)(X[column], column)
+
+    def _transform_column(self, values, column):
+        categories = self.category_maps[column]
+        vocabulary = pd.Series(np.arange(len(categories)), index=pd.Index(categories, dtype=object))
+        codes = _encode(values, vocabulary).astype(np.intp)
+
+        # Code -1 marks values outside the selected categories
+        if self.other_bucket:
+            codes[codes == -1] = len(categories)
+        elif self.handle_unknown == 'error' and (codes == -1).any():
+            raise ValueError(f"Column '{column}' has values outside the selected categories.")
+
+        rows = np.flatnonzero(codes >= 0)
+        block = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, codes[rows])),
+            shape=(len(codes), len(categories) + self.other_bucket)
+        )
+        return block if self.sparse_output else block.toarray()
     
     def transform(self, X):
-        X_transformed = X.copy()
-        for column in self.columns:
-            if column in X.columns:
-                # Map values not in selected categories to None
-                column_data = X[column].apply(
-                    lambda x: x if x in self.category_maps[column] else None
-                )
-                encoded = pd.DataFrame(
-                    self.encoders[column].transform(column_data.to_frame()),
-                    columns=self.encoders[column].get_feature_names_out([column]),
-                    index=X.index
-                )
-                X_transformed = pd.concat(
-                    [X_transformed.drop(columns=column), encoded],
-                    axis=1
-                )
-        return X_transformed
+        return self._encode_columns(X, [column for column in self.columns if column in X.columns])
+
+
+class ModelDescriptionTransformer(ChunkedFitMixin, BaseEstimator, TransformerMixin):
+    """Transformer for handling model description related columns
 
+    model_full is a Categorical built by combining the integer codes of the
+    model components, so only distinct combinations are turned into strings.
+    """
+    components = ['fiBaseModel', 'fiSecondaryDesc', 'fiModelSeries', 'fiModelDescriptor']
 
-class ModelDescriptionTransformer(BaseEstimator, TransformerMixin):
-    """Transformer for handling model description related columns"""
-    def __init__(self, drop_original: bool = True):
+    def __init__(self, drop_original: bool = True, copy: bool = True):
         self.drop_original = drop_original
+        self.copy = copy
         self.model_components = None
-        
-    def fit(self, X, y=None):
-        # Store unique values for each component during fit
-        self.model_components = {
-            'base_model': X['fiBaseModel'].unique(),
-            'secondary_desc': X['fiSecondaryDesc'].dropna().unique(),
-            'model_series': X['fiModelSeries'].dropna().unique(),
-            'model_descriptor': X['fiModelDescriptor'].dropna().unique()
-        }
+        self.model_full_categories = None
+
+    def _reset(self):
+        self.model_components = None
+        self.model_full_categories = None
+
+    def _component_codes(self, X):
+        # Codes in the fitted vocab of each component; unseen values extend a local copy
+        codes, vocabs = [], []
+        for column in self.components:
+            # Only the distinct values are looked up, also for categorical columns;
+            # missing values (row code -1) read the appended empty string
+            row_codes, uniques = _factorize(X[column])
+            uniques = pd.Index(uniques, dtype=object).append(pd.Index([''], dtype=object))
+            vocab = pd.Index([], dtype=object)
+            if self.model_components is not None:
+                vocab = self.model_components[column]
+            unique_codes = vocab.get_indexer(uniques)
+            unseen = unique_codes == -1
+            if unseen.any():
+                unseen_values = uniques[unseen].unique()
+                unique_codes[unseen] = len(vocab) + unseen_values.get_indexer(uniques[unseen])
+                vocab = vocab.append(unseen_values)
+            codes.append(unique_codes[row_codes])
+            vocabs.append(vocab)
+        return codes, vocabs
+
+    def _model_full(self, X):
+        codes, vocabs = self._component_codes(X)
+
+        # Mixed-radix key per row, one digit per component
+        key = codes[0].astype(np.int64)
+        for column_codes, vocab in zip(codes[1:], vocabs[1:]):
+            key = key * len(vocab) + column_codes
+        inverse, keys = pd.factorize(key)
+
+        # Spell out only the distinct combinations
+        parts = []
+        for vocab in reversed(vocabs):
+            keys, digit = np.divmod(keys, len(vocab))
+            parts.append(vocab.to_numpy()[digit])
+        names = pd.Index(['_'.join(combination) for combination in zip(*reversed(parts))], dtype=object)
+        # Distinct combinations can join to one name, e.g. ('a_b', 'c') and ('a', 'b_c')
+        name_codes, names = pd.factorize(names)
+        return vocabs, names, name_codes[inverse]
+
+    def partial_fit(self, X, y=None):
+        vocabs, names, _ = self._model_full(X)
+        self.model_components = dict(zip(self.components, vocabs))
+        # Keep the codes of earlier combinations stable
+        if self.model_full_categories is None:
+            self.model_full_categories = names.sort_values()
+        else:
+            unseen = names.difference(self.model_full_categories)
+            # append infers a str dtype, so keep the categories object like a whole fit
+            self.model_full_categories = self.model_full_categories.append(unseen).astype(object)
         return self
         
     def transform(self, X):
-        X_transformed = X.copy()
-        
-        # Create combined features
-        X_transformed['model_full'] = X_transformed['fiBaseModel'].fillna('') + '_' + \
-                                    X_transformed['fiSecondaryDesc'].fillna('') + '_' + \
-                                    X_transformed['fiModelSeries'].fillna('') + '_' + \
-                                    X_transformed['fiModelDescriptor'].fillna('')
+        X_transformed = X.copy(deep=False) if self.copy else X
+
+        # Combinations unseen in fit are appended after the fitted categories
+        _, names, inverse = self._model_full(X)
+        categories = self.model_full_categories
+        unseen = names.difference(categories)
+        if len(unseen):
+            categories = categories.append(unseen).astype(object)
+        X_transformed['model_full'] = pd.Categorical.from_codes(categories.get_indexer(names)[inverse], categories)
         
         # Drop original columns if specified
         if self.drop_original:
@@ -366,60 +842,141 @@ class ModelDescriptionTransformer(BaseEstimator, TransformerMixin):
             
         return X_transformed 
 
-class ProductClassTransformer(BaseEstimator, TransformerMixin):
-    """Transformer to extract meaningful components from fiProductClassDesc."""
+class ProductClassTransformer(ChunkedFitMixin, BaseEstimator, TransformerMixin):
+    """Transformer to extract meaningful components from fiProductClassDesc.
+
+    Each distinct description is parsed once into parse_table; rows are mapped
+    back through their factorized codes. The equipment_type categories are
+    fixed in fit, and types unseen there become NaN.
+    """
+    capacity_units = ['Horsepower', 'Lb Operating Capacity', 'Other']
     
-    def __init__(self):
-        pass
-        
-    def fit(self, X, y=None):
+    def __init__(self, copy: bool = True):
+        self.copy = copy
+        self.parse_table = None
+        self.equipment_types = None
+
+    def _reset(self):
+        self.parse_table = None
+        self.equipment_types = None
+
+    @staticmethod
+    def _parse(values) -> pd.DataFrame:
+        values = pd.Series(values, dtype=object)
+        parts = values.str.extract(_PRODUCT_CLASS)
+        return pd.DataFrame({
+            # Equipment type is the part before the hyphen
+            'equipment_type': parts['equipment_type'].str.strip(),
+            # Capacity/power range, for both Horsepower and Operating Capacity
+            'capacity_min': parts['capacity_min'].astype(float),
+            'capacity_max': parts['capacity_max'].astype(float),
+            'capacity_unit': parts['capacity_unit'].map(_CAPACITY_UNITS).fillna('Other'),
+        }).set_axis(pd.Index(values), axis=0)
+
+    def _lookup(self, values) -> pd.DataFrame:
+        # Parse only the descriptions missing from the cached table
+        table = self.parse_table if self.parse_table is not None else self._parse([])
+        unseen = pd.Index(values).difference(table.index)
+        if len(unseen):
+            table = pd.concat([table, self._parse(unseen)])
+        return table
+
+    @staticmethod
+    def _equipment_types(table) -> pd.Index:
+        return pd.Index(table['equipment_type'].dropna().unique()).sort_values()
+
+    def partial_fit(self, X, y=None):
+        self.parse_table = self._lookup(X['fiProductClassDesc'].dropna().unique())
+        self.equipment_types = self._equipment_types(self.parse_table)
         return self
         
     def transform(self, X):
-        X_transformed = X.copy()
-        
-        # Extract equipment type (part before the hyphen)
-        X_transformed['equipment_type'] = X_transformed['fiProductClassDesc'].str.extract(r'^([^-]+)')
-        
-        # Extract capacity/power range
-        # Handle both Horsepower and Operating Capacity cases
-        X_transformed['capacity_min'] = X_transformed['fiProductClassDesc'].str.extract(r'(\d+\.?\d*)\s*to').astype(float)
-        X_transformed['capacity_max'] = X_transformed['fiProductClassDesc'].str.extract(r'to\s*(\d+\.?\d*)').astype(float)
-        
-        # Create capacity/power unit feature
-        X_transformed['capacity_unit'] = X_transformed['fiProductClassDesc'].apply(lambda x: 
-            'Horsepower' if 'Horsepower' in str(x) 
-            else 'Lb Operating Capacity' if 'Operating Capacity' in str(x)
-            else 'Other'
-        )
-        
-        # Clean up equipment type
-        X_transformed['equipment_type'] = X_transformed['equipment_type'].str.strip()
+        X_transformed = X.copy(deep=False) if self.copy else X
+
+        codes, uniques = pd.factorize(X['fiProductClassDesc'])
+        table = self._lookup(uniques)
+        rows = table.reindex(uniques)
+        # Missing descriptions (code -1) read the last row, an unparsed empty one
+        rows = pd.concat([rows, self._parse([np.nan])])
+
+        # Every batch gets the fitted categories; unseen types (code -1) become NaN
+        equipment_codes = self.equipment_types.get_indexer(rows['equipment_type'])
+        X_transformed['equipment_type'] = pd.Categorical.from_codes(equipment_codes[codes], self.equipment_types)
+        X_transformed['capacity_min'] = rows['capacity_min'].to_numpy()[codes]
+        X_transformed['capacity_max'] = rows['capacity_max'].to_numpy()[codes]
+        unit_codes = pd.Index(self.capacity_units).get_indexer(rows['capacity_unit'])
+        X_transformed['capacity_unit'] = pd.Categorical.from_codes(unit_codes[codes], self.capacity_units)
         
         # Drop original column since we've extracted its components
         X_transformed = X_transformed.drop('fiProductClassDesc', axis=1)
         
         return X_transformed
+
+    def __setstate__(self, state):
+        # Transformers pickled before the fixed categories took them from each batch
+        if 'equipment_types' not in state and state.get('parse_table') is not None:
+            state = dict(state, equipment_types=self._equipment_types(state['parse_table']))
+        super().__setstate__(state)
     
 
-class DateProcessor(BaseEstimator, TransformerMixin):
-    def __init__(self):
+class DateProcessor(ChunkedFitMixin, BaseEstimator, TransformerMixin):
+    """Calendar features of saledate, machine age and the YearMade fix.
+
+    Sale dates repeat heavily (a few thousand distinct days), so features are
+    computed once per distinct date and broadcast back through factorized
+    codes as int16/int8 columns. extra_features adds day of year, days since
+    the epoch and a US federal holiday flag at no extra pass over the rows.
+    """
+    def __init__(self, extra_features: bool = False, copy: bool = True):
+        self.extra_features = extra_features
+        self.copy = copy
         self.year_mode = None
-        
-    def fit(self, X, y=None):
-        # Calculate mode of YearMade for values after 1900
-        self.year_mode = X[X['YearMade'] > 1900]['YearMade'].mode().iloc[0]
+        self.year_counts = None
+
+    def _reset(self):
+        self.year_counts = None
+
+    def partial_fit(self, X, y=None):
+        # Count YearMade values after 1900; the counts merge across chunks
+        counts = X.loc[X['YearMade'] > 1900, 'YearMade'].value_counts()
+        if self.year_counts is not None:
+            counts = self.year_counts.add(counts, fill_value=0)
+        self.year_counts = counts
+        # Mode of YearMade, the smallest year on ties
+        self.year_mode = counts[counts == counts.max()].index.min()
         return self
+
+    def _date_features(self, dates: pd.DatetimeIndex) -> Dict[str, np.ndarray]:
+        features = {
+            'sale_year': dates.year.to_numpy(dtype=np.int16),
+            'sale_month': dates.month.to_numpy(dtype=np.int8),
+            'sale_quarter': dates.quarter.to_numpy(dtype=np.int8),
+            'sale_day_of_week': dates.dayofweek.to_numpy(dtype=np.int8),
+        }
+        features['sale_is_weekend'] = (features['sale_day_of_week'] >= 5).astype(np.int8)
+        if self.extra_features:
+            features['sale_day_of_year'] = dates.dayofyear.to_numpy(dtype=np.int16)
+            features['sale_days_since_epoch'] = (
+                dates.to_numpy().astype('datetime64[D]').astype(np.int64).astype(np.int32)
+            )
+            holidays = USFederalHolidayCalendar().holidays(dates.min(), dates.max()) if len(dates) else []
+            features['sale_is_holiday'] = dates.normalize().isin(holidays).astype(np.int8)
+        return features
         
     def transform(self, X):
-        X_transformed = X.copy()
+        X_transformed = X.copy(deep=False) if self.copy else X
         
-        # Extract date components
-        X_transformed['sale_year'] = X_transformed['saledate'].dt.year
-        X_transformed['sale_month'] = X_transformed['saledate'].dt.month
-        X_transformed['sale_quarter'] = X_transformed['saledate'].dt.quarter
-        X_transformed['sale_day_of_week'] = X_transformed['saledate'].dt.dayofweek
-        X_transformed['sale_is_weekend'] = X_transformed['saledate'].dt.dayofweek.isin([5, 6]).astype(int)
+        # Extract date components once per distinct sale date
+        codes, dates = pd.factorize(X_transformed['saledate'])
+        missing = codes == -1
+        for name, values in self._date_features(pd.DatetimeIndex(dates)).items():
+            if missing.any():
+                # Missing dates give NaN as the .dt accessors do, and 0 for flags
+                if name.startswith('sale_is_'):
+                    values = np.append(values, 0).astype(np.int8)
+                else:
+                    values = np.append(values, np.nan).astype(np.float32)
+            X_transformed[name] = values[codes]
         
         # Calculate machine age
         X_transformed['machine_age'] = X_transformed['sale_year'] - X_transformed['YearMade']
@@ -431,4 +988,3 @@ class DateProcessor(BaseEstimator, TransformerMixin):
         X_transformed = X_transformed.drop('saledate', axis=1)
         
         return X_transformed
-    
\ No newline at end of file
@@ -0,0 +1,131 @@
+import hashlib
+import os
+import sys
+from typing import Dict, List, Optional
+
+import pandas as pd
+import pyarrow.feather as feather
+
+# Bump when SCHEMA or the downcasting rules change, so old caches are ignored
+SCHEMA_VERSION = 1
+
+# Explicit dtypes of the raw Bulldozers columns; other string columns become
+# category when they are low-cardinality and numerics are downcast
+SCHEMA: Dict[str, str] = {
+    'SalesID': 'int32',
+    'SalePrice': 'float32',
+    'MachineID': 'int32',
+    'ModelID': 'int32',
+    'datasource': 'int16',
+    'auctioneerID': 'float32',
+    'YearMade': 'int16',
+    'MachineHoursCurrentMeter': 'float32',
+    'MfgYear': 'float32',
+    'fiManufacturerID': 'float32',
+    'PrimaryLower': 'float32',
+    'PrimaryUpper': 'float32',
+}
+DATE_COLUMNS = ['saledate']
+
+# Free-text columns with thousands of values stay strings
+MAX_CATEGORY_RATIO = 0.5
+
+
+def file_hash(path: str, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _downcast(df: pd.DataFrame) -> pd.DataFrame:
+    for column in df.columns:
+        if column in SCHEMA or column in DATE_COLUMNS:
+            continue
+        values = df[column]
+        if pd.api.types.is_integer_dtype(values):
+            df[column] = pd.to_numeric(values, downcast='integer')
+        elif pd.api.types.is_float_dtype(values):
+            df[column] = pd.to_numeric(values, downcast='float')
+        elif values.nunique() <= MAX_CATEGORY_RATIO * len(values):
+            df[column] = values.astype('category')
+    return df
+
+
+def read_bulldozers_csv(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Read a Bulldozers CSV with the explicit schema, parsed saledate and downcast dtypes."""
+    header = pd.read_csv(path, nrows=0).columns
+    usecols = [column for column in header if columns is None or column in columns]
+    dates = [column for column in DATE_COLUMNS if column in usecols]
+    dtype = {column: dtype for column, dtype in SCHEMA.items() if column in usecols}
+    df = pd.read_csv(
+        path,
+        usecols=usecols,
+        # Dates are read as categories and only the distinct values are parsed
+        dtype={**dtype, **{column: 'category' for column in dates}},
+        low_memory=False,
+    )
+    for column in dates:
+        values = df[column].cat
+        df[column] = pd.DatetimeIndex(pd.to_datetime(values.categories)).take(
+            values.codes, allow_fill=True, fill_value=pd.NaT
+        )
+    return _downcast(df)
+
+
+def cache_path(path: str, cache_dir: str) -> str:
+    # Keyed on the file contents, so an edited CSV never reuses a stale cache
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir, f'{stem}-v{SCHEMA_VERSION}-{file_hash(path)[:16]}.feather')
+
+
+def load_bulldozers(path: str, cache_dir: Optional[str] = None, columns: Optional[List[str]] = None,
+                    use_cache: bool = True) -> pd.DataFrame:
+    """Load a Bulldozers CSV through an uncompressed Feather cache.
+
+    The first load parses the CSV and writes the cache; later loads memory-map
+    the Arrow file instead of parsing text. cache_dir defaults to a "cache"
+    directory next to the CSV.
+    """
+    if not use_cache:
+        return read_bulldozers_csv(path, columns)
+
+    cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.abspath(path)), 'cache')
+    cached = cache_path(path, cache_dir)
+    if not os.path.exists(cached):
+        os.makedirs(cache_dir, exist_ok=True)
+        df = read_bulldozers_csv(path)
+        # Write to a temporary name first so an interrupted run leaves no partial cache
+        feather.write_feather(df, cached + '.tmp', compression='uncompressed')
+        os.replace(cached + '.tmp', cached)
+
+    table = feather.read_table(cached, columns=columns, memory_map=True)
+    return table.to_pandas()
+
+
+def memory_usage_mb(df: pd.DataFrame) -> float:
+    return df.memory_usage(deep=True).sum() / 1e6
+
+
+if __name__ == '__main__':
+    # Build the cache for a CSV and compare it with a default read, e.g.
+    #   python projects/proj_2_team_4/src/data_loader.py path/to/TrainAndValid.csv
+    import time
+
+    if len(sys.argv) < 2:
+        sys.exit('Usage: data_loader.py <csv> [cache_dir]')
+    csv_path = sys.argv[1]
+    cache_dir = sys.argv[2] if len(sys.argv) > 2 else None
+
+    start = time.perf_counter()
+    raw = pd.read_csv(csv_path, low_memory=False)
+    print(f'pd.read_csv:      {time.perf_counter() - start:6.2f}s {memory_usage_mb(raw):8.1f} MB')
+    del raw
+
+    for label in ('typed, cold cache', 'typed, warm cache'):
+        start = time.perf_counter()
+        df = load_bulldozers(csv_path, cache_dir)
+        print(f'{label + ":":17} {time.perf_counter() - start:6.2f}s {memory_usage_mb(df):8.1f} MB')
+
+    print(df.dtypes.value_counts().to_string())
@@ -0,0 +1,122 @@
+import json
+import os
+import sys
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def _to_builtin(value):
+    # JSON cannot serialize NumPy scalars
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _numeric_entry(feature: str, column: pd.Series) -> Dict:
+    column = pd.to_numeric(column, errors="coerce")
+    if column.isna().all():
+        raise ValueError("no numeric values")
+
+    if feature == "YearMade":
+        col_min = max(1901, int(column.min()))
+        col_max = int(column.max())
+    else:
+        col_min = column.min()
+        col_max = column.max()
+
+    col_mean = column.mean()
+
+    # Check if it's an integer-like column
+    if pd.api.types.is_integer_dtype(column.dropna()):
+        # Adjust mean within bounds if needed, handling missing values
+        default_val = min(max(int(col_mean), col_min), col_max)
+        return {
+            "kind": "integer",
+            "min": int(col_min),
+            "max": int(col_max),
+            "default": int(default_val),
+            "step": 1,
+        }
+
+    default_val = min(max(float(col_mean), col_min), col_max)
+    return {
+        "kind": "float",
+        "min": float(col_min),
+        "max": float(col_max),
+        "default": float(default_val),
+        "step": float((col_max - col_min) / 100 if col_max > col_min else 1.0),
+    }
+
+
+def build_feature_schema(df: pd.DataFrame, target_name: str = "SalePrice", n_sample_rows: int = 5) -> Dict:
+    """Per-column options, bounds, defaults and dtypes the Streamlit app needs."""
+    feature_names = [col for col in df.columns if col not in [target_name]]
+    categorical_features = df.select_dtypes(include=["object", "category"]).columns.tolist()
+
+    columns = {}
+    for feature in feature_names:
+        entry = {"dtype": str(df[feature].dtype)}
+        if feature in categorical_features:
+            entry["kind"] = "categorical"
+            entry["options"] = sorted(df[feature].dropna().astype(str).unique().tolist())
+        else:
+            try:
+                entry.update(_numeric_entry(feature, df[feature]))
+            except Exception as e:
+                entry["kind"] = "skipped"
+                entry["error"] = str(e)
+        columns[feature] = {key: _to_builtin(value) for key, value in entry.items()}
+
+    return {
+        "target": target_name,
+        "features": feature_names,
+        "columns": columns,
+        # A few raw rows for display, so the app never has to read the CSV
+        "sample": json.loads(df.head(n_sample_rows).to_json(orient="records", date_format="iso")),
+    }
+
+
+# Python type of the number_input values of each numeric column kind
+NUMBER_TYPES = {"integer": int, "float": float}
+
+
+def number_input_args(column: Dict) -> Dict:
+    """st.number_input bounds, default and step of a numeric column, all of one type."""
+    dtype = NUMBER_TYPES[column["kind"]]
+    return {
+        "min_value": dtype(column["min"]),
+        "max_value": dtype(column["max"]),
+        "value": dtype(column["default"]),
+        "step": dtype(column["step"]),
+    }
+
+
+def save_feature_schema(schema: Dict, path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(schema, f, indent=2)
+
+
+def load_feature_schema(path: str) -> Dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+if __name__ == "__main__":
+    # Build the schema once from the raw training data, e.g. after training:
+    #   python projects/proj_2_team_4/src/feature_schema.py [schema_path]
+    # A path given on the command line takes precedence over FEATURE_SCHEMA_PATH.
+    from dotenv import load_dotenv
+
+    env_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".env")
+    load_dotenv(env_path)
+
+    train_path = os.getenv("TRAIN_RAW_MERGED_PATH")
+    schema_path: Optional[str] = sys.argv[1] if len(sys.argv) > 1 else os.getenv("FEATURE_SCHEMA_PATH")
+    if not train_path or not schema_path:
+        sys.exit("Set TRAIN_RAW_MERGED_PATH in projects/proj_2_team_4/.env, and FEATURE_SCHEMA_PATH there "
+                 "or pass the schema path as an argument")
+
+    save_feature_schema(build_feature_schema(pd.read_csv(train_path, low_memory=False)), schema_path)
+    print(f"Saved {schema_path}")
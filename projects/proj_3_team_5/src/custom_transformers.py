@@ -1,5 +1,10 @@
+import hashlib
+import inspect
+import os
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+from scipy import sparse
 from typing import List, Dict, Optional
 from sklearn.base import BaseEstimator, TransformerMixin
 from sklearn.feature_extraction.text import TfidfVectorizer
@@ -9,30 +14,63 @@ from sklearn.feature_extraction.text import CountVectorizer
 
 # Custom transformer class to detect and remove outliers
 class CustomOutlierRemover(BaseEstimator, TransformerMixin):
-    def __init__(self, columns: List[str], threshold: float = 3):
+    """Drops rows lying more than threshold scales away from the fitted center.
+
+    method='zscore' uses the mean and standard deviation, method='robust' the
+    median and MAD. Both are learned in fit, so every batch passed to transform
+    is judged by the same statistics. Missing values are never outliers, and
+    columns without spread flag no rows.
+    """
+    def __init__(self, columns: List[str], threshold: float = 3, method: str = 'zscore'):
         self.columns = columns
         self.threshold = threshold
+        self.method = method
+        self.numeric_cols = None
+        self.center = None
+        self.scale = None
         self._outliers = None
 
     def fit(self, X, y=None):
+        # Only the listed columns present in the data are checked
+        self.numeric_cols = [col for col in self.columns if col in X.columns]
+        values = X[self.numeric_cols].to_numpy(dtype=np.float64)
+
+        if self.method == 'zscore':
+            center = np.nanmean(values, axis=0)
+            scale = np.nanstd(values, axis=0, ddof=1)
+        elif self.method == 'robust':
+            center = np.nanmedian(values, axis=0)
+            # Rescaled so the MAD estimates the standard deviation of normal data
+            scale = 1.4826 * np.nanmedian(np.abs(values - center), axis=0)
+        else:
+            raise ValueError(f"Unknown method '{self.method}', expected 'zscore' or 'robust'.")
+
+        self.center = center.astype(np.float32)
+        # A zero or NaN scale (e.g. a mostly constant column) becomes inf, so the
+        # column flags no rows instead of every value off its center
+        self.scale = np.where(scale > 0, scale, np.inf).astype(np.float32)
         return self
 
+    def outlier_mask(self, X) -> np.ndarray:
+        # Scale one float32 block in place; NaN compares False, so it is never an outlier
+        values = X[self.numeric_cols].to_numpy(dtype=np.float32, copy=True)
+        values -= self.center
+        np.abs(values, out=values)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values /= self.scale
+        return (values > self.threshold).any(axis=1)
+
     def transform(self, X):
-        X_transformed = X.copy()
-        
-        # Calculate z-scores for specified columns
-        z_scores = pd.DataFrame(index=X.index)
-        for col in self.columns:
-            if col in X.columns:
-                # Fill NaN with mean for z-score calculation
-                col_filled = X[col].fillna(X[col].mean())
-                z_scores[col] = (col_filled - col_filled.mean()) / col_filled.std()
-
-        # Identify outliers
-        self._outliers = (abs(z_scores) > self.threshold).any(axis=1)
-        
-        # Remove outliers
-        return X_transformed[~self._outliers]
+        self._outliers = pd.Series(self.outlier_mask(X), index=X.index)
+        # Boolean indexing returns a new frame, so X is never modified
+        return X[~self._outliers.to_numpy()]
+
+    def fit_resample(self, X, y=None):
+        # Fit, then drop the same rows from X and y with one boolean mask
+        self.fit(X)
+        self._outliers = pd.Series(self.outlier_mask(X), index=X.index)
+        keep = ~self._outliers.to_numpy()
+        return X[keep], (y[keep] if y is not None else None)
 
     @property
     def outliers(self):
@@ -54,50 +92,181 @@ class TextCleaner(BaseEstimator, TransformerMixin):
         return X_transformed
     
 class TfidfEncoder(BaseEstimator, TransformerMixin):
-    def __init__(self, column: str, max_features: int = 500):
+    """Replaces a text column with its TF-IDF weights.
+
+    By default the weights are added as dense columns after the other columns.
+    With sparse_output=True transform returns one scipy CSR matrix of the
+    other (numeric) columns followed by the TF-IDF block, so KMeans and other
+    estimators never see a dense copy; get_feature_names_out names its columns.
+    dtype is the dtype of the weights, e.g. np.float32.
+    """
+    def __init__(self, column: str, max_features: int = 500, sparse_output: bool = False,
+                 dtype=np.float64):
         self.column = column
         self.max_features = max_features
-        self.vectorizer = TfidfVectorizer(max_features=self.max_features, stop_words='english')
+        self.sparse_output = sparse_output
+        self.dtype = dtype
+        self.vectorizer = None
         self.feature_names = []
+        self.other_columns = []
 
     def fit(self, X, y=None):
+        # Built here so set_params (e.g. in a grid search) takes effect
+        self.vectorizer = TfidfVectorizer(max_features=self.max_features, stop_words='english', dtype=self.dtype)
         texts = X[self.column].fillna('').astype(str)
         self.vectorizer.fit(texts)
         self.feature_names = [f"{self.column}_tfidf_{feat}" for feat in self.vectorizer.get_feature_names_out()]
+        self.other_columns = [column for column in X.columns if column != self.column]
         return self
 
     def transform(self, X):
-        X_transformed = X.copy()
-        texts = X_transformed[self.column].fillna('').astype(str)
+        texts = X[self.column].fillna('').astype(str)
         tfidf_matrix = self.vectorizer.transform(texts)
-        tfidf_df = pd.DataFrame(tfidf_matrix.toarray(), columns=self.feature_names, index=X_transformed.index)
-        
+        # drop() and concat() never modify X, so no defensive copy is needed
+        X_other = X.drop(columns=[self.column])
+        if self.sparse_output:
+            non_numeric = X_other.select_dtypes(exclude=['number', 'bool']).columns.tolist()
+            if non_numeric:
+                raise ValueError(f"sparse_output=True needs numeric columns besides '{self.column}'; "
+                                 f"encode or drop {non_numeric} first.")
+            # Keep the TF-IDF block sparse instead of densifying it
+            return sparse.hstack([sparse.csr_matrix(X_other.to_numpy(dtype=self.dtype)), tfidf_matrix],
+                                 format='csr')
+
         # Drop original text column and add TF-IDF features
-        X_transformed = X_transformed.drop(columns=[self.column])
-        X_transformed = pd.concat([X_transformed, tfidf_df], axis=1)
-        return X_transformed
+        tfidf_df = pd.DataFrame(tfidf_matrix.toarray(), columns=self.feature_names, index=X.index)
+        return pd.concat([X_other, tfidf_df], axis=1)
+
+    def get_feature_names_out(self, input_features=None):
+        return np.asarray(self.other_columns + self.feature_names, dtype=object)
+
+    def __sklearn_is_fitted__(self):
+        return self.vectorizer is not None
     
-class CustomTokenizer(BaseEstimator, TransformerMixin):
-    def __init__(self, column: str, vocab_size: int = 10000):
+SPECIAL_TOKENS = ["[UNK]", "[CLS]", "[SEP]", "[PAD]", "[MASK]"]
+
+
+class WordPieceMixin:
+    """WordPiece training with an optional on-disk cache and compact pickling.
+
+    show_progress=False turns off the trainer's progress bar.
+    """
+
+    def _new_tokenizer(self) -> Tokenizer:
+        tokenizer = Tokenizer(models.WordPiece(unk_token="[UNK]"))
+        tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
+        tokenizer.decoder = decoders.WordPiece()
+        return tokenizer
+
+    def _new_trainer(self):
+        return trainers.WordPieceTrainer(vocab_size=self.vocab_size, special_tokens=SPECIAL_TOKENS,
+                                         show_progress=self.show_progress)
+
+    def _cache_path(self, texts: List[str]) -> str:
+        # Identical (corpus, vocab_size, tokenizer setup) pairs share one file
+        digest = hashlib.sha256(self._new_tokenizer().to_str().encode())
+        digest.update(str(self.vocab_size).encode())
+        for text in texts:
+            digest.update(text.encode())
+            digest.update(b"\0")
+        return os.path.join(self.cache_dir, f"wordpiece_{digest.hexdigest()}.json")
+
+    def _train_tokenizer(self, texts: List[str]) -> None:
+        path = self._cache_path(texts) if self.cache_dir is not None else None
+        if path is not None and os.path.exists(path):
+            self.tokenizer = Tokenizer.from_file(path)
+            return
+
+        # Start from a fresh tokenizer and trainer so refits do not accumulate word counts
+        self.tokenizer = self._new_tokenizer()
+        self.trainer = self._new_trainer()
+        self.tokenizer.train_from_iterator(texts, trainer=self.trainer)
+
+        if path is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            try:
+                self.tokenizer.save(tmp_path)
+                os.replace(tmp_path, path)
+            except OSError:
+                # Leave neither a partial cache file nor the temporary one
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+    def __getstate__(self):
+        state = dict(super().__getstate__())
+        # Keep the tokenizer as its JSON definition and drop the trainer with its word counts
+        state['tokenizer'] = self.tokenizer.to_str()
+        state.pop('trainer', None)
+        return state
+
+    def __setstate__(self, state):
+        state = dict(state)
+        # Estimators pickled without __getstate__ hold the Tokenizer itself
+        if isinstance(state['tokenizer'], str):
+            state['tokenizer'] = Tokenizer.from_str(state['tokenizer'])
+        # Parameters added since the estimator was pickled take their defaults
+        for name, parameter in inspect.signature(type(self).__init__).parameters.items():
+            if parameter.default is not inspect.Parameter.empty:
+                state.setdefault(name, parameter.default)
+        super().__setstate__(state)
+        self.trainer = self._new_trainer()
+
+
+class CustomTokenizer(WordPieceMixin, BaseEstimator, TransformerMixin):
+    def __init__(self, column: str, vocab_size: int = 10000, output: str = 'tokens',
+                 batch_size: int = 10000, cache_dir: Optional[str] = None, show_progress: bool = True):
         self.column = column
         self.vocab_size = vocab_size
-        self.tokenizer = Tokenizer(models.WordPiece(unk_token="[UNK]"))
-        self.tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
-        self.tokenizer.decoder = decoders.WordPiece()
-        self.trainer = trainers.WordPieceTrainer(
-            vocab_size=self.vocab_size,
-            special_tokens=["[UNK]", "[CLS]", "[SEP]", "[PAD]", "[MASK]"]
-        )
+        self.output = output
+        self.batch_size = batch_size
+        self.cache_dir = cache_dir
+        self.show_progress = show_progress
+        self.tokenizer = self._new_tokenizer()
+        self.trainer = self._new_trainer()
 
     def fit(self, X, y=None):
         texts = X[self.column].fillna('').astype(str).tolist()
-        self.tokenizer.train_from_iterator(texts, trainer=self.trainer)
+        self._train_tokenizer(texts)
         return self
 
+    def _encode_ids(self, texts: List[str]) -> pa.ListArray:
+        # Token ids of one batch as a flat int32 buffer plus row offsets
+        encodings = self.tokenizer.encode_batch(texts)
+        offsets = np.zeros(len(encodings) + 1, dtype=np.int32)
+        np.cumsum([len(encoding.ids) for encoding in encodings], out=offsets[1:])
+        ids = np.fromiter(
+            (token_id for encoding in encodings for token_id in encoding.ids),
+            dtype=np.int32,
+            count=offsets[-1]
+        )
+        return pa.ListArray.from_arrays(offsets, ids)
+
     def transform(self, X):
+        if self.output not in ('tokens', 'ids'):
+            raise ValueError("output must be 'tokens' or 'ids'.")
+
         X_ = X.copy()
-        X_[self.column] = X_[self.column].fillna('').astype(str).apply(lambda x: self.tokenizer.encode(x).tokens)
+        texts = X_[self.column].fillna('').astype(str).tolist()
+        batches = [texts[start:start + self.batch_size] for start in range(0, len(texts), self.batch_size)]
+
+        if self.output == 'ids':
+            # Arrow list column: one flat id buffer per batch, no per-row Python lists
+            ids = pa.chunked_array([self._encode_ids(batch) for batch in batches], type=pa.list_(pa.int32()))
+            X_[self.column] = pd.Series(pd.arrays.ArrowExtensionArray(ids), index=X_.index)
+        else:
+            X_[self.column] = [
+                encoding.tokens
+                for batch in batches
+                for encoding in self.tokenizer.encode_batch(batch)
+            ]
         return X_
+
+    def iter_transform(self, X):
+        # Stream transformed chunks of at most batch_size rows
+        for start in range(0, len(X), self.batch_size):
+            yield self.transform(X.iloc[start:start + self.batch_size])
     
 
 class ToDataFrame(BaseEstimator, TransformerMixin):
@@ -110,35 +279,68 @@ class ToDataFrame(BaseEstimator, TransformerMixin):
     def transform(self, X):
         return pd.DataFrame(X, columns=self.columns)
 
-class CustomTokenizerVectorizer(BaseEstimator, TransformerMixin):
-    def __init__(self, column: str, vocab_size: int = 1000):
+class CustomTokenizerVectorizer(WordPieceMixin, BaseEstimator, TransformerMixin):
+    def __init__(self, column: str, vocab_size: int = 1000, binary: bool = True,
+                 sparse_output: bool = False, cache_dir: Optional[str] = None, show_progress: bool = True):
         self.column = column
         self.vocab_size = vocab_size
-        self.tokenizer = Tokenizer(models.WordPiece(unk_token="[UNK]"))
-        self.tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
-        self.tokenizer.decoder = decoders.WordPiece()
-        self.trainer = trainers.WordPieceTrainer(
-            vocab_size=self.vocab_size,
-            special_tokens=["[UNK]", "[CLS]", "[SEP]", "[PAD]", "[MASK]"]
-        )
+        self.binary = binary
+        self.sparse_output = sparse_output
+        self.cache_dir = cache_dir
+        self.show_progress = show_progress
+        self.tokenizer = self._new_tokenizer()
+        self.trainer = self._new_trainer()
 
     def fit(self, X, y=None):
         texts = X[self.column].fillna('').astype(str).tolist()
-        self.tokenizer.train_from_iterator(texts, trainer=self.trainer)
+        self._train_tokenizer(texts)
 
         # Zapisz słownik tokenów (pomijając specjalne tokeny)
-        self.vocab = [token for token in self.tokenizer.get_vocab().keys() if token not in {"[UNK]", "[CLS]", "[SEP]", "[PAD]", "[MASK]"}]
+        token_ids = self.tokenizer.get_vocab()
+        self.vocab = [
+            token for token in sorted(token_ids, key=token_ids.get) if token not in set(SPECIAL_TOKENS)
+        ]
+        self.column_index = self._column_index()
         return self
 
+    def _column_index(self) -> np.ndarray:
+        # Lookup table from token id to output column, -1 for special tokens
+        token_ids = self.tokenizer.get_vocab()
+        column_index = np.full(max(token_ids.values()) + 1, -1, dtype=np.int64)
+        column_index[[token_ids[token] for token in self.vocab]] = np.arange(len(self.vocab))
+        return column_index
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        # Fitted before the lookup table existed; columns keep the pickled vocab order
+        if hasattr(self, 'vocab') and not hasattr(self, 'column_index'):
+            self.column_index = self._column_index()
+
     def transform(self, X):
         texts = X[self.column].fillna('').astype(str).tolist()
 
-        X_tokenized = []
-        for text in texts:
-            tokens = set(self.tokenizer.encode(text).tokens)
-            X_tokenized.append([1 if token in tokens else 0 for token in self.vocab])
+        # Encode all texts at once, the tokenizers library parallelises the batch
+        encodings = self.tokenizer.encode_batch(texts)
+        lengths = np.fromiter((len(encoding.ids) for encoding in encodings), dtype=np.int64, count=len(encodings))
+        ids = np.fromiter(
+            (token_id for encoding in encodings for token_id in encoding.ids),
+            dtype=np.int64,
+            count=lengths.sum()
+        )
+
+        rows = np.repeat(np.arange(len(texts)), lengths)
+        cols = self.column_index[ids]
+        known = cols >= 0
+
+        # Duplicate (row, column) pairs are summed into token counts
+        X_tokenized = sparse.csr_matrix(
+            (np.ones(known.sum(), dtype=np.int32), (rows[known], cols[known])),
+            shape=(len(texts), len(self.vocab))
+        )
+        if self.binary:
+            X_tokenized.data[:] = 1
 
-        return np.array(X_tokenized)
+        return X_tokenized if self.sparse_output else X_tokenized.toarray()
 
     def get_feature_names_out(self, input_features=None):
         return [f"{self.column}_{token}" for token in self.vocab]
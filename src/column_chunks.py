@@ -0,0 +1,38 @@
+import numpy as np
+
+# Size of the row chunks in which numerical blocks are fitted and written back
+CHUNK_BYTES = 4 * 2**20
+
+
+def chunk_rows(columns) -> int:
+    """float64 rows of columns per chunk, so narrow blocks are handled in one call."""
+    return max(1, CHUNK_BYTES // (8 * max(len(columns), 1)))
+
+
+def row_chunks(X, columns):
+    """X[columns] in consecutive row chunks; an empty X gives one empty chunk."""
+    block = X[columns]
+    step = chunk_rows(columns)
+    for start in range(0, max(len(block), 1), step):
+        yield block.iloc[start:start + step]
+
+
+def replace_columns(X, columns, transform, copy=True):
+    """X with columns replaced by transform(X[columns]).
+
+    With copy=True X is shallow-copied and copy-on-write duplicates only the
+    blocks that are written. float64 columns are overwritten in place one row
+    chunk at a time; other dtypes are replaced as a whole.
+    """
+    X_transformed = X.copy(deep=False) if copy else X
+    # Blocks passed to transform are copies, so it may write into them
+    if not all(X_transformed[column].dtype == np.float64 for column in columns):
+        X_transformed[columns] = transform(X_transformed[columns].copy())
+        return X_transformed
+
+    positions = X_transformed.columns.get_indexer(columns)
+    step = chunk_rows(columns)
+    for start in range(0, len(X_transformed), step):
+        rows = slice(start, start + step)
+        X_transformed.iloc[rows, positions] = transform(X_transformed.iloc[rows, positions].copy())
+    return X_transformed
@@ -0,0 +1,15 @@
+from joblib import Parallel
+
+
+def parallel_columns(tasks, n_jobs=None):
+    """Results of joblib delayed tasks, one per column, in task order.
+
+    With n_jobs None or 1 the tasks run one by one in this process. Otherwise
+    they run in n_jobs worker processes (joblib's loky backend, -1 for all
+    cores), since per-column pandas work holds the GIL. A task's arguments and
+    result are pickled to and from its worker, so tasks should take a single
+    column rather than the whole frame. Results are yielded as they arrive.
+    """
+    if n_jobs is None or n_jobs == 1:
+        return (function(*args, **kwargs) for function, args, kwargs in tasks)
+    return Parallel(n_jobs=n_jobs, backend="loky", return_as="generator")(tasks)
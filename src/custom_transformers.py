@@ -2,10 +2,12 @@ from typing import Optional, List
 
 import numpy as np
 import pandas as pd
-from scipy import stats
+from joblib import delayed
+from scipy import sparse
 
-from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.base import BaseEstimator, TransformerMixin, clone
 from sklearn.impute import SimpleImputer
+from sklearn.pipeline import make_pipeline
 from sklearn.preprocessing import (
     LabelEncoder,
     OneHotEncoder,
@@ -13,121 +15,266 @@ from sklearn.preprocessing import (
     MinMaxScaler,
 )
 
+try:
+    from .column_chunks import replace_columns, row_chunks
+    from .column_jobs import parallel_columns
+    from .sparse_frames import sparse_frame
+except ImportError:
+    # src itself is on sys.path
+    from column_chunks import replace_columns, row_chunks
+    from column_jobs import parallel_columns
+    from sparse_frames import sparse_frame
+
+
+def _fit_in_chunks(estimator, X, columns):
+    # A fresh copy of estimator fitted with partial_fit over row chunks, so the
+    # whole block is never validated and copied at once
+    estimator = clone(estimator)
+    for chunk in row_chunks(X, columns):
+        estimator.partial_fit(chunk)
+    return estimator
+
 
 class DropColumnTransformer(BaseEstimator, TransformerMixin):
-    def __init__(self, columns):
+    def __init__(self, columns, copy: bool = True):
         self.columns = columns
+        self.copy = copy
 
     def fit(self, X, y=None):
         return self
 
     def transform(self, X):
         # Drop specified columns
-        X_transformed = X.drop(columns=self.columns, axis=1)
+        if not self.copy:
+            X.drop(columns=self.columns, inplace=True)
+            return X
+        X_transformed = X.drop(columns=self.columns)
         return X_transformed
 
 
 class CustomImputer(BaseEstimator, TransformerMixin):
-    def __init__(self, strategy="mean", columns: Optional[List[str]] = None):
+    def __init__(self, strategy="mean", columns: Optional[List[str]] = None, copy: bool = True):
         self.strategy = strategy
         self.columns = columns if columns is not None else []
-        self.imputer = SimpleImputer(strategy=self.strategy)
+        self.copy = copy
+        # fit only reads the block and transform gets copied chunks, so the
+        # imputer never needs a copy of its own
+        self.imputer = SimpleImputer(strategy=self.strategy, copy=False)
 
     def fit(self, X, y=None):
         self.imputer.fit(X[self.columns])
         return self
 
     def transform(self, X):
-        X_transformed = X.copy()
-        X_transformed[self.columns] = self.imputer.transform(X[self.columns])
-        return X_transformed
+        return replace_columns(X, self.columns, self.imputer.transform, copy=self.copy)
 
 
 class CustomLabelEncoder(BaseEstimator, TransformerMixin):
+    """Label-encodes each column; n_jobs encodes columns in worker processes."""
 
-    def __init__(self, columns: List[str]) -> None:
+    def __init__(self, columns: List[str], copy: bool = True, n_jobs: Optional[int] = None) -> None:
         self.columns = columns
+        self.copy = copy
+        self.n_jobs = n_jobs
         self.encoders = {}
 
     def fit(self, X, y=None):
-        for column in self.columns:
-            self.encoders[column] = LabelEncoder()
-            self.encoders[column].fit(X[column])
+        encoders = parallel_columns((delayed(LabelEncoder().fit)(X[column]) for column in self.columns), self.n_jobs)
+        self.encoders = dict(zip(self.columns, encoders))
         return self
 
     def transform(self, X):
-        X_transformed = X.copy()
-        for column in self.columns:
-            X_transformed[column] = self.encoders[column].transform(X[column])
+        X_transformed = X.copy(deep=False) if self.copy else X
+        encoded = parallel_columns(
+            (delayed(self.encoders[column].transform)(X[column]) for column in self.columns), self.n_jobs
+        )
+        # Columns are written back as they arrive, so few are held at a time
+        for column, values in zip(self.columns, encoded):
+            X_transformed[column] = values
         return X_transformed
 
 
 class CustomOneHotEncoder(BaseEstimator, TransformerMixin):
+    """One-hot encodes each column; n_jobs encodes columns in worker processes."""
 
-    def __init__(self, columns: List[str]) -> None:
+    def __init__(self, columns: List[str], sparse_output: bool = False, n_jobs: Optional[int] = None) -> None:
         self.columns = columns
+        self.sparse_output = sparse_output
+        self.n_jobs = n_jobs
         self.encoders = {}
 
     def fit(self, X, y=None):
-        for column in self.columns:
-            self.encoders[column] = OneHotEncoder(sparse_output=False)
-            self.encoders[column].fit(X[[column]])
+        encoders = parallel_columns(
+            (delayed(OneHotEncoder(sparse_output=self.sparse_output).fit)(X[[column]]) for column in self.columns),
+            self.n_jobs,
+        )
+        self.encoders = dict(zip(self.columns, encoders))
         return self
 
     def transform(self, X):
-        X_transformed = X.copy()
-        for column in self.columns:
+        # Encode every column into one block and attach it with a single concat
+        blocks = list(parallel_columns(
+            (delayed(self.encoders[column].transform)(X[[column]]) for column in self.columns), self.n_jobs
+        ))
+        names = [
+            name
+            for column in self.columns
+            for name in self.encoders[column].get_feature_names_out([column])
+        ]
+        if self.sparse_output and blocks:
+            encoded = sparse_frame(sparse.hstack(blocks, format="csc"), names, X.index)
+        else:
             encoded = pd.DataFrame(
-                self.encoders[column].transform(X[[column]]),
-                columns=self.encoders[column].get_feature_names_out([column]),
+                np.hstack(blocks) if blocks else np.empty((len(X), 0)),
+                columns=names,
                 index=X.index,
             )
-            X_transformed = pd.concat(
-                [X_transformed.drop(columns=column), encoded], axis=1
-            )
+        # drop() and concat() never modify X, so no defensive copy is needed
+        X_transformed = pd.concat([X.drop(columns=self.columns), encoded], axis=1)
         return X_transformed
 
 
 class CustomStandardScaler(BaseEstimator, TransformerMixin):
 
-    def __init__(self, columns: List[str]) -> None:
+    def __init__(self, columns: List[str], copy: bool = True) -> None:
         self.columns = columns
-        self.scaler = StandardScaler()
+        self.copy = copy
+        self.scaler = StandardScaler(copy=False)
 
     def fit(self, X, y=None):
-        self.scaler.fit(X[self.columns])
+        self.scaler = _fit_in_chunks(self.scaler, X, self.columns)
         return self
 
     def transform(self, X):
-        X_transformed = X.copy()
-        X_transformed[self.columns] = self.scaler.transform(X[self.columns])
+        return replace_columns(X, self.columns, self.scaler.transform, copy=self.copy)
+
+
+class CustomImputeScaler(BaseEstimator, TransformerMixin):
+    """Imputes and scales numerical columns as one float32 block.
+
+    The columns are extracted once, filled and scaled in place with the
+    statistics learned in fit, and written back once. strategy is "mean",
+    "median" or "constant"; scaling is "standard", "minmax" or None.
+    """
+
+    def __init__(self, columns: List[str], strategy: str = "mean", scaling: Optional[str] = "standard",
+                 fill_value: float = 0, copy: bool = True):
+        self.columns = columns
+        self.strategy = strategy
+        self.scaling = scaling
+        self.fill_value = fill_value
+        self.copy = copy
+        self.statistics = None
+        self.offset = None
+        self.scale = None
+
+    def fit(self, X, y=None):
+        values = X[self.columns].to_numpy(dtype=np.float64)
+
+        if self.strategy == "mean":
+            fill = np.nanmean(values, axis=0)
+        elif self.strategy == "median":
+            fill = np.nanmedian(values, axis=0)
+        elif self.strategy == "constant":
+            fill = np.full(values.shape[1], self.fill_value, dtype=np.float64)
+        else:
+            raise ValueError(f"Unknown strategy '{self.strategy}', expected 'mean', 'median' or 'constant'.")
+        values = np.where(np.isnan(values), fill, values)
+
+        # Scaling statistics are those of the imputed values
+        if self.scaling == "standard":
+            offset, scale = values.mean(axis=0), values.std(axis=0)
+        elif self.scaling == "minmax":
+            offset = values.min(axis=0)
+            scale = values.max(axis=0) - offset
+        elif self.scaling is None:
+            offset, scale = np.zeros(values.shape[1]), np.ones(values.shape[1])
+        else:
+            raise ValueError(f"Unknown scaling '{self.scaling}', expected 'standard', 'minmax' or None.")
+
+        self.statistics = fill.astype(np.float32)
+        self.offset = offset.astype(np.float32)
+        # Constant columns are left unscaled, as in StandardScaler and MinMaxScaler
+        self.scale = np.where(scale > 0, scale, 1.0).astype(np.float32)
+        return self
+
+    def transform(self, X):
+        values = X[self.columns].to_numpy(dtype=np.float32, copy=True)
+        np.copyto(values, self.statistics, where=np.isnan(values))
+        values -= self.offset
+        values /= self.scale
+
+        X_transformed = X.copy(deep=False) if self.copy else X
+        X_transformed[self.columns] = values
         return X_transformed
 
 
 # Custom transformer class to detect and remove outliers
 class CustomOutlierRemover(BaseEstimator, TransformerMixin):
-    def __init__(self, threshold=3):
+    """Drops rows lying more than threshold scales away from the fitted center.
+
+    method="zscore" uses the mean and standard deviation, method="robust" the
+    median and MAD. Both are learned in fit, so every batch passed to transform
+    is judged by the same statistics. Missing values are never outliers, and
+    columns without spread flag no rows.
+    """
+
+    def __init__(self, threshold=3, columns: Optional[List[str]] = None, method: str = "zscore"):
         self.threshold = threshold
+        self.columns = columns
+        self.method = method
         self.numeric_cols = None
+        self.center = None
+        self.scale = None
         self._outliers = None
 
-    # This function identifies the numerical columns
     def fit(self, X, y=None):
-        self.numeric_cols = X.select_dtypes(include=np.number).columns
+        # Default to all numerical columns
+        if self.columns is None:
+            self.numeric_cols = X.select_dtypes(include=np.number).columns
+        else:
+            self.numeric_cols = pd.Index(self.columns)
+        values = X[self.numeric_cols].to_numpy(dtype=np.float64)
+
+        if self.method == "zscore":
+            center = np.nanmean(values, axis=0)
+            scale = np.nanstd(values, axis=0, ddof=1)
+        elif self.method == "robust":
+            center = np.nanmedian(values, axis=0)
+            # Rescaled so the MAD estimates the standard deviation of normal data
+            scale = 1.4826 * np.nanmedian(np.abs(values - center), axis=0)
+        else:
+            raise ValueError(f"Unknown method '{self.method}', expected 'zscore' or 'robust'.")
+
+        self.center = center.astype(np.float32)
+        # A zero or NaN scale (e.g. a mostly constant column) becomes inf, so the
+        # column flags no rows instead of every value off its center
+        self.scale = np.where(scale > 0, scale, np.inf).astype(np.float32)
         return self
 
-    def transform(self, X):
+    def outlier_mask(self, X) -> np.ndarray:
         if self.numeric_cols is None:
             raise ValueError("Call 'fit' before 'transform'.")
 
-        # Make a copy of numerical columns
-        X_transformed = X.copy()
+        # Scale one float32 block in place; NaN compares False, so it is never an outlier
+        values = X[self.numeric_cols].to_numpy(dtype=np.float32, copy=True)
+        values -= self.center
+        np.abs(values, out=values)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values /= self.scale
+        return (values > self.threshold).any(axis=1)
 
-        z_scores = stats.zscore(X_transformed[self.numeric_cols])
+    def transform(self, X):
+        self._outliers = pd.Series(self.outlier_mask(X), index=X.index)
+        # Boolean indexing returns a new frame, so X is never modified
+        return X[~self._outliers.to_numpy()]
 
-        # Concat with non-numerical columns
-        self._outliers = (abs(z_scores) > self.threshold).any(axis=1)
-        return X_transformed[~self._outliers]
+    def fit_resample(self, X, y=None):
+        # Fit, then drop the same rows from X and y with one boolean mask
+        self.fit(X)
+        self._outliers = pd.Series(self.outlier_mask(X), index=X.index)
+        keep = ~self._outliers.to_numpy()
+        return X[keep], (y[keep] if y is not None else None)
 
     @property
     def outliers(self):
@@ -137,15 +284,39 @@ class CustomOutlierRemover(BaseEstimator, TransformerMixin):
 # Custom transformer for Normalization
 class CustomMinMaxScaler(BaseEstimator, TransformerMixin):
 
-    def __init__(self, columns: List[str]) -> None:
+    def __init__(self, columns: List[str], copy: bool = True) -> None:
         self.columns = columns
-        self.scaler = MinMaxScaler()
+        self.copy = copy
+        self.scaler = MinMaxScaler(copy=False)
 
     def fit(self, X, y=None):
-        self.scaler.fit(X[self.columns])
+        self.scaler = _fit_in_chunks(self.scaler, X, self.columns)
         return self
 
     def transform(self, X):
-        X_transformed = X.copy()
-        X_transformed[self.columns] = self.scaler.transform(X[self.columns])
-        return X_transformed
+        return replace_columns(X, self.columns, self.scaler.transform, copy=self.copy)
+
+
+def _takes_copy(step) -> bool:
+    return hasattr(step, "get_params") and "copy" in step.get_params(deep=False)
+
+
+def make_copy_free_pipeline(*steps, **kwargs):
+    """Build a pipeline in which only the first step copies its input.
+
+    The first step must take a ``copy`` parameter and is set to ``copy=True``,
+    so the pipeline owns the frame it works on. Later steps that accept a
+    ``copy`` parameter are switched to ``copy=False`` and mutate that frame.
+    """
+    pipeline = make_pipeline(*steps, **kwargs)
+    first = pipeline.steps[0][1]
+    if not _takes_copy(first):
+        raise ValueError(
+            f"The first step of a copy-free pipeline must take a copy parameter, got {type(first).__name__}; "
+            "later steps would modify the caller's frame."
+        )
+    first.set_params(copy=True)
+    for _, step in pipeline.steps[1:]:
+        if _takes_copy(step):
+            step.set_params(copy=False)
+    return pipeline
@@ -0,0 +1,196 @@
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.exceptions import NotFittedError
+from sklearn.utils.metaestimators import available_if
+from sklearn.utils.validation import check_is_fitted
+
+
+def _shape(X):
+    # (rows, columns) of a frame, array, sparse matrix or list; None when unknown
+    if X is None:
+        return None, None
+    shape = getattr(X, "shape", None)
+    if shape is not None:
+        return shape[0], shape[1] if len(shape) > 1 else 1
+    try:
+        return len(X), None
+    except TypeError:
+        return None, None
+
+
+def _estimator_has(method):
+    return lambda self: hasattr(self.estimator, method)
+
+
+class ProfiledStep(BaseEstimator, TransformerMixin):
+    """Wraps a pipeline step and records every fit, transform and predict call.
+
+    Each call appends a record to ``profile_`` with its wall time, rows and
+    columns in and out, and the peak bytes allocated during the call as seen
+    by tracemalloc (numpy and Python allocations, not Arrow buffers). Memory
+    tracing slows the step down; pass ``trace_memory=False`` for timings only.
+    When tracemalloc is already running, e.g. under an outer profiler or
+    another ProfiledStep, it is left running and its peak is not reset; a call
+    that stays below that peak records its net growth instead, a lower bound.
+    The wrapped estimator is fitted in place and stays available as
+    ``estimator``.
+    """
+
+    def __init__(self, estimator, name: Optional[str] = None, trace_memory: bool = True):
+        self.estimator = estimator
+        self.name = name
+        self.trace_memory = trace_memory
+
+    def _call(self, method: str, X, *args, **kwargs):
+        rows_in, columns_in = _shape(X)
+        tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        if self.trace_memory:
+            before, peak_before = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        try:
+            result = getattr(self.estimator, method)(X, *args, **kwargs)
+            seconds = time.perf_counter() - start
+            bytes_allocated = None
+            if self.trace_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                # The peak is never reset, so an outer tracer keeps its own; when
+                # the call stayed below it, only the net growth is known
+                bytes_allocated = peak - before if peak > peak_before else max(current - before, 0)
+        finally:
+            if tracing:
+                tracemalloc.stop()
+
+        # fit returns the estimator and fit_resample returns (X, y)
+        output = result[0] if method == "fit_resample" else None if method == "fit" else result
+        rows_out, columns_out = _shape(output)
+        if not hasattr(self, "profile_"):
+            self.profile_ = []
+        self.profile_.append({
+            "step": self.name or type(self.estimator).__name__.lower(),
+            "method": method,
+            "seconds": seconds,
+            "rows_in": rows_in,
+            "rows_out": rows_out,
+            "columns_in": columns_in,
+            "columns_out": columns_out,
+            "bytes_allocated": bytes_allocated,
+        })
+        return result
+
+    def fit(self, X, y=None, **fit_params):
+        self._call("fit", X, y, **fit_params)
+        self.is_fitted_ = True
+        return self
+
+    def fit_transform(self, X, y=None, **fit_params):
+        result = self._call("fit_transform", X, y, **fit_params)
+        self.is_fitted_ = True
+        return result
+
+    def transform(self, X):
+        return self._call("transform", X)
+
+    @available_if(_estimator_has("fit_resample"))
+    def fit_resample(self, X, y=None):
+        result = self._call("fit_resample", X, y)
+        self.is_fitted_ = True
+        return result
+
+    @available_if(_estimator_has("predict"))
+    def predict(self, X):
+        return self._call("predict", X)
+
+    @available_if(_estimator_has("predict_proba"))
+    def predict_proba(self, X):
+        return self._call("predict_proba", X)
+
+    @available_if(_estimator_has("score"))
+    def score(self, X, y=None):
+        return self.estimator.score(X, y)
+
+    def __sklearn_is_fitted__(self):
+        if getattr(self, "is_fitted_", False):
+            return True
+        # Steps fitted before they were wrapped
+        try:
+            check_is_fitted(self.estimator)
+        except NotFittedError:
+            return False
+        return True
+
+
+def instrument(pipeline, trace_memory: bool = True):
+    """Wrap every step of a Pipeline or ResamplingPipeline in a ProfiledStep, in place.
+
+    Steps that are already wrapped, and "passthrough" or None steps, are left
+    as they are. Returns the pipeline.
+    """
+    pipeline.steps = [
+        (name, step if step is None or step == "passthrough" or isinstance(step, ProfiledStep)
+         else ProfiledStep(step, name=name, trace_memory=trace_memory))
+        for name, step in pipeline.steps
+    ]
+    return pipeline
+
+
+def uninstrument(pipeline):
+    """Replace the ProfiledStep wrappers with the estimators they wrap, e.g. before saving the pipeline."""
+    pipeline.steps = [
+        (name, step.estimator if isinstance(step, ProfiledStep) else step)
+        for name, step in pipeline.steps
+    ]
+    return pipeline
+
+
+def profile_report(pipeline) -> pd.DataFrame:
+    """One row per recorded call of every profiled step, in pipeline order.
+
+    ``call`` numbers the calls of a step and method, so repeated transforms
+    can be told apart.
+    """
+    records: List[Dict] = []
+    for _, step in pipeline.steps:
+        records.extend(getattr(step, "profile_", []))
+    report = pd.DataFrame(records, columns=[
+        "step", "method", "seconds", "rows_in", "rows_out", "columns_in", "columns_out", "bytes_allocated",
+    ])
+    report.insert(2, "call", report.groupby(["step", "method"]).cumcount())
+    return report
+
+
+def summarize_profile(report: pd.DataFrame) -> pd.DataFrame:
+    """Total time and calls per step and method, slowest first, with each one's share of the total."""
+    summary = (
+        report.groupby(["step", "method"], sort=False)
+        .agg(calls=("seconds", "size"), seconds=("seconds", "sum"), bytes_allocated=("bytes_allocated", "max"))
+        .sort_values("seconds", ascending=False)
+    )
+    summary["share"] = summary["seconds"] / summary["seconds"].sum()
+    return summary
+
+
+def log_profile_to_mlflow(report: pd.DataFrame, prefix: str = "profile", artifact_file: Optional[str] = "profile.json"):
+    """Log a profile report to the active MLflow run.
+
+    Every numeric field becomes a metric named ``<prefix>.<step>.<method>.<field>``,
+    with the call number as the metric step. The whole report is also logged
+    as a JSON artifact unless artifact_file is None.
+    """
+    import mlflow
+
+    fields = ["seconds", "rows_in", "rows_out", "columns_in", "columns_out", "bytes_allocated"]
+    for record in report.to_dict(orient="records"):
+        metrics = {
+            f"{prefix}.{record['step']}.{record['method']}.{field}": float(record[field])
+            for field in fields
+            if pd.notna(record[field])
+        }
+        mlflow.log_metrics(metrics, step=int(record["call"]))
+    if artifact_file is not None:
+        mlflow.log_dict({"calls": report.to_dict(orient="records")}, artifact_file)
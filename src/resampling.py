@@ -0,0 +1,86 @@
+from sklearn.pipeline import Pipeline
+from sklearn.utils.metaestimators import available_if
+
+
+def _is_sampler(step) -> bool:
+    return hasattr(step, "fit_resample")
+
+
+def _final_estimator_has(method):
+    return lambda self: hasattr(self._final_estimator, method)
+
+
+class ResamplingPipeline(Pipeline):
+    """Pipeline in which samplers may drop rows while fitting.
+
+    Steps with ``fit_resample`` (e.g. CustomOutlierRemover) filter X and y
+    together during fit and are skipped afterwards, so predict and transform
+    keep every row. Everything else is a regular Pipeline: nested parameters
+    such as ``ridge__alpha`` work in GridSearchCV, and the final estimator's
+    tags carry over, so classifiers get stratified CV splits. Caching fitted
+    steps with ``memory`` is not supported.
+    """
+
+    def _iter(self, with_final=True, filter_passthrough=True):
+        # Pipeline's predict, transform, score, ... iterate over the filtered
+        # steps, which here also leave out the samplers
+        for idx, name, step in super()._iter(with_final, filter_passthrough):
+            if not (filter_passthrough and _is_sampler(step)):
+                yield idx, name, step
+
+    def _fit_steps(self, X, y):
+        if self.memory is not None:
+            raise ValueError("ResamplingPipeline does not cache fitted steps; memory must be None.")
+        for _, _, step in self._iter(with_final=False, filter_passthrough=False):
+            if step is None or step == "passthrough":
+                continue
+            if _is_sampler(step):
+                X, y = step.fit_resample(X, y)
+            else:
+                X = step.fit_transform(X, y)
+        return X, y
+
+    def fit(self, X, y=None, **fit_params):
+        X, y = self._fit_steps(X, y)
+        if self._final_estimator != "passthrough":
+            self._final_estimator.fit(X, y, **fit_params)
+        self.is_fitted_ = True
+        return self
+
+    def fit_resample(self, X, y=None):
+        X, y = self._fit_steps(X, y)
+        final = self._final_estimator
+        if final != "passthrough":
+            if _is_sampler(final):
+                X, y = final.fit_resample(X, y)
+            else:
+                X = final.fit_transform(X, y)
+        self.is_fitted_ = True
+        return X, y
+
+    def fit_transform(self, X, y=None, **fit_params):
+        # Only the rows kept by the samplers are returned
+        return self.fit_resample(X, y)[0]
+
+    @available_if(_final_estimator_has("fit_predict"))
+    def fit_predict(self, X, y=None, **fit_params):
+        X, y = self._fit_steps(X, y)
+        labels = self._final_estimator.fit_predict(X, y, **fit_params)
+        self.is_fitted_ = True
+        return labels
+
+    def __sklearn_is_fitted__(self):
+        # The custom transformers have no trailing-underscore attributes for
+        # Pipeline's own check, so remember that fit ran
+        return getattr(self, "is_fitted_", False) or super().__sklearn_is_fitted__()
+
+
+def make_resampling_pipeline(*steps):
+    """Like make_pipeline, but returns a ResamplingPipeline."""
+    names = [type(step).__name__.lower() for step in steps]
+    # Number repeated step names like make_pipeline does
+    named_steps = [
+        (f"{name}-{names[:i + 1].count(name)}" if names.count(name) > 1 else name, step)
+        for i, (name, step) in enumerate(zip(names, steps))
+    ]
+    return ResamplingPipeline(named_steps)
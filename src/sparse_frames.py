@@ -0,0 +1,17 @@
+import pandas as pd
+from scipy import sparse
+
+
+def sparse_frame(matrix, columns, index) -> pd.DataFrame:
+    """A scipy.sparse matrix as a DataFrame of SparseDtype columns with fill value 0.
+
+    The matrix keeps its dtype and is never densified.
+    """
+    # DataFrame.sparse.from_spmatrix gives its columns a NaN fill value in
+    # pandas 3, which turns every implicit zero into NaN, so each column is
+    # wrapped on its own
+    matrix = sparse.csc_matrix(matrix)
+    return pd.DataFrame(
+        {name: pd.arrays.SparseArray.from_spmatrix(matrix[:, [i]]) for i, name in enumerate(columns)},
+        index=index,
+    )
@@ -0,0 +1,12 @@
+import os
+import sys
+
+# Import the modules the way the notebooks do, from the repository root:
+# src.custom_transformers, projects.proj_2_team_4.src.custom_transformers, ...
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+# The mushroom scripts import their neighbours by module name
+PROJECT_1 = os.path.join(ROOT, "projects", "proj_1_team_1")
+if PROJECT_1 not in sys.path:
+    sys.path.append(PROJECT_1)
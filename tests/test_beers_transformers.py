@@ -0,0 +1,181 @@
+import os
+import pickle
+
+import joblib
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+from scipy import sparse
+from sklearn.base import clone
+from tokenizers import Tokenizer
+
+from projects.proj_3_team_5.src import custom_transformers
+from projects.proj_3_team_5.src.custom_transformers import SPECIAL_TOKENS, CustomTokenizer, CustomTokenizerVectorizer
+
+DESCRIPTIONS = [
+    "A hoppy bitter ale with notes of citrus and pine",
+    "Sweet malty stout, roasted coffee and dark chocolate",
+    None,
+    "Crisp lager, light body and a clean bitter finish",
+    "Hazy juicy IPA bursting with tropical fruit, citrus and more citrus",
+    "",
+    "Smoky porter with chocolate, coffee and a hint of vanilla",
+]
+
+
+@pytest.fixture
+def beers():
+    return pd.DataFrame({"Description": DESCRIPTIONS, "ABV": np.linspace(4.0, 9.0, len(DESCRIPTIONS))})
+
+
+def per_row_matrix(vectorizer, texts, binary=True):
+    # The earlier transform: one encode per text and a scan over the vocabulary
+    rows = []
+    for text in texts:
+        tokens = vectorizer.tokenizer.encode(text).tokens
+        rows.append([int(token in tokens) if binary else tokens.count(token) for token in vectorizer.vocab])
+    return np.array(rows)
+
+
+@pytest.mark.parametrize("binary", [True, False])
+def test_vectorizer_matches_per_row_encoding(beers, binary):
+    vectorizer = CustomTokenizerVectorizer("Description", vocab_size=200, binary=binary, sparse_output=True,
+                                           show_progress=False).fit(beers)
+    result = vectorizer.transform(beers)
+
+    assert sparse.isspmatrix_csr(result)
+    assert result.shape == (len(beers), len(vectorizer.vocab))
+    expected = per_row_matrix(vectorizer, beers["Description"].fillna("").tolist(), binary)
+    np.testing.assert_array_equal(result.toarray(), expected)
+    # Repeated tokens are counted unless binary
+    assert (result.max() == 1) == binary
+    np.testing.assert_array_equal(vectorizer.set_params(sparse_output=False).transform(beers), expected)
+
+
+def test_vectorizer_leaves_out_special_tokens(beers):
+    vectorizer = CustomTokenizerVectorizer("Description", vocab_size=200, show_progress=False).fit(beers)
+    assert not {"[UNK]", "[CLS]", "[SEP]", "[PAD]", "[MASK]"} & set(vectorizer.vocab)
+    assert vectorizer.get_feature_names_out() == [f"Description_{token}" for token in vectorizer.vocab]
+    # Characters never seen in fit encode as [UNK], which has no column
+    unseen = pd.DataFrame({"Description": ["ñ ñ ñ"]})
+    assert vectorizer.transform(unseen).sum() == 0
+
+
+@pytest.mark.parametrize("batch_size", [2, 100])
+def test_tokenizer_ids_are_arrow_lists(beers, batch_size):
+    tokenizer = CustomTokenizer("Description", vocab_size=200, output="ids", batch_size=batch_size,
+                                show_progress=False).fit(beers)
+    result = tokenizer.transform(beers)
+
+    column = result["Description"]
+    assert isinstance(column.dtype, pd.ArrowDtype) and column.dtype.pyarrow_dtype == pa.list_(pa.int32())
+    assert column.index.equals(beers.index)
+    expected = [tokenizer.tokenizer.encode(text).ids for text in beers["Description"].fillna("")]
+    assert [list(ids) for ids in column] == expected
+    pd.testing.assert_series_equal(result["ABV"], beers["ABV"])
+
+
+def test_tokenizer_tokens_match_per_row_encoding(beers):
+    tokenizer = CustomTokenizer("Description", vocab_size=200, batch_size=3, show_progress=False).fit(beers)
+    result = tokenizer.transform(beers)
+    expected = [tokenizer.tokenizer.encode(text).tokens for text in beers["Description"].fillna("")]
+    assert result["Description"].tolist() == expected
+
+
+@pytest.mark.parametrize("output", ["tokens", "ids"])
+def test_iter_transform_streams_batches(beers, output):
+    tokenizer = CustomTokenizer("Description", vocab_size=200, output=output, batch_size=3,
+                                show_progress=False).fit(beers)
+    chunks = list(tokenizer.iter_transform(beers))
+
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    streamed = pd.concat(chunks)
+    whole = tokenizer.transform(beers)
+    assert streamed.index.equals(beers.index)
+    assert streamed["Description"].map(list).tolist() == whole["Description"].map(list).tolist()
+
+
+def test_tokenizer_rejects_unknown_output(beers):
+    tokenizer = CustomTokenizer("Description", vocab_size=200, output="arrays", show_progress=False).fit(beers)
+    with pytest.raises(ValueError, match="output"):
+        tokenizer.transform(beers)
+
+
+def test_cache_path_depends_on_corpus_and_vocab_size(tmp_path):
+    texts = ["hoppy ale", "malty stout"]
+    tokenizer = CustomTokenizer("Description", vocab_size=200, cache_dir=str(tmp_path))
+    path = tokenizer._cache_path(texts)
+    assert os.path.dirname(path) == str(tmp_path) and os.path.basename(path).startswith("wordpiece_")
+    assert CustomTokenizer("Other", vocab_size=200, cache_dir=str(tmp_path))._cache_path(texts) == path
+    assert tokenizer.set_params(vocab_size=300)._cache_path(texts) != path
+    assert tokenizer._cache_path(["hoppy ale", "malty stouts"]) != tokenizer._cache_path(texts)
+    # Texts are separated, so moving a boundary changes the key
+    assert tokenizer._cache_path(["hoppy", "ale"]) != tokenizer._cache_path(["hop", "pyale"])
+
+
+@pytest.mark.parametrize("estimator", [CustomTokenizer, CustomTokenizerVectorizer])
+def test_cached_tokenizer_is_reused(beers, tmp_path, monkeypatch, estimator):
+    first = estimator("Description", vocab_size=200, cache_dir=str(tmp_path), show_progress=False).fit(beers)
+    assert [path.suffix for path in tmp_path.iterdir()] == [".json"]
+
+    # A cache hit loads the file instead of training
+    second = estimator("Description", vocab_size=200, cache_dir=str(tmp_path), show_progress=False)
+    monkeypatch.setattr(second, "_new_trainer", lambda: pytest.fail("trained despite a cached tokenizer"))
+    second.fit(beers)
+    assert second.tokenizer.to_str() == first.tokenizer.to_str()
+
+
+def test_interrupted_cache_write_leaves_no_cache_file(beers, tmp_path, monkeypatch):
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    tokenizer = CustomTokenizer("Description", vocab_size=200, cache_dir=str(tmp_path), show_progress=False)
+    monkeypatch.setattr(custom_transformers.os, "replace", fail)
+    with pytest.raises(OSError):
+        tokenizer.fit(beers)
+    # The tokenizer is written to a temporary file, which is removed when the rename fails
+    assert list(tmp_path.iterdir()) == []
+    monkeypatch.undo()
+    path = tokenizer._cache_path(beers["Description"].fillna("").astype(str).tolist())
+    tokenizer.fit(beers)
+    assert Tokenizer.from_file(path).to_str() == tokenizer.tokenizer.to_str()
+
+
+@pytest.mark.parametrize("estimator", [CustomTokenizer, CustomTokenizerVectorizer])
+def test_pickle_round_trip(beers, tmp_path, estimator):
+    fitted = estimator("Description", vocab_size=200, show_progress=False).fit(beers)
+    state = fitted.__getstate__()
+    # The tokenizer is stored as its JSON definition, without the trainer
+    assert isinstance(state["tokenizer"], str) and "trainer" not in state
+
+    joblib.dump(fitted, tmp_path / "estimator.joblib")
+    loaded = joblib.load(tmp_path / "estimator.joblib")
+    expected, result = fitted.transform(beers), loaded.transform(beers)
+    if sparse.issparse(expected):
+        expected, result = expected.toarray(), result.toarray()
+    np.testing.assert_array_equal(np.asarray(result, dtype=object), np.asarray(expected, dtype=object))
+    # An unfitted clone pickles too
+    assert pickle.loads(pickle.dumps(clone(fitted))).get_params() == fitted.get_params()
+
+
+def test_load_estimators_pickled_before_compact_pickling(beers):
+    fitted = CustomTokenizerVectorizer("Description", vocab_size=200, show_progress=False).fit(beers)
+    # Earlier estimators pickled the Tokenizer object and had neither the newer
+    # parameters nor the column lookup table; their vocab was in get_vocab() order
+    vocab = [token for token in fitted.tokenizer.get_vocab() if token not in SPECIAL_TOKENS]
+    state = pickle.loads(pickle.dumps({
+        "column": "Description", "vocab_size": 200, "tokenizer": fitted.tokenizer,
+        "trainer": fitted.trainer, "vocab": vocab,
+    }))
+    loaded = CustomTokenizerVectorizer.__new__(CustomTokenizerVectorizer)
+    loaded.__setstate__(state)
+
+    assert loaded.get_params() == CustomTokenizerVectorizer("Description", vocab_size=200).get_params()
+    assert loaded.vocab == vocab
+    np.testing.assert_array_equal(loaded.transform(beers), per_row_matrix(loaded, beers["Description"].fillna("")))
+
+    tokenizer = CustomTokenizer.__new__(CustomTokenizer)
+    tokenizer.__setstate__({name: value for name, value in state.items() if name != "vocab"})
+    expected = [fitted.tokenizer.encode(text).tokens for text in beers["Description"].fillna("")]
+    assert tokenizer.transform(beers)["Description"].tolist() == expected
@@ -0,0 +1,289 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import LabelEncoder, OneHotEncoder
+
+from projects.proj_2_team_4.src.custom_transformers import (
+    CustomLabelEncoder,
+    DateProcessor,
+    ExtendedLabelEncoder,
+    ExtendedOneHotEncoder,
+    ModelDescriptionTransformer,
+    ProductClassTransformer,
+)
+
+MODEL_COLUMNS = ["fiBaseModel", "fiSecondaryDesc", "fiModelSeries", "fiModelDescriptor", "fiModelDesc"]
+
+
+@pytest.fixture
+def models():
+    return pd.DataFrame({
+        "fiBaseModel": ["580", "580", "D6", "310", "D6", ""],
+        "fiSecondaryDesc": ["K", None, "R", "G", "R", "K"],
+        "fiModelSeries": [None, "II", None, None, None, None],
+        "fiModelDescriptor": [None, None, "LGP", None, "LGP", None],
+        "fiModelDesc": ["580K", "580", "D6R", "310G", "D6R", "K"],
+        "price": np.arange(6.0),
+    })
+
+
+def test_model_full_from_categorical_columns(models):
+    expected = ModelDescriptionTransformer().fit(models).transform(models)
+    categorical = models.astype({column: "category" for column in MODEL_COLUMNS})
+    # Unused categories must not change the result
+    categorical["fiBaseModel"] = categorical["fiBaseModel"].cat.add_categories(["unused"])
+
+    transformer = ModelDescriptionTransformer().fit(categorical)
+    result = transformer.transform(categorical)
+    assert result["model_full"].astype(str).tolist() == expected["model_full"].astype(str).tolist()
+    assert result["model_full"].tolist() == ["580_K__", "580__II_", "D6_R__LGP", "310_G__", "D6_R__LGP", "_K__"]
+    # Fitted on one dtype, transformed on the other
+    mixed = ModelDescriptionTransformer().fit(models).transform(categorical)
+    assert mixed["model_full"].tolist() == result["model_full"].tolist()
+
+
+def test_unseen_model_combinations_are_appended(models):
+    transformer = ModelDescriptionTransformer().fit(models.iloc[:3])
+    result = transformer.transform(models.astype({"fiBaseModel": "category"}))
+    assert list(result["model_full"].cat.categories[:3]) == sorted(["580_K__", "580__II_", "D6_R__LGP"])
+    assert set(result["model_full"].cat.categories[3:]) == {"310_G__", "_K__"}
+    assert result["model_full"].tolist()[3:] == ["310_G__", "D6_R__LGP", "_K__"]
+
+
+def test_model_combinations_joining_to_one_name():
+    X = pd.DataFrame({
+        "fiBaseModel": ["a_b", "a", "a", "x"],
+        "fiSecondaryDesc": ["c", "b_c", "b_c", "y"],
+        "fiModelSeries": None,
+        "fiModelDescriptor": None,
+        "fiModelDesc": "",
+    })
+    transformer = ModelDescriptionTransformer().fit(X)
+    assert transformer.model_full_categories.is_unique
+
+    result = transformer.transform(X)["model_full"]
+    assert result.tolist() == ["a_b_c__", "a_b_c__", "a_b_c__", "x_y__"]
+    assert list(result.cat.categories) == ["a_b_c__", "x_y__"]
+    # Also when the colliding combinations arrive in separate chunks
+    chunked = ModelDescriptionTransformer().fit(iter([X.iloc[:1], X.iloc[1:]]))
+    pd.testing.assert_series_equal(chunked.transform(X)["model_full"], result)
+
+
+PRODUCT_CLASSES = [
+    "Wheel Loader - 110.0 to 120.0 Horsepower",
+    "Skid Steer Loader - 1351.0 to 1601.0 Lb Operating Capacity",
+    "Hydraulic Excavator, Track - 300.0 + Metric Tons",
+    "Backhoe Loader - Unidentified",
+    # Without the " - " separator
+    "Wheel Loader 110.0 to 120.0 Horsepower",
+    "Skid Steer Loader 1601.0 to 1751.0 Lb Operating Capacity",
+    "Motorgrader 145.0 to 170.0 Horsepower",
+    "Motorgrader",
+    None,
+]
+
+
+def parse_product_class(descriptions: pd.Series) -> pd.DataFrame:
+    # The separate extractions ProductClassTransformer replaced
+    return pd.DataFrame({
+        "equipment_type": descriptions.str.extract(r"^([^-]+)")[0].str.strip(),
+        "capacity_min": descriptions.str.extract(r"(\d+\.?\d*)\s*to")[0].astype(float),
+        "capacity_max": descriptions.str.extract(r"to\s*(\d+\.?\d*)")[0].astype(float),
+        "capacity_unit": descriptions.map(
+            lambda x: "Horsepower" if "Horsepower" in str(x)
+            else "Lb Operating Capacity" if "Operating Capacity" in str(x)
+            else "Other"
+        ),
+    })
+
+
+@pytest.mark.parametrize("fit_on", ["all", "with_hyphen"])
+def test_product_class_with_and_without_hyphen(fit_on):
+    X = pd.DataFrame({"fiProductClassDesc": pd.Series(PRODUCT_CLASSES, dtype=object), "YearMade": 2000})
+    # Descriptions unseen in fit are parsed in transform
+    fitted = X if fit_on == "all" else X.iloc[:4]
+    result = ProductClassTransformer().fit(fitted).transform(X)
+
+    expected = parse_product_class(X["fiProductClassDesc"])
+    # Equipment types unseen in fit are missing
+    fitted_types = parse_product_class(fitted["fiProductClassDesc"])["equipment_type"].dropna().unique()
+    expected["equipment_type"] = expected["equipment_type"].where(expected["equipment_type"].isin(fitted_types))
+    assert "fiProductClassDesc" not in result.columns
+    pd.testing.assert_frame_equal(result[expected.columns].astype(object), expected.astype(object))
+    assert result.loc[4, ["capacity_min", "capacity_max"]].tolist() == [110.0, 120.0]
+    assert result.loc[5, "capacity_unit"] == "Lb Operating Capacity"
+    assert list(result["equipment_type"].cat.categories) == sorted(fitted_types)
+
+
+def test_product_class_categories_are_fixed_at_fit():
+    X = pd.DataFrame({"fiProductClassDesc": pd.Series(PRODUCT_CLASSES, dtype=object), "YearMade": 2000})
+    transformer = ProductClassTransformer().fit(X.iloc[:4])
+    batches = [transformer.transform(X.iloc[[0, 2]]), transformer.transform(X.iloc[[3, 7]])]
+
+    # Batches share the fitted categories, so they concatenate as one Categorical
+    categories = ["Backhoe Loader", "Hydraulic Excavator, Track", "Skid Steer Loader", "Wheel Loader"]
+    for batch in batches:
+        assert list(batch["equipment_type"].cat.categories) == categories
+    combined = pd.concat(batches)["equipment_type"]
+    assert isinstance(combined.dtype, pd.CategoricalDtype)
+    assert combined.tolist()[:3] == ["Wheel Loader", "Hydraulic Excavator, Track", "Backhoe Loader"]
+    # "Motorgrader" was not seen in fit
+    assert pd.isna(combined.iloc[3])
+
+    # Transformers pickled before the categories were fixed take them from their parse table
+    state = {name: value for name, value in transformer.__getstate__().items() if name != "equipment_types"}
+    loaded = ProductClassTransformer.__new__(ProductClassTransformer)
+    loaded.__setstate__(state)
+    pd.testing.assert_frame_equal(loaded.transform(X), transformer.transform(X))
+
+
+@pytest.mark.parametrize("encoder_class, missing", [
+    (CustomLabelEncoder, "None or Unspecified"),
+    (ExtendedLabelEncoder, None),
+])
+def test_label_encoder_pickled_with_label_encoders(models, encoder_class, missing):
+    ordering = {"fiModelSeries": {"II": 0}}
+    columns = ["fiBaseModel", "fiSecondaryDesc", "fiModelSeries"]
+    # State as pickled before the encoders kept vocabularies
+    old = encoder_class.__new__(encoder_class)
+    old.__dict__.update(columns=columns, ordering=ordering, encoders={
+        "fiBaseModel": LabelEncoder().fit(models["fiBaseModel"]),
+        # The old ExtendedLabelEncoder fitted the raw column, missing values included
+        "fiSecondaryDesc": LabelEncoder().fit(
+            models["fiSecondaryDesc"].astype(object) if missing is None else models["fiSecondaryDesc"].fillna(missing)
+        ),
+        "fiModelSeries": LabelEncoder().fit(list(ordering["fiModelSeries"])),
+    })
+
+    loaded = pickle.loads(pickle.dumps(old))
+    assert not hasattr(loaded, "encoders")
+    expected = encoder_class(columns, ordering=ordering).fit(models).transform(models)
+    pd.testing.assert_frame_equal(loaded.transform(models), expected)
+
+
+@pytest.fixture
+def sales():
+    rng = np.random.default_rng(0)
+    dates = pd.to_datetime("1989-01-17") + pd.to_timedelta(rng.integers(0, 8400, 300), unit="D")
+    return pd.DataFrame({
+        "saledate": dates.append(pd.DatetimeIndex(["2011-07-04", "2011-12-26", "2011-12-27"])),
+        "YearMade": np.append(np.where(rng.random(300) < 0.1, 1000, rng.integers(1960, 2012, 300)), [2000, 1000, 1995]),
+    })
+
+
+def date_features_baseline(X: pd.DataFrame) -> pd.DataFrame:
+    # One .dt accessor per feature, as DateProcessor computed them before
+    X_transformed = X.copy()
+    X_transformed["sale_year"] = X_transformed["saledate"].dt.year
+    X_transformed["sale_month"] = X_transformed["saledate"].dt.month
+    X_transformed["sale_quarter"] = X_transformed["saledate"].dt.quarter
+    X_transformed["sale_day_of_week"] = X_transformed["saledate"].dt.dayofweek
+    X_transformed["sale_is_weekend"] = X_transformed["saledate"].dt.dayofweek.isin([5, 6]).astype(int)
+    X_transformed["machine_age"] = X_transformed["sale_year"] - X_transformed["YearMade"]
+    year_mode = X.loc[X["YearMade"] > 1900, "YearMade"].mode().iloc[0]
+    X_transformed.loc[X_transformed["YearMade"] < 1900, "YearMade"] = year_mode
+    return X_transformed.drop("saledate", axis=1)
+
+
+def test_date_features_match_baseline(sales):
+    result = DateProcessor().fit(sales).transform(sales)
+    pd.testing.assert_frame_equal(result, date_features_baseline(sales), check_dtype=False)
+    assert result["sale_year"].dtype == np.int16
+    assert (result[["sale_month", "sale_quarter", "sale_day_of_week", "sale_is_weekend"]].dtypes == np.int8).all()
+
+    # Missing dates give NaN features and no weekend flag
+    missing = sales.copy()
+    missing.loc[[0, 5], "saledate"] = pd.NaT
+    result = DateProcessor().fit(sales).transform(missing)
+    pd.testing.assert_frame_equal(result, date_features_baseline(missing), check_dtype=False)
+    assert result.loc[[0, 5], "sale_year"].isna().all() and (result.loc[[0, 5], "sale_is_weekend"] == 0).all()
+
+
+def test_extra_date_features(sales):
+    result = DateProcessor(extra_features=True).fit(sales).transform(sales)
+    base = DateProcessor().fit(sales).transform(sales)
+    pd.testing.assert_frame_equal(result[base.columns], base)
+
+    dates = sales["saledate"]
+    np.testing.assert_array_equal(result["sale_day_of_year"], dates.dt.dayofyear)
+    np.testing.assert_array_equal(result["sale_days_since_epoch"], (dates - pd.Timestamp("1970-01-01")).dt.days)
+    assert result["sale_day_of_year"].dtype == np.int16 and result["sale_is_holiday"].dtype == np.int8
+    # Independence Day and the observed Christmas holiday, but not the day after
+    assert result["sale_is_holiday"].tolist()[-3:] == [1, 1, 0]
+    from pandas.tseries.holiday import USFederalHolidayCalendar
+
+    holidays = USFederalHolidayCalendar().holidays(dates.min(), dates.max())
+    np.testing.assert_array_equal(result["sale_is_holiday"], dates.isin(holidays))
+
+
+@pytest.fixture
+def enclosures():
+    # Distinct counts, so the frequency order has no ties
+    values = ["EROPS"] * 50 + ["OROPS"] * 30 + ["EROPS w AC"] * 12 + ["NO ROPS"] * 5 + ["None or Unspecified"] * 2
+    values += [None] * 6
+    return pd.DataFrame({"Enclosure": values, "price": np.arange(len(values), dtype=float)}).sample(frac=1,
+                                                                                                  random_state=0)
+
+
+def one_hot_baseline(fitted: pd.DataFrame, X: pd.DataFrame, max_categories=None, min_frequency=None):
+    # The per-row list scan ExtendedOneHotEncoder replaced
+    value_counts = fitted["Enclosure"].value_counts(normalize=True)
+    if min_frequency is not None:
+        value_counts = value_counts[value_counts >= min_frequency]
+    if max_categories is not None:
+        value_counts = value_counts.nlargest(max_categories)
+    categories = value_counts.index.tolist()
+    encoder = OneHotEncoder(sparse_output=False, handle_unknown="ignore", categories=[categories])
+    encoder.fit(fitted["Enclosure"].apply(lambda x: x if x in categories else None).to_frame())
+    column = X["Enclosure"].apply(lambda x: x if x in categories else None)
+    return pd.DataFrame(encoder.transform(column.to_frame()), columns=encoder.get_feature_names_out(["Enclosure"]),
+                        index=X.index)
+
+
+@pytest.mark.parametrize("max_categories, min_frequency", [(None, None), (2, None), (None, 0.1), (3, 0.03)])
+def test_one_hot_matches_baseline(enclosures, max_categories, min_frequency):
+    X = pd.concat([enclosures, pd.DataFrame({"Enclosure": ["unseen"], "price": [0.0]})])
+    encoder = ExtendedOneHotEncoder(["Enclosure"], max_categories=max_categories, min_frequency=min_frequency)
+    result = encoder.fit(enclosures).transform(X)
+    expected = one_hot_baseline(enclosures, X, max_categories, min_frequency)
+    pd.testing.assert_frame_equal(result.drop(columns="price"), expected)
+
+
+def test_one_hot_other_bucket(enclosures):
+    X = pd.concat([enclosures, pd.DataFrame({"Enclosure": ["unseen"], "price": [0.0]})])
+    encoder = ExtendedOneHotEncoder(["Enclosure"], max_categories=2, other_bucket=True).fit(enclosures)
+    result = encoder.transform(X)
+
+    assert list(result.columns) == ["price", "Enclosure_EROPS", "Enclosure_OROPS", "Enclosure_other"]
+    # Rare, unseen and missing values all land in the other bucket, so every row has one 1
+    assert (result.drop(columns="price").sum(axis=1) == 1).all()
+    other = ~X["Enclosure"].isin(["EROPS", "OROPS"])
+    np.testing.assert_array_equal(result["Enclosure_other"], other.astype(float))
+
+    sparse_result = ExtendedOneHotEncoder(["Enclosure"], max_categories=2, other_bucket=True,
+                                          sparse_output=True).fit(enclosures).transform(X)
+    assert all(isinstance(dtype, pd.SparseDtype) for dtype in sparse_result.dtypes.iloc[1:])
+    pd.testing.assert_frame_equal(sparse_result.astype(float), result)
+
+
+def test_one_hot_rejects_values_outside_the_categories(enclosures):
+    encoder = ExtendedOneHotEncoder(["Enclosure"], max_categories=2, handle_unknown="error").fit(enclosures)
+    encoder.transform(enclosures[enclosures["Enclosure"].isin(["EROPS", "OROPS"])])
+    with pytest.raises(ValueError, match="outside the selected categories"):
+        encoder.transform(enclosures)
+
+
+def test_one_hot_counts_stream_across_chunks(enclosures):
+    encoder = ExtendedOneHotEncoder(["Enclosure"], min_frequency=0.05)
+    for chunk in np.array_split(np.arange(len(enclosures)), [1, 40, 41, 90]):
+        encoder.partial_fit(enclosures.iloc[chunk])
+
+    counts = encoder.category_counts["Enclosure"]
+    pd.testing.assert_series_equal(counts, enclosures["Enclosure"].value_counts().astype(float),
+                                   check_names=False, check_index_type=False)
+    # Frequencies are taken from the merged counts, not from the last chunk
+    assert encoder.category_maps["Enclosure"] == ["EROPS", "OROPS", "EROPS w AC", "NO ROPS"]
+    full = ExtendedOneHotEncoder(["Enclosure"], min_frequency=0.05).fit(enclosures)
+    pd.testing.assert_frame_equal(encoder.transform(enclosures), full.transform(enclosures))
@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.datasets import BULLDOZERS_CATEGORICAL, make_bulldozers
+from projects.proj_2_team_4.src import custom_transformers as bulldozers
+from projects.proj_2_team_4.src.custom_transformers import _merge_moments
+
+CATEGORICAL = ["UsageBand", "state", "Enclosure", "fiSecondaryDesc"]
+NUMERIC = ["MachineHoursCurrentMeter", "auctioneerID", "YearMade"]
+# Uneven chunks, including single rows
+BOUNDS = [0, 1, 2, 40, 41, 300, 301, 800]
+
+
+@pytest.fixture(scope="module")
+def frame():
+    data = make_bulldozers(scale=0.002)
+    data["YearMade"] = data["YearMade"].astype(float)
+    return data
+
+
+def chunks(X):
+    return [X.iloc[start:stop] for start, stop in zip(BOUNDS, BOUNDS[1:] + [len(X)])]
+
+
+def test_merge_moments_of_uneven_and_single_row_chunks():
+    rng = np.random.default_rng(0)
+    values = rng.normal(5, 3, (60, 3))
+    values[rng.random(values.shape) < 0.2] = np.nan
+    # The last column only has values in a few chunks
+    values[:45, 2] = np.nan
+
+    for bounds in [[0, 1, 2, 17, 18, 59, 60], list(range(61))]:
+        moments = None
+        for start, stop in zip(bounds, bounds[1:]):
+            moments = _merge_moments(moments, values[start:stop])
+        n_rows, count, total, m2 = moments
+
+        assert n_rows == len(values)
+        np.testing.assert_array_equal(count, (~np.isnan(values)).sum(axis=0))
+        np.testing.assert_allclose(total, np.nansum(values, axis=0))
+        np.testing.assert_allclose(m2 / count, np.nanvar(values, axis=0))
+
+
+@pytest.mark.parametrize("make_transformer", [
+    lambda: bulldozers.CustomImputer(strategy="mean", columns=NUMERIC),
+    lambda: bulldozers.CustomImputer(strategy="most_frequent", columns=CATEGORICAL + NUMERIC),
+    lambda: bulldozers.CustomImputer(strategy="constant", columns=CATEGORICAL, fill_value="None or Unspecified"),
+    lambda: bulldozers.CustomLabelEncoder(CATEGORICAL),
+    lambda: bulldozers.ExtendedLabelEncoder(CATEGORICAL, ordering={"UsageBand": {"UsageBand_0": 0, "UsageBand_1": 1}}),
+    lambda: bulldozers.CustomOneHotEncoder(CATEGORICAL),
+    lambda: bulldozers.ExtendedOneHotEncoder(CATEGORICAL, max_categories=8, min_frequency=0.01, other_bucket=True),
+    lambda: bulldozers.CustomStandardScaler(NUMERIC),
+    lambda: bulldozers.CustomMinMaxScaler(NUMERIC),
+    lambda: bulldozers.CustomImputeScaler(NUMERIC),
+    lambda: bulldozers.DateProcessor(),
+], ids=["impute-mean", "impute-most-frequent", "impute-constant", "label", "extended-label", "one-hot",
+        "extended-one-hot", "standard", "minmax", "impute-scale", "dates"])
+def test_chunked_fit_matches_full_fit(frame, make_transformer):
+    expected = make_transformer().fit(frame).transform(frame)
+
+    chunked = make_transformer().fit(iter(chunks(frame)))
+    pd.testing.assert_frame_equal(chunked.transform(frame), expected)
+
+    incremental = make_transformer()
+    for chunk in chunks(frame):
+        incremental.partial_fit(chunk)
+    pd.testing.assert_frame_equal(incremental.transform(frame), expected)
+
+
+def test_categorical_input_counts_like_strings(frame):
+    # Categories list in their own order, which must not decide count ties
+    as_category = frame[CATEGORICAL].astype("category")
+    for make_encoder in [lambda: bulldozers.ExtendedOneHotEncoder(CATEGORICAL, max_categories=8),
+                         lambda: bulldozers.CustomImputer(strategy="most_frequent", columns=CATEGORICAL)]:
+        expected = make_encoder().fit(frame).transform(frame[CATEGORICAL])
+        result = make_encoder().fit(as_category).transform(as_category)
+        assert list(result.columns) == list(expected.columns)
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_categorical=False)
+
+
+def test_imputer_statistics_match_simple_imputer(frame):
+    from sklearn.impute import SimpleImputer
+
+    for strategy in ["mean", "median", "most_frequent"]:
+        imputer = bulldozers.CustomImputer(strategy=strategy, columns=NUMERIC).fit(frame)
+        expected = SimpleImputer(strategy=strategy).fit(frame[NUMERIC]).statistics_
+        np.testing.assert_allclose(imputer.statistics.to_numpy(dtype=float), expected)
+
+
+def test_median_imputer_refuses_a_second_chunk(frame):
+    imputer = bulldozers.CustomImputer(strategy="median", columns=NUMERIC).partial_fit(frame.iloc[:100])
+    with pytest.raises(ValueError, match="Medians"):
+        imputer.partial_fit(frame.iloc[100:])
+
+
+def test_label_vocabulary_is_the_union_of_chunks():
+    encoder = bulldozers.CustomLabelEncoder(["state"])
+    encoder.partial_fit(pd.DataFrame({"state": ["Texas", None]}))
+    encoder.partial_fit(pd.DataFrame({"state": ["Alabama", "Texas"]}))
+    assert encoder.vocabularies["state"].to_dict() == {"Alabama": 0, "None or Unspecified": 1, "Texas": 2}
+
+
+def test_transform_chunks_streams_the_full_transform(frame):
+    steps = [
+        bulldozers.CustomImputer(strategy="mean", columns=NUMERIC),
+        bulldozers.ExtendedOneHotEncoder(list(BULLDOZERS_CATEGORICAL)[:3], max_categories=4),
+        bulldozers.DateProcessor(),
+    ]
+    for step in steps:
+        step.fit(iter(chunks(frame)))
+        expected = step.transform(frame)
+        streamed = step.transform_chunks(iter(chunks(frame)))
+        # A generator, so only one transformed chunk is held at a time
+        assert iter(streamed) is streamed
+        streamed = list(streamed)
+        assert [len(chunk) for chunk in streamed] == [len(chunk) for chunk in chunks(frame)]
+        pd.testing.assert_frame_equal(pd.concat(streamed), expected)
+        frame = expected
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+
+from benchmarks.copy_free_memory import MODULES, make_steps, peak_memory
+from benchmarks.datasets import make_wide_numeric
+from projects.proj_2_team_4.src import custom_transformers as bulldozers
+from src.column_chunks import CHUNK_BYTES
+from src.custom_transformers import (
+    CustomImputer,
+    CustomMinMaxScaler,
+    CustomOneHotEncoder,
+    CustomStandardScaler,
+    DropColumnTransformer,
+    make_copy_free_pipeline,
+)
+
+
+@pytest.fixture(scope="module")
+def frame():
+    return make_wide_numeric(100_000)
+
+
+@pytest.mark.parametrize("module", MODULES.values(), ids=MODULES.keys())
+def test_copy_free_peak_stays_near_input_size(frame, module):
+    input_bytes = frame.memory_usage(deep=True).sum()
+    peak, _ = peak_memory(make_copy_free_pipeline(*make_steps(frame, module)), frame)
+    # One owned copy of the input plus a row chunk of temporaries
+    assert peak < 1.5 * input_bytes
+
+
+@pytest.mark.parametrize("module", MODULES.values(), ids=MODULES.keys())
+def test_copy_free_matches_default_and_keeps_input(frame, module):
+    original = frame.copy()
+    expected = make_pipeline(*make_steps(frame, module)).fit_transform(frame)
+    result = make_copy_free_pipeline(*make_steps(frame, module)).fit_transform(frame)
+    pd.testing.assert_frame_equal(frame, original)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_copy_free_pipeline_needs_a_copying_first_step():
+    X = pd.DataFrame({"a": [1.0, np.nan, 3.0], "b": ["x", "y", "z"]})
+    with pytest.raises(ValueError, match="first step"):
+        make_copy_free_pipeline(CustomOneHotEncoder(["b"]), CustomImputer("mean", ["a"]))
+    # A first step set not to copy is switched back
+    pipeline = make_copy_free_pipeline(DropColumnTransformer(["b"], copy=False), CustomImputer("mean", ["a"]))
+    pipeline.fit_transform(X)
+    assert X.columns.tolist() == ["a", "b"] and np.isnan(X.loc[1, "a"])
+
+
+@pytest.mark.parametrize("transformer, scaler", [
+    (CustomStandardScaler, StandardScaler),
+    (CustomMinMaxScaler, MinMaxScaler),
+    (bulldozers.CustomMinMaxScaler, MinMaxScaler),
+])
+def test_chunked_fit_matches_scaler(frame, transformer, scaler):
+    columns = [column for column in frame.columns if column.startswith("num_")]
+    # More than one chunk
+    assert 8 * len(frame) * len(columns) > CHUNK_BYTES
+    result = transformer(columns).fit_transform(frame)
+    expected = scaler().fit_transform(frame[columns])
+    np.testing.assert_allclose(result[columns].to_numpy(), expected)
+    # Refitting starts over instead of adding to the previous statistics
+    refitted = transformer(columns).fit(frame.iloc[:10]).fit(frame)
+    np.testing.assert_allclose(refitted.transform(frame)[columns].to_numpy(), expected)
+
+
+def test_copy_false_writes_into_the_given_frame():
+    X = pd.DataFrame({"a": [1.0, np.nan, 3.0], "b": ["x", "y", "z"]})
+    result = CustomImputer("mean", ["a"], copy=False).fit(X).transform(X)
+    assert result is X
+    assert X["a"].tolist() == [1.0, 2.0, 3.0]
+
+
+@pytest.mark.parametrize("module", MODULES.values(), ids=MODULES.keys())
+def test_copy_true_keeps_non_float64_input(module):
+    # float32 and integer blocks are replaced whole rather than in row chunks
+    X = pd.DataFrame({"a": np.array([1, 2, np.nan], dtype=np.float32), "b": [1, 2, 3]})
+    original = X.copy()
+    for transformer in [module.CustomMinMaxScaler(["a", "b"]), module.CustomImputer("mean", ["a"]),
+                        module.CustomStandardScaler(["a"])]:
+        transformer.fit(X).transform(X)
+    pd.testing.assert_frame_equal(X, original)
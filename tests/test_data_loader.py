@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.pipeline import make_pipeline
+
+from benchmarks.datasets import make_bulldozers
+from projects.proj_2_team_4.src import custom_transformers as project_transformers
+from projects.proj_2_team_4.src.data_loader import load_bulldozers
+
+# Column groups of the team's pipeline in preprocessing.ipynb, limited to the
+# columns of the synthetic data
+ID_COLS = ["SalesID", "MachineID", "ModelID", "datasource", "auctioneerID", "fiModelDesc"]
+MEASUREMENT_COLS = ["Tire_Size", "Undercarriage_Pad_Width", "Stick_Length"]
+CATEGORICAL_COLS = [
+    "ProductGroup", "Enclosure", "Transmission", "Hydraulics", "Blade_Type", "Travel_Controls", "state",
+    "Drive_System", "Coupler", "Track_Type", "equipment_type", "capacity_unit", "Forks", "Ride_Control",
+]
+HIGH_CARD_COLS = ["fiBaseModel", "fiSecondaryDesc", "fiModelSeries", "fiModelDescriptor"]
+NUMERIC_COLS = [
+    "YearMade", "MachineHoursCurrentMeter", "sale_year", "sale_month", "sale_quarter", "machine_age",
+    "Tire_Size", "Undercarriage_Pad_Width", "Stick_Length", "capacity_min", "capacity_max",
+]
+
+
+def make_team_pipeline():
+    cleaning = [
+        project_transformers.DropColumnTransformer(columns=ID_COLS),
+        project_transformers.DateProcessor(),
+        project_transformers.ProductClassTransformer(),
+        project_transformers.MeasurementCleaner(),
+        project_transformers.CustomImputer(strategy="median", columns=MEASUREMENT_COLS),
+        project_transformers.CustomImputer(strategy="constant", columns=CATEGORICAL_COLS + HIGH_CARD_COLS,
+                                           fill_value="None or Unspecified"),
+        project_transformers.CustomOutlierRemover(
+            columns=["YearMade", "MachineHoursCurrentMeter", "sale_year", "sale_month", "machine_age",
+                     "Tire_Size", "Undercarriage_Pad_Width", "Stick_Length"],
+            threshold=2.5,
+        ),
+    ]
+    preprocessing = [
+        project_transformers.ExtendedLabelEncoder(
+            columns=["UsageBand"], ordering={"UsageBand": {"": -1, "UsageBand_0": 0, "UsageBand_1": 1, "UsageBand_2": 2}}
+        ),
+        project_transformers.ExtendedLabelEncoder(
+            columns=["ProductSize"], ordering={"ProductSize": {"": -1, **{f"ProductSize_{i}": i for i in range(6)}}}
+        ),
+        project_transformers.ExtendedOneHotEncoder(columns=CATEGORICAL_COLS, handle_unknown="ignore"),
+        project_transformers.ExtendedOneHotEncoder(columns=HIGH_CARD_COLS, handle_unknown="ignore",
+                                                   max_categories=50, min_frequency=0.001),
+        project_transformers.CustomStandardScaler(columns=NUMERIC_COLS),
+    ]
+    return cleaning, preprocessing
+
+
+def run_steps(steps, X, fit):
+    # Pipeline.transform refuses steps without trailing-underscore attributes, so call them in turn
+    for step in steps:
+        X = step.fit_transform(X) if fit else step.transform(X)
+    return X
+
+
+@pytest.fixture(scope="module")
+def bulldozers_csv(tmp_path_factory):
+    frame = make_bulldozers(scale=0.01, seed=1)
+    rng = np.random.default_rng(1)
+    frame.insert(0, "SalesID", np.arange(len(frame)) + 1_000_000)
+    frame["MachineID"] = rng.integers(0, 100_000, len(frame))
+    frame["datasource"] = rng.choice([121, 132, 136], len(frame))
+    path = tmp_path_factory.mktemp("bulldozers") / "Train.csv"
+    frame.to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture(scope="module")
+def loaded(bulldozers_csv):
+    frame = load_bulldozers(str(bulldozers_csv), cache_dir=str(bulldozers_csv.parent / "cache"))
+    # The loader turns the low-cardinality string columns into categories
+    assert isinstance(frame["fiBaseModel"].dtype, pd.CategoricalDtype)
+    assert isinstance(frame["fiProductClassDesc"].dtype, pd.CategoricalDtype)
+    return frame
+
+
+def test_team_pipeline_on_loaded_frame(bulldozers_csv, loaded):
+    raw = pd.read_csv(bulldozers_csv, parse_dates=["saledate"], low_memory=False)
+    cleaning, preprocessing = make_team_pipeline()
+    train = run_steps(preprocessing, run_steps(cleaning, loaded, fit=True), fit=True)
+    valid = run_steps(preprocessing, run_steps(cleaning, loaded.iloc[:500], fit=False), fit=False)
+    assert list(valid.columns) == list(train.columns)
+
+    # Same result as on the plain pd.read_csv frame the notebook used
+    cleaning, preprocessing = make_team_pipeline()
+    expected = run_steps(preprocessing, run_steps(cleaning, raw, fit=True), fit=True)
+    # The loader stores floats as float32
+    pd.testing.assert_frame_equal(train, expected, check_dtype=False, atol=1e-6)
+
+
+def test_encoders_on_loaded_frame(loaded):
+    model = project_transformers.ModelDescriptionTransformer().fit(loaded)
+    assert model.transform(loaded)["model_full"].notna().all()
+
+    encoder = project_transformers.CustomOneHotEncoder(columns=["fiSecondaryDesc", "state"]).fit(loaded)
+    encoded = encoder.transform(loaded)
+    assert "fiSecondaryDesc_None or Unspecified" in encoded.columns
+    assert (encoded.filter(like="fiSecondaryDesc_").sum(axis=1) == 1).all()
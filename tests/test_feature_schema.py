@@ -0,0 +1,85 @@
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from projects.proj_2_team_4.src import feature_schema
+from projects.proj_2_team_4.src.feature_schema import (
+    build_feature_schema,
+    load_feature_schema,
+    number_input_args,
+    save_feature_schema,
+)
+
+
+@pytest.fixture
+def raw():
+    return pd.DataFrame({
+        "SalePrice": [9500.0, 14000.0, 50000.0, 16000.0],
+        "YearMade": [1000, 1995, 2004, 2010],
+        "MachineHoursCurrentMeter": [68.0, np.nan, 2838.0, 3486.0],
+        "UsageBand": ["Low", None, "High", "Low"],
+        "Enclosure": pd.Categorical(["EROPS", "OROPS", "EROPS", "OROPS"]),
+        "Tire_Size": [np.nan] * 4,
+    })
+
+
+def test_schema_columns(raw):
+    schema = build_feature_schema(raw)
+    columns = schema["columns"]
+
+    assert schema["target"] == "SalePrice"
+    assert schema["features"] == ["YearMade", "MachineHoursCurrentMeter", "UsageBand", "Enclosure", "Tire_Size"]
+    assert columns["UsageBand"] == {"dtype": str(raw["UsageBand"].dtype), "kind": "categorical",
+                                    "options": ["High", "Low"]}
+    assert columns["Enclosure"]["options"] == ["EROPS", "OROPS"]
+    # Placeholder years below 1901 do not set the lower bound, and the mean is clipped to it
+    assert columns["YearMade"] == {"dtype": "int64", "kind": "integer", "min": 1901, "max": 2010,
+                                   "default": 1901, "step": 1}
+    hours = columns["MachineHoursCurrentMeter"]
+    assert hours["kind"] == "float" and (hours["min"], hours["max"]) == (68.0, 3486.0)
+    assert hours["default"] == pytest.approx(2130.666, abs=1e-3)
+    assert hours["step"] == pytest.approx(34.18)
+    assert columns["Tire_Size"] == {"dtype": "float64", "kind": "skipped", "error": "no numeric values"}
+    assert len(schema["sample"]) == len(raw)
+
+
+def test_schema_json_round_trip(raw, tmp_path):
+    schema = build_feature_schema(raw, n_sample_rows=2)
+    save_feature_schema(schema, tmp_path / "schema.json")
+    loaded = load_feature_schema(tmp_path / "schema.json")
+
+    assert loaded == schema
+    assert pd.DataFrame(loaded["sample"])["YearMade"].tolist() == [1000, 1995]
+
+
+@pytest.mark.parametrize("feature, kind", [("YearMade", int), ("MachineHoursCurrentMeter", float)])
+def test_number_input_args_share_one_type(raw, feature, kind):
+    args = number_input_args(build_feature_schema(raw)["columns"][feature])
+    assert set(args) == {"min_value", "max_value", "value", "step"}
+    assert all(type(value) is kind for value in args.values())
+    assert args["min_value"] <= args["value"] <= args["max_value"]
+
+
+def run_schema_script(tmp_path, raw, *args, schema_path=None):
+    raw.to_csv(tmp_path / "train.csv", index=False)
+    env = dict(os.environ, TRAIN_RAW_MERGED_PATH=str(tmp_path / "train.csv"))
+    if schema_path is not None:
+        env["FEATURE_SCHEMA_PATH"] = schema_path
+    return subprocess.run([sys.executable, feature_schema.__file__, *args], env=env, cwd=tmp_path,
+                          capture_output=True, text=True)
+
+
+def test_script_path_argument_wins_over_environment(raw, tmp_path):
+    result = run_schema_script(tmp_path, raw, str(tmp_path / "argv.json"), schema_path=str(tmp_path / "env.json"))
+    assert result.returncode == 0, result.stderr
+    assert not (tmp_path / "env.json").exists()
+    assert json.loads((tmp_path / "argv.json").read_text())["target"] == "SalePrice"
+
+    result = run_schema_script(tmp_path, raw, schema_path=str(tmp_path / "env.json"))
+    assert result.returncode == 0, result.stderr
+    assert (tmp_path / "env.json").exists()
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+
+from projects.proj_2_team_4.src import custom_transformers as bulldozers
+from src import custom_transformers as shared
+
+MODULES = {"src": shared, "bulldozers": bulldozers}
+COLUMNS = ["hours", "price", "constant"]
+SCALERS = {"standard": StandardScaler, "minmax": MinMaxScaler}
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame({
+        "hours": rng.exponential(3000, 500),
+        "price": rng.lognormal(10, 0.7, 500),
+        "constant": 7.0,
+        "state": rng.choice(["Texas", "Ohio"], 500),
+    })
+    X.loc[rng.random(500) < 0.3, "hours"] = np.nan
+    X.loc[rng.random(500) < 0.05, "price"] = np.nan
+    return X
+
+
+@pytest.mark.parametrize("module", MODULES.values(), ids=MODULES.keys())
+@pytest.mark.parametrize("strategy", ["mean", "median", "constant"])
+@pytest.mark.parametrize("scaling", ["standard", "minmax", None])
+def test_matches_imputer_and_scaler(frame, module, strategy, scaling):
+    fused = module.CustomImputeScaler(COLUMNS, strategy=strategy, scaling=scaling, fill_value=-1).fit(frame)
+    result = fused.transform(frame)
+
+    steps = [SimpleImputer(strategy=strategy, fill_value=-1)]
+    if scaling is not None:
+        steps.append(SCALERS[scaling]())
+    expected = make_pipeline(*steps).fit_transform(frame[COLUMNS])
+
+    assert (result[COLUMNS].dtypes == np.float32).all()
+    # Within float32 precision
+    np.testing.assert_allclose(result[COLUMNS].to_numpy(), expected, rtol=1e-5, atol=1e-5)
+    assert result["state"].equals(frame["state"])
+
+
+@pytest.mark.parametrize("module", MODULES.values(), ids=MODULES.keys())
+def test_statistics_come_from_fit(frame, module):
+    fused = module.CustomImputeScaler(COLUMNS).fit(frame)
+    # A batch with other statistics is filled and scaled like the training data
+    batch = frame.iloc[:10].copy()
+    batch.loc[:, "hours"] = np.nan
+    result = fused.transform(batch)
+    expected = make_pipeline(SimpleImputer(), StandardScaler()).fit(frame[COLUMNS]).transform(batch[COLUMNS])
+    np.testing.assert_allclose(result[COLUMNS].to_numpy(), expected, rtol=1e-5, atol=1e-5)
+    assert batch["hours"].isna().all()
+
+
+@pytest.mark.parametrize("module", MODULES.values(), ids=MODULES.keys())
+def test_rejects_unknown_options(frame, module):
+    with pytest.raises(ValueError, match="strategy"):
+        module.CustomImputeScaler(COLUMNS, strategy="mode").fit(frame)
+    with pytest.raises(ValueError, match="scaling"):
+        module.CustomImputeScaler(COLUMNS, scaling="robust").fit(frame)
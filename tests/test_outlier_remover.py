@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.custom_transformers import CustomOutlierRemover as SharedOutlierRemover
+from projects.proj_2_team_4.src.custom_transformers import CustomOutlierRemover as BulldozersOutlierRemover
+from projects.proj_3_team_5.src.custom_transformers import CustomOutlierRemover as BeersOutlierRemover
+
+
+def make_remover(cls, method):
+    if cls is SharedOutlierRemover:
+        return cls(threshold=3, columns=["count", "value"], method=method)
+    return cls(["count", "value"], threshold=3, method=method)
+
+
+@pytest.fixture
+def constant_majority():
+    # "count" is mostly zero, so its median absolute deviation is 0
+    rng = np.random.default_rng(0)
+    count = np.where(rng.random(1000) < 0.7, 0, rng.integers(1, 5, 1000))
+    return pd.DataFrame({"count": count, "value": rng.normal(size=1000)})
+
+
+@pytest.mark.parametrize("cls", [SharedOutlierRemover, BulldozersOutlierRemover, BeersOutlierRemover])
+def test_zero_mad_column_flags_no_rows(cls, constant_majority):
+    remover = make_remover(cls, "robust").fit(constant_majority)
+    assert np.isinf(remover.scale[0])
+    # Only the normal column can flag rows, and it has few values beyond 3 MADs
+    expected = np.abs(constant_majority["value"] - constant_majority["value"].median()) > 3 * remover.scale[1]
+    assert remover.transform(constant_majority).shape[0] == 1000 - expected.sum()
+    assert expected.sum() < 10
+
+
+@pytest.mark.parametrize("cls", [SharedOutlierRemover, BulldozersOutlierRemover, BeersOutlierRemover])
+@pytest.mark.parametrize("method", ["zscore", "robust"])
+def test_constant_column_flags_no_rows(cls, method):
+    X = pd.DataFrame({"count": np.zeros(100), "value": np.zeros(100)})
+    assert len(make_remover(cls, method).fit_transform(X)) == 100
+
+
+@pytest.mark.parametrize("method", ["zscore", "robust"])
+def test_outliers_still_detected(method):
+    X = pd.DataFrame({"count": np.r_[np.arange(99) % 5, 1000], "value": np.ones(100)})
+    remover = BulldozersOutlierRemover(["count", "value"], method=method).fit(X)
+    assert remover.outlier_mask(X).tolist() == [False] * 99 + [True]
+
+
+def test_refit_resets_scale():
+    remover = BulldozersOutlierRemover(["count"], method="robust")
+    remover.fit(pd.DataFrame({"count": [1.0, 2.0, 3.0]}))
+    remover._reset()
+    assert remover.center is None and remover.scale is None
+    # A robust refit is allowed after a previous fit
+    remover.fit(pd.DataFrame({"count": [10.0, 20.0, 30.0]}))
+    assert remover.center[0] == 20 and remover.scale[0] == pytest.approx(1.4826 * 10)
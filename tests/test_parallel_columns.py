@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.datasets import BULLDOZERS_CATEGORICAL, make_bulldozers, make_mushrooms
+from projects.proj_2_team_4.src import custom_transformers as bulldozers
+from shroom_preprocessing import CustomOrdinalEncoder
+from src import custom_transformers as shared
+from src.column_jobs import parallel_columns
+
+COLUMNS = list(BULLDOZERS_CATEGORICAL)
+
+
+@pytest.fixture(scope="module")
+def frame():
+    return make_bulldozers(scale=0.005)[COLUMNS]
+
+
+def as_dense(X):
+    return X.sparse.to_dense() if hasattr(X, "sparse") else X
+
+
+def test_parallel_columns_keeps_task_order():
+    from joblib import delayed
+
+    tasks = [delayed(pow)(i, 2) for i in range(5)]
+    assert list(parallel_columns(tasks)) == list(parallel_columns(tasks, n_jobs=2)) == [0, 1, 4, 9, 16]
+
+
+@pytest.mark.parametrize("make_encoder", [
+    lambda n_jobs: bulldozers.CustomLabelEncoder(COLUMNS, ordering={"UsageBand": {"UsageBand_0": 0, "UsageBand_1": 1}},
+                                                 n_jobs=n_jobs),
+    lambda n_jobs: bulldozers.ExtendedLabelEncoder(COLUMNS, n_jobs=n_jobs),
+    lambda n_jobs: bulldozers.CustomOneHotEncoder(COLUMNS, n_jobs=n_jobs),
+    lambda n_jobs: bulldozers.ExtendedOneHotEncoder(COLUMNS, max_categories=5, other_bucket=True, sparse_output=True,
+                                                    n_jobs=n_jobs),
+], ids=["label", "extended-label", "one-hot", "extended-one-hot"])
+def test_bulldozers_encoders_match_serial(frame, make_encoder):
+    serial = make_encoder(None).fit(frame)
+    parallel = make_encoder(2).fit(frame)
+    pd.testing.assert_frame_equal(as_dense(parallel.transform(frame)), as_dense(serial.transform(frame)))
+    # Values unseen in fit are encoded the same way too
+    unseen = frame.iloc[:50].fillna("unseen")
+    pd.testing.assert_frame_equal(as_dense(parallel.transform(unseen)), as_dense(serial.transform(unseen)))
+
+
+@pytest.mark.parametrize("make_encoder", [
+    lambda n_jobs: shared.CustomLabelEncoder(COLUMNS, n_jobs=n_jobs),
+    lambda n_jobs: shared.CustomOneHotEncoder(COLUMNS, n_jobs=n_jobs),
+], ids=["label", "one-hot"])
+def test_shared_encoders_match_serial(frame, make_encoder):
+    filled = frame.fillna("missing")
+    pd.testing.assert_frame_equal(make_encoder(2).fit(filled).transform(filled),
+                                  make_encoder(None).fit(filled).transform(filled))
+
+
+def test_ordinal_encoder_matches_serial():
+    mushrooms = make_mushrooms(scale=0.05)
+    columns = ["gill-size", "stalk-shape", "ring-number", "population", "odor"]
+    order = {"gill-size": ["n", "b"], "population": ["y", "v", "s", "n", "c", "a"]}
+    serial = CustomOrdinalEncoder(columns, order).fit(mushrooms)
+    parallel = CustomOrdinalEncoder(columns, order, n_jobs=2).fit(mushrooms)
+    result = parallel.transform(mushrooms)
+    pd.testing.assert_frame_equal(result, serial.transform(mushrooms))
+    assert np.array_equal(result["gill-size"], (mushrooms["gill-size"] == "b").astype(float))
@@ -0,0 +1,37 @@
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from src.custom_transformers import CustomStandardScaler
+from src.profiling import ProfiledStep
+
+
+def make_frame(n_rows=100_000):
+    return pd.DataFrame({"a": np.arange(n_rows, dtype=float)})
+
+
+def test_traces_memory_on_its_own():
+    X = make_frame()
+    step = ProfiledStep(CustomStandardScaler(["a"]))
+    step.fit_transform(X)
+    assert not tracemalloc.is_tracing()
+    # At least the scaled copy of the 800 kB column
+    assert step.profile_[0]["bytes_allocated"] >= X["a"].nbytes
+
+
+def test_keeps_an_outer_tracer_and_its_peak():
+    X = make_frame()
+    step = ProfiledStep(CustomStandardScaler(["a"]))
+    tracemalloc.start()
+    try:
+        # An outer peak far above anything the step allocates
+        buffer = bytearray(50 * 2**20)
+        del buffer
+        outer_peak = tracemalloc.get_traced_memory()[1]
+        step.fit_transform(X)
+        assert tracemalloc.is_tracing()
+        assert tracemalloc.get_traced_memory()[1] >= outer_peak
+    finally:
+        tracemalloc.stop()
+    assert step.profile_[0]["bytes_allocated"] >= 0
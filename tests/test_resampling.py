@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+from sklearn.base import is_classifier, is_regressor
+from sklearn.linear_model import LogisticRegression, Ridge
+from sklearn.model_selection import GridSearchCV, StratifiedKFold, check_cv, cross_val_score
+
+from src.custom_transformers import CustomOutlierRemover, CustomStandardScaler
+from src.resampling import ResamplingPipeline, make_resampling_pipeline
+
+
+def make_data(n_rows=200, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame({"a": rng.normal(size=n_rows), "b": rng.normal(size=n_rows)})
+    # A few extreme rows for the outlier remover to drop while fitting
+    X.loc[:4, "a"] = 50.0
+    y = pd.Series(2 * X["a"].clip(-3, 3) - X["b"] + rng.normal(scale=0.1, size=n_rows))
+    return X, y
+
+
+def make_pipeline(final):
+    return make_resampling_pipeline(
+        CustomOutlierRemover(threshold=5, columns=["a", "b"]),
+        CustomStandardScaler(columns=["a", "b"]),
+        final,
+    )
+
+
+def test_samplers_only_drop_rows_while_fitting():
+    X, y = make_data()
+    pipeline = make_pipeline(Ridge()).fit(X, y)
+    assert pipeline.named_steps["customoutlierremover"].outliers.sum() == 5
+    assert len(pipeline.predict(X)) == len(X)
+
+
+def test_transform_and_fit_transform_row_counts():
+    X, y = make_data()
+    pipeline = make_resampling_pipeline(
+        CustomOutlierRemover(threshold=5, columns=["a", "b"]),
+        CustomStandardScaler(columns=["a", "b"]),
+    )
+    assert len(pipeline.fit_transform(X, y)) == len(X) - 5
+    assert len(pipeline.transform(X)) == len(X)
+    X_kept, y_kept = pipeline.fit_resample(X, y)
+    assert len(X_kept) == len(y_kept) == len(X) - 5
+
+
+def test_grid_search_over_nested_parameters():
+    X, y = make_data()
+    search = GridSearchCV(
+        make_pipeline(Ridge()),
+        {"ridge__alpha": [0.1, 1000.0], "customoutlierremover__threshold": [5, 100]},
+        cv=3,
+    ).fit(X, y)
+    assert len(search.cv_results_["params"]) == 4
+    best = search.best_estimator_
+    assert isinstance(best, ResamplingPipeline)
+    assert best.named_steps["ridge"].alpha == search.best_params_["ridge__alpha"]
+    assert best.named_steps["customoutlierremover"].threshold == search.best_params_["customoutlierremover__threshold"]
+
+
+def test_final_estimator_tags_carry_over():
+    X, y = make_data()
+    classifier = make_pipeline(LogisticRegression())
+    assert is_classifier(classifier) and not is_classifier(make_pipeline(Ridge()))
+    assert is_regressor(make_pipeline(Ridge()))
+    # Classifiers get stratified folds in cross-validation
+    assert isinstance(check_cv(3, y > 0, classifier=is_classifier(classifier)), StratifiedKFold)
+    scores = cross_val_score(classifier, X, y > 0, cv=3)
+    assert scores.mean() > 0.8
+
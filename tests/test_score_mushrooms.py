@@ -0,0 +1,64 @@
+import warnings
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+import score_mushrooms
+from benchmarks.datasets import make_mushrooms
+from shroom_preprocessing import MODEL_PATH, array_model, load_artifact, uci_columns
+
+
+def test_chunks_are_scored_with_named_features():
+    score_mushrooms._init_worker()
+    chunk = make_mushrooms(scale=0.01)
+    X = score_mushrooms.encoder.transform(chunk)
+    assert list(X.columns) == list(score_mushrooms.model.feature_names_in_)
+    assert X.index.equals(chunk.index)
+    with warnings.catch_warnings():
+        warnings.filterwarnings("error", message="X does not have valid feature names")
+        score_mushrooms.score_chunk(chunk)
+
+
+def test_score_file(tmp_path):
+    # Raw UCI layout: no header, class label first
+    raw = make_mushrooms(scale=0.05)
+    raw.insert(0, "poisonous", "e")
+    raw.to_csv(tmp_path / "agaricus.data", header=False, index=False, columns=uci_columns)
+
+    n_rows = score_mushrooms.score_file(str(tmp_path / "agaricus.data"), str(tmp_path / "scored.csv"),
+                                        chunksize=100)
+
+    scored = pd.read_csv(tmp_path / "scored.csv", index_col="row")
+    assert n_rows == len(raw) == len(scored)
+    assert list(scored.columns) == ["prediction", "probability_e", "probability_p"]
+    assert scored["prediction"].isin(["e", "p"]).all()
+
+
+def test_shipped_artifact_matches_model():
+    encoder, model = load_artifact()
+    assert type(encoder).__module__ == "shroom_preprocessing"
+    # A stale artifact would score with an older model
+    chunk = make_mushrooms(scale=0.01)
+    X = encoder.transform(chunk)
+    np.testing.assert_array_equal(model.predict_proba(X), joblib.load(MODEL_PATH).predict_proba(X))
+
+
+def test_missing_artifact_names_the_build_step(tmp_path):
+    with pytest.raises(FileNotFoundError, match="python shroom_preprocessing.py"):
+        load_artifact(str(tmp_path / "shroom_artifact.joblib"))
+
+
+def test_row_vectors_score_like_named_batches():
+    # The GUI path: one transform_row vector per mushroom, without a DataFrame
+    encoder, model = load_artifact()
+    row_model = array_model(model)
+    assert hasattr(model, "feature_names_in_")
+    chunk = make_mushrooms(scale=0.01).head(50)
+    expected = model.predict(encoder.transform(chunk))
+    with warnings.catch_warnings():
+        warnings.filterwarnings("error", message="X does not have valid feature names")
+        result = [row_model.predict(encoder.transform_row(row).reshape(1, -1))[0]
+                  for row in chunk.to_dict("records")]
+    np.testing.assert_array_equal(result, expected)
@@ -0,0 +1,103 @@
+import asyncio
+import json
+import time
+
+import numpy as np
+import pytest
+
+from projects.proj_2_team_4.serve import MicroBatcher, PayloadError, make_handler, parse_records, request
+
+
+def predict_log1p(frame):
+    # Stand-in model: predicts log1p(x), rejecting records without a number
+    if frame["x"].isna().any() or frame["x"].map(lambda x: not isinstance(x, (int, float))).any():
+        raise ValueError("x must be a number")
+    return np.log1p(frame["x"].to_numpy(dtype=float))
+
+
+async def with_batcher(batcher, coroutine):
+    worker = asyncio.create_task(batcher.run())
+    try:
+        return await coroutine
+    finally:
+        worker.cancel()
+
+
+def test_bad_record_fails_only_its_own_request():
+    batcher = MicroBatcher(predict_log1p, max_batch_size=256, max_latency_ms=20)
+    payloads = [[{"x": i}] for i in range(100)] + [[{"x": "bad"}]]
+
+    async def send_all():
+        return await asyncio.gather(*(batcher.predict(p) for p in payloads), return_exceptions=True)
+
+    results = asyncio.run(with_batcher(batcher, send_all()))
+    failures = [r for r in results if isinstance(r, Exception)]
+    assert len(failures) == 1 and isinstance(results[-1], ValueError)
+    assert [r[0] for r in results[:-1]] == pytest.approx(list(range(100)))
+
+
+def test_cancelled_request_does_not_stop_batching():
+    batcher = MicroBatcher(predict_log1p, max_latency_ms=50)
+
+    async def cancel_one():
+        cancelled = asyncio.create_task(batcher.predict([{"x": 1}]))
+        kept = asyncio.create_task(batcher.predict([{"x": 2}]))
+        await asyncio.sleep(0.01)
+        cancelled.cancel()
+        assert await kept == pytest.approx([2])
+        # The batching task is still alive for later requests
+        return await batcher.predict([{"x": 3}])
+
+    assert asyncio.run(with_batcher(batcher, cancel_one())) == pytest.approx([3])
+
+
+def test_inference_does_not_block_the_event_loop():
+    def slow_predict(frame):
+        time.sleep(0.3)
+        return predict_log1p(frame)
+
+    batcher = MicroBatcher(slow_predict, max_latency_ms=1)
+
+    async def tick_during_inference():
+        prediction = asyncio.create_task(batcher.predict([{"x": 1}]))
+        await asyncio.sleep(0.02)
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        waited = time.perf_counter() - start
+        await prediction
+        return waited
+
+    assert asyncio.run(with_batcher(batcher, tick_during_inference())) < 0.1
+
+
+def test_parse_records():
+    assert parse_records(b'{"x": 1}') == [{"x": 1}]
+    assert parse_records(b'[{"x": 1}, {"x": 2}]') == [{"x": 1}, {"x": 2}]
+    for body in [b"{not json", b"[]", b"[1, 2]", b'"x"']:
+        with pytest.raises(PayloadError):
+            parse_records(body)
+
+
+def test_http_status_codes():
+    async def exchange():
+        server = await asyncio.start_server(make_handler(batcher), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+
+        async def raw(body: bytes):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"POST /predict HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % len(body) + body)
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            return response.split(b"\r\n", 1)[0].decode()
+
+        async with server:
+            statuses = [await raw(b"{not json"), await raw(json.dumps({"x": "bad"}).encode()),
+                        await raw(json.dumps({"x": 4}).encode())]
+            ok = await request("127.0.0.1", port, "POST", "/predict", {"x": 4})
+        return statuses, ok
+
+    batcher = MicroBatcher(predict_log1p, max_latency_ms=1)
+    statuses, ok = asyncio.run(with_batcher(batcher, exchange()))
+    assert statuses == ["HTTP/1.1 400 Bad Request", "HTTP/1.1 500 Internal Server Error", "HTTP/1.1 200 OK"]
+    assert ok["predictions"] == pytest.approx([4])
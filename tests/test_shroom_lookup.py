@@ -0,0 +1,65 @@
+import os
+
+import joblib
+import numpy as np
+import pytest
+
+from benchmarks.datasets import make_mushrooms
+from logistic_regression import check_lookup_tables, compile_lookup_tables, load_raw
+from shroom_lookup import LookupTableClassifier
+from shroom_preprocessing import MODEL_PATH, ShroomEncoder
+
+
+@pytest.fixture
+def lookup():
+    return LookupTableClassifier(
+        feature_names=["habitat", "size"],
+        categories=[["grasses", "leaves", "woods"], ["xl", "s"]],
+        tables=[[0.5, -1.0, 2.0, 0.0], [1.5, -0.5, 0.0, 0.0]],
+        intercept=-0.25,
+        classes=["e", "p"],
+    )
+
+
+def test_save_load_round_trip(lookup, tmp_path):
+    path = tmp_path / "lookup.npz"
+    lookup.save(path)
+    loaded = LookupTableClassifier.load(path)
+
+    assert loaded.feature_names == lookup.feature_names
+    assert loaded.categories == lookup.categories
+    np.testing.assert_array_equal(loaded.tables, lookup.tables)
+    assert loaded.intercept == lookup.intercept
+    np.testing.assert_array_equal(loaded.classes, lookup.classes)
+
+    rows = [["woods", "xl"], ["leaves", "s"], ["paths", "xl"]]
+    assert loaded.encode(rows).tolist() == [[2, 0], [1, 1], [3, 0]]
+    np.testing.assert_allclose(loaded.predict_proba(loaded.encode(rows)), lookup.predict_proba(lookup.encode(rows)))
+
+
+def test_compiled_tables_match_predict_proba(tmp_path):
+    logreg_pipeline = joblib.load(MODEL_PATH)
+    lookup = compile_lookup_tables(logreg_pipeline)
+    lookup.save(tmp_path / "logreg_lookup.npz")
+    lookup = LookupTableClassifier.load(tmp_path / "logreg_lookup.npz")
+    assert check_lookup_tables(lookup, logreg_pipeline, make_mushrooms(scale=0.1)) < 1e-9
+
+
+# Path to the raw UCI agaricus-lepiota.data file (8,124 rows)
+UCI_MUSHROOM_DATA = os.environ.get("UCI_MUSHROOM_DATA")
+
+
+@pytest.mark.skipif(
+    UCI_MUSHROOM_DATA is None,
+    reason="the UCI mushroom file is not in the repository; set UCI_MUSHROOM_DATA to agaricus-lepiota.data",
+)
+def test_compiled_tables_match_predict_proba_on_uci_data():
+    raw = load_raw(UCI_MUSHROOM_DATA)
+    assert len(raw) == 8124
+    logreg_pipeline = joblib.load(MODEL_PATH)
+    lookup = compile_lookup_tables(logreg_pipeline)
+    assert check_lookup_tables(lookup, logreg_pipeline, raw) < 1e-9
+    np.testing.assert_array_equal(
+        lookup.predict(lookup.encode(raw[lookup.feature_names].to_numpy())),
+        logreg_pipeline.predict(ShroomEncoder(logreg_pipeline.feature_names_in_).fit().transform(raw)),
+    )
@@ -0,0 +1,86 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import sparse
+from sklearn.cluster import KMeans
+from sklearn.pipeline import make_pipeline
+
+from projects.proj_2_team_4.src import custom_transformers as bulldozers
+from projects.proj_3_team_5.src import custom_transformers as beers
+from src import custom_transformers as shared
+from src.sparse_frames import sparse_frame
+
+
+def test_sparse_frame_keeps_values_and_dtype():
+    matrix = sparse.random(50, 7, density=0.1, format="csr", dtype=np.float32, random_state=0)
+    index = pd.RangeIndex(100, 150)
+    frame = sparse_frame(matrix, [f"c{i}" for i in range(7)], index)
+
+    assert frame.index.equals(index)
+    assert list(frame.columns) == [f"c{i}" for i in range(7)]
+    assert all(dtype == pd.SparseDtype(np.float32, 0.0) for dtype in frame.dtypes)
+    # Implicit entries read back as zeros, not NaN
+    np.testing.assert_array_equal(frame.sparse.to_dense().to_numpy(), matrix.toarray())
+
+
+@pytest.mark.parametrize("encoder", [shared.CustomOneHotEncoder, bulldozers.CustomOneHotEncoder])
+def test_sparse_one_hot_matches_dense(encoder):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame({
+        "a": rng.choice(["x", "y", "z"], 200),
+        "b": rng.choice(["p", "q"], 200),
+        "n": np.arange(200.0),
+    }, index=np.arange(200) * 2)
+    dense = encoder(["a", "b"]).fit(X).transform(X)
+    result = encoder(["a", "b"], sparse_output=True).fit(X).transform(X)
+
+    assert list(result.columns) == list(dense.columns)
+    encoded = [column for column in result.columns if column != "n"]
+    assert all(isinstance(result[column].dtype, pd.SparseDtype) for column in encoded)
+    pd.testing.assert_frame_equal(result[encoded].sparse.to_dense(), dense[encoded])
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_sparse_tfidf_matches_dense(dtype):
+    X = pd.DataFrame({
+        "Description": ["hoppy bitter ale", "sweet malty stout", None, "bitter hoppy lager with citrus"],
+        "ABV": [5.0, 8.0, 4.5, 4.0],
+    }, index=[10, 11, 12, 13])
+    original = X.copy()
+    dense = beers.TfidfEncoder("Description", dtype=dtype).fit(X).transform(X)
+    encoder = beers.TfidfEncoder("Description", sparse_output=True, dtype=dtype).fit(X)
+    result = encoder.transform(X)
+
+    # One CSR matrix of the numeric columns and the TF-IDF block
+    assert sparse.isspmatrix_csr(result) and result.dtype == dtype
+    assert list(encoder.get_feature_names_out()) == list(dense.columns)
+    np.testing.assert_allclose(result.toarray(), dense.to_numpy(dtype=dtype))
+    pd.testing.assert_frame_equal(X, original)
+
+
+def test_sparse_tfidf_reaches_kmeans_without_densifying():
+    X = pd.DataFrame({
+        "Description": ["hoppy bitter ale", "sweet malty stout", "dark roasted stout", "bitter hoppy lager"],
+        "ABV": [5.0, 8.0, 7.5, 4.0],
+        "Style": ["Ale", "Stout", "Stout", "Lager"],
+    })
+    pipeline = make_pipeline(shared.DropColumnTransformer(["Style"]), beers.TfidfEncoder("Description", sparse_output=True))
+    result = pipeline.fit(X).transform(X)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        KMeans(n_clusters=2, n_init=1, random_state=0).fit(result)
+
+
+def test_sparse_tfidf_rejects_text_columns():
+    X = pd.DataFrame({"Description": ["hoppy bitter ale", "sweet malty stout"], "Style": ["IPA", "Stout"]})
+    encoder = beers.TfidfEncoder("Description", sparse_output=True).fit(X)
+    with pytest.raises(ValueError, match="Style"):
+        encoder.transform(X)
+
+
+def test_tfidf_dtype_set_after_construction():
+    X = pd.DataFrame({"Description": ["hoppy bitter ale", "sweet malty stout"]})
+    encoder = beers.TfidfEncoder("Description", sparse_output=True).set_params(dtype=np.float32)
+    assert encoder.fit_transform(X).dtype == np.float32